@@ -1,5 +1,6 @@
 from spotframework.net.user import NetworkUser
 from spotframework.net.network import Network, SpotifyNetworkException
+from spotframework.net.cache import PlaylistTrackCache
 import spotframework.io.csv as csvwrite
 
 import sys
@@ -26,16 +27,20 @@ if __name__ == '__main__':
         logger.info(f'creating path {totalpath}')
         os.makedirs(totalpath)
 
+    cache_path = os.environ.get('SPOT_PLAYLIST_CACHE')
+
     network = Network(NetworkUser(client_id=os.environ['SPOT_CLIENT'],
                                   client_secret=os.environ['SPOT_SECRET'],
-                                  refresh_token=os.environ['SPOT_REFRESH'])).refresh_access_token()
+                                  refresh_token=os.environ['SPOT_REFRESH']),
+                      playlist_track_cache=PlaylistTrackCache(cache_path) if cache_path else None
+                      ).refresh_access_token()
 
     try:
         playlists = network.user_playlists()
 
         for playlist in playlists:
             try:
-                playlist.tracks = network.playlist_tracks(uri=playlist.uri)
+                playlist.tracks = network.playlist_tracks(uri=playlist.uri, snapshot_id=playlist.snapshot_id)
                 csvwrite.export_playlist(playlist, totalpath)
             except SpotifyNetworkException:
                 logger.exception(f'error occured during {playlist.name} track retrieval')
@@ -0,0 +1,38 @@
+import click
+
+from benchmarks.report import table, compare, save, load
+from benchmarks.suite import run_all
+
+
+@click.command()
+@click.option('-s', '--size', 'sizes', type=int, multiple=True, default=[1000, 10000, 100000],
+              help='library size in tracks, repeatable')
+@click.option('-k', '--select', 'names', multiple=True, help='only run benchmarks matching name or group')
+@click.option('-r', '--repeat', type=int, default=3, help='timed runs per benchmark')
+@click.option('--no-memory', is_flag=True, help='skip allocation tracing')
+@click.option('--no-limit', is_flag=True, help='run quadratic benchmarks at every size')
+@click.option('-o', '--output', type=click.Path(dir_okay=False), help='save results as json')
+@click.option('-c', '--compare', 'baseline', type=click.Path(exists=True, dir_okay=False),
+              help='compare against saved results')
+def bench(sizes, names, repeat, no_memory, no_limit, output, baseline):
+    """time and memory profile model parsing, filters and processors on synthetic libraries"""
+
+    def progress(result):
+        status = result.error if result.error else f'{result.best:.4f}s'
+        click.echo(f'{result.group} {result.name} {result.size}: {status}', err=True)
+
+    results = run_all(sizes=sorted(sizes), names=list(names), repeat=repeat, memory=not no_memory,
+                      no_limit=no_limit, progress=progress)
+
+    click.echo(table(results))
+
+    if output:
+        save(results, output, repeat=repeat)
+
+    if baseline:
+        click.echo()
+        click.echo(compare(results, load(baseline)))
+
+
+if __name__ == '__main__':
+    bench()
@@ -0,0 +1,22 @@
+from typing import List
+
+from spotframework.testing.generator import LibraryGenerator
+
+seed = 0
+
+
+def track_payloads(size: int) -> List[dict]:
+    return LibraryGenerator(seed=seed).tracks(size)
+
+
+def playlist_track_payloads(size: int) -> List[dict]:
+    return LibraryGenerator(seed=seed).playlist_tracks(size)
+
+
+def library_track_payloads(size: int) -> List[dict]:
+    return LibraryGenerator(seed=seed).library_tracks(size)
+
+
+def audio_features_payloads(size: int) -> List[dict]:
+    generator = LibraryGenerator(seed=seed)
+    return [generator.audio_features(i) for i in track_payloads(size)]
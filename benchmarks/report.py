@@ -0,0 +1,90 @@
+import json
+import platform
+import sys
+from dataclasses import asdict
+from datetime import datetime
+from typing import List
+
+from tabulate import tabulate
+
+from benchmarks.suite import Result
+
+
+def format_seconds(seconds: float) -> str:
+    if seconds is None:
+        return ''
+    for unit, scale in (('s', 1), ('ms', 1e-3), ('us', 1e-6)):
+        if seconds >= scale:
+            return f'{seconds / scale:.2f} {unit}'
+    return f'{seconds / 1e-9:.0f} ns'
+
+
+def format_bytes(size: float) -> str:
+    if size is None:
+        return ''
+    for unit, scale in (('GB', 1024 ** 3), ('MB', 1024 ** 2), ('KB', 1024)):
+        if size >= scale:
+            return f'{size / scale:.1f} {unit}'
+    return f'{size:.0f} B'
+
+
+def table(results: List[Result]) -> str:
+    rows = []
+    for result in results:
+        if result.error:
+            rows.append([result.group, result.name, result.size, result.error])
+            continue
+
+        rows.append([result.group,
+                     result.name,
+                     result.size,
+                     format_seconds(result.best),
+                     format_seconds(result.median),
+                     format_seconds(result.per_item),
+                     format_bytes(result.peak_memory),
+                     format_bytes(result.peak_memory / result.size) if result.peak_memory is not None else ''])
+
+    return tabulate(rows, headers=['group', 'name', 'size', 'best', 'median', 'per item', 'peak', 'peak per item'])
+
+
+def compare(results: List[Result], baseline: List[Result]) -> str:
+    """table of per item time and peak memory against a baseline run, ratios below 1 are improvements"""
+
+    previous = {(i.name, i.size): i for i in baseline if not i.error}
+
+    rows = []
+    for result in results:
+        before = previous.get((result.name, result.size))
+        if before is None or result.error:
+            continue
+
+        rows.append([result.name,
+                     result.size,
+                     format_seconds(before.per_item),
+                     format_seconds(result.per_item),
+                     f'{result.best / before.best:.2f}x',
+                     format_bytes(before.peak_memory),
+                     format_bytes(result.peak_memory),
+                     f'{result.peak_memory / before.peak_memory:.2f}x'
+                     if result.peak_memory and before.peak_memory else ''])
+
+    return tabulate(rows, headers=['name', 'size', 'per item before', 'per item after', 'time',
+                                   'peak before', 'peak after', 'memory'])
+
+
+def save(results: List[Result], path: str, repeat: int):
+    with open(path, 'w') as fileobj:
+        json.dump({
+            'meta': {
+                'date': datetime.now().isoformat(),
+                'python': sys.version,
+                'platform': platform.platform(),
+                'repeat': repeat
+            },
+            'results': [asdict(i) for i in results]
+        }, fileobj, indent=2)
+
+
+def load(path: str) -> List[Result]:
+    with open(path, 'r') as fileobj:
+        return [Result(**i) for i in json.load(fileobj)['results']]
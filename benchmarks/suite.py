@@ -0,0 +1,326 @@
+import functools
+import gc
+import statistics
+import time
+import tracemalloc
+from dataclasses import dataclass
+from datetime import datetime
+from typing import Callable, List, Optional
+
+import benchmarks.library as library
+import spotframework.filter as filters
+import spotframework.filter.added as added_filters
+import spotframework.filter.deduplicate as deduplicate_filters
+import spotframework.filter.sort as sort_filters
+from spotframework.engine.processor.added import AddedBefore, AddedSince
+from spotframework.engine.processor.audio_features import EnergyFilter, ValenceFilter, TempoFilter
+from spotframework.engine.processor.deduplicate import DeduplicateByID, DeduplicateByName
+from spotframework.engine.processor.popularity import SortPopularity
+from spotframework.engine.processor.shuffle import Shuffle, RandomSample
+from spotframework.engine.processor.sort import SortReleaseDate, SortArtistName, SortAddedDate
+from spotframework.model import init_with_key_filter, parse_many, interning
+from spotframework.model.lazy import lazy_many
+from spotframework.model.track import TrackFull, PlaylistTrack, LibraryTrack, AudioFeatures
+
+
+@dataclass
+class Benchmark:
+    name: str
+    group: str
+    prepare: Callable[[int], object]
+    func: Callable[[object], object]
+    copy_input: bool = False
+    max_size: Optional[int] = None
+
+
+@dataclass
+class Result:
+    name: str
+    group: str
+    size: int
+    best: float = None
+    median: float = None
+    peak_memory: int = None
+    retained_memory: int = None
+    error: str = None
+
+    @property
+    def per_item(self) -> Optional[float]:
+        return self.best / self.size if self.best is not None else None
+
+
+benchmarks: List[Benchmark] = []
+boundary = datetime.fromtimestamp(1.5e9 + 5000 * 3600).astimezone()
+
+
+def benchmark(group: str, prepare: Callable[[int], object], copy_input: bool = False, max_size: int = None):
+    """register function as a benchmark over the data returned by prepare for a library size
+
+    :param group: parse, filter or processor
+    :param prepare: function returning the input for a library size, cached per size
+    :param copy_input: pass a fresh shallow copy of the input to each run, for functions sorting in place
+    :param max_size: largest library size to run, for quadratic functions
+    """
+    def decorator(func):
+        benchmarks.append(Benchmark(name=func.__name__, group=group, prepare=prepare, func=func,
+                                    copy_input=copy_input, max_size=max_size))
+        return func
+    return decorator
+
+
+@functools.lru_cache(maxsize=None)
+def playlist_payloads(size):
+    return library.playlist_track_payloads(size)
+
+
+@functools.lru_cache(maxsize=None)
+def library_payloads(size):
+    return library.library_track_payloads(size)
+
+
+@functools.lru_cache(maxsize=None)
+def track_payloads(size):
+    return library.track_payloads(size)
+
+
+@functools.lru_cache(maxsize=None)
+def playlist_tracks(size):
+    return [init_with_key_filter(PlaylistTrack, i) for i in playlist_payloads(size)]
+
+
+@functools.lru_cache(maxsize=None)
+def tracks(size):
+    return [i.track for i in playlist_tracks(size)]
+
+
+@functools.lru_cache(maxsize=None)
+def tracks_with_features(size):
+    featured = [init_with_key_filter(TrackFull, i) for i in track_payloads(size)]
+    for track, features in zip(featured, library.audio_features_payloads(size)):
+        track.audio_features = init_with_key_filter(AudioFeatures, features)
+    return featured
+
+
+def clear_prepared():
+    for func in (playlist_payloads, library_payloads, track_payloads, playlist_tracks, tracks, tracks_with_features):
+        func.cache_clear()
+    gc.collect()
+
+
+# parsing
+
+@benchmark('parse', playlist_payloads)
+def parse_playlist_track(items):
+    return [init_with_key_filter(PlaylistTrack, i) for i in items]
+
+
+@benchmark('parse', library_payloads)
+def parse_library_track(items):
+    return [init_with_key_filter(LibraryTrack, i) for i in items]
+
+
+@benchmark('parse', track_payloads)
+def parse_track_full(items):
+    return [init_with_key_filter(TrackFull, i) for i in items]
+
+
+@benchmark('parse', playlist_payloads)
+def parse_playlist_track_interned(items):
+    with interning():
+        return parse_many(PlaylistTrack, items)
+
+
+@benchmark('parse', playlist_payloads)
+def parse_playlist_track_lazy(items):
+    tracks = lazy_many(PlaylistTrack, items)
+    for track in tracks:
+        track.track.uri, track.track.name, track.added_at
+    return tracks
+
+
+# spotframework.filter
+
+@benchmark('filter', playlist_tracks)
+def remove_local(items):
+    return list(filters.remove_local(items))
+
+
+@benchmark('filter', playlist_tracks)
+def get_track_objects(items):
+    return list(filters.get_track_objects(items))
+
+
+@benchmark('filter', playlist_tracks)
+def added_before(items):
+    return list(added_filters.added_before(items, boundary))
+
+
+@benchmark('filter', playlist_tracks)
+def added_after(items):
+    return list(added_filters.added_after(items, boundary))
+
+
+@benchmark('filter', playlist_tracks)
+def deduplicate_by_id(items):
+    return deduplicate_filters.deduplicate_by_id(items)
+
+
+@benchmark('filter', playlist_tracks, max_size=10000)
+def deduplicate_by_name(items):
+    return deduplicate_filters.deduplicate_by_name(items)
+
+
+@benchmark('filter', playlist_tracks)
+def sort_by_popularity(items):
+    return sort_filters.sort_by_popularity(items)
+
+
+@benchmark('filter', playlist_tracks)
+def sort_by_release_date(items):
+    return sort_filters.sort_by_release_date(items)
+
+
+@benchmark('filter', playlist_tracks)
+def sort_by_added_date(items):
+    return sort_filters.sort_by_added_date(items)
+
+
+@benchmark('filter', playlist_tracks)
+def sort_artist_album_track_number(items):
+    return sort_filters.sort_artist_album_track_number(items)
+
+
+# spotframework.engine.processor
+
+@benchmark('processor', tracks, copy_input=True)
+def deduplicate_by_id_processor(items):
+    return DeduplicateByID().process(items)
+
+
+@benchmark('processor', tracks, copy_input=True, max_size=10000)
+def deduplicate_by_name_processor(items):
+    return DeduplicateByName().process(items)
+
+
+@benchmark('processor', tracks, copy_input=True)
+def sort_release_date_processor(items):
+    return SortReleaseDate().process(items)
+
+
+@benchmark('processor', tracks, copy_input=True)
+def sort_artist_name_processor(items):
+    return SortArtistName().process(items)
+
+
+@benchmark('processor', playlist_tracks, copy_input=True)
+def sort_added_date_processor(items):
+    return SortAddedDate().process(items)
+
+
+@benchmark('processor', tracks, copy_input=True)
+def sort_popularity_processor(items):
+    return SortPopularity().process(items)
+
+
+@benchmark('processor', playlist_tracks, copy_input=True)
+def added_since_processor(items):
+    return AddedSince(boundary).process(items)
+
+
+@benchmark('processor', playlist_tracks, copy_input=True)
+def added_before_processor(items):
+    return AddedBefore(boundary).process(items)
+
+
+@benchmark('processor', tracks, copy_input=True)
+def shuffle_processor(items):
+    return Shuffle().process(items)
+
+
+@benchmark('processor', tracks, copy_input=True)
+def random_sample_processor(items):
+    return RandomSample(sample_size=100).process(items)
+
+
+@benchmark('processor', tracks_with_features, copy_input=True)
+def energy_filter_processor(items):
+    return EnergyFilter(boundary=0.5).process(items)
+
+
+@benchmark('processor', tracks_with_features, copy_input=True)
+def valence_filter_processor(items):
+    return ValenceFilter(boundary=0.5, greater_than=False).process(items)
+
+
+@benchmark('processor', tracks_with_features, copy_input=True)
+def tempo_filter_processor(items):
+    return TempoFilter(boundary=120).process(items)
+
+
+def run(bench: Benchmark, size: int, repeat: int = 3, memory: bool = True) -> Result:
+    """time the best and median of repeat runs, then trace peak and retained allocations of one more run"""
+
+    result = Result(name=bench.name, group=bench.group, size=size)
+    data = bench.prepare(size)
+
+    def fresh_input():
+        return list(data) if bench.copy_input else data
+
+    try:
+        timings = []
+        for _ in range(repeat):
+            arg = fresh_input()
+            gc.collect()
+
+            start = time.perf_counter()
+            bench.func(arg)
+            timings.append(time.perf_counter() - start)
+
+        result.best = min(timings)
+        result.median = statistics.median(timings)
+
+        if memory:
+            arg = fresh_input()
+            gc.collect()
+
+            tracemalloc.start()
+            bench.func(arg)
+            result.retained_memory, result.peak_memory = tracemalloc.get_traced_memory()
+            tracemalloc.stop()
+
+    except Exception as e:
+        if tracemalloc.is_tracing():
+            tracemalloc.stop()
+        result.error = f'{type(e).__name__}: {e}'
+
+    return result
+
+
+def run_all(sizes: List[int], names: List[str] = None, repeat: int = 3, memory: bool = True,
+            no_limit: bool = False, progress: Callable[[Result], None] = None) -> List[Result]:
+    """run registered benchmarks for each library size
+
+    :param sizes: library sizes in tracks
+    :param names: only run benchmarks whose name or group contains one of these strings
+    :param repeat: timed runs per benchmark
+    :param memory: trace allocations
+    :param no_limit: ignore max_size of quadratic benchmarks
+    :param progress: called with each result as it completes
+    """
+
+    selected = [i for i in benchmarks if not names or any(j in i.name or j == i.group for j in names)]
+
+    results = []
+    for size in sizes:
+        for bench in selected:
+            if bench.max_size is not None and size > bench.max_size and not no_limit:
+                continue
+
+            result = run(bench, size, repeat=repeat, memory=memory)
+            results.append(result)
+            if progress is not None:
+                progress(result)
+
+        clear_prepared()
+
+    return results
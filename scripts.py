@@ -1,4 +1,5 @@
 import subprocess
+import sys
 
 def test():
     """
@@ -14,4 +15,12 @@ def testv():
     """
     subprocess.run(
         ['python', '-u', '-m', 'unittest', 'discover', "-v", "-s", "tests"]
-    )
\ No newline at end of file
+    )
+
+def bench():
+    """
+    Run benchmarks, arguments are passed through.
+    """
+    subprocess.run(
+        ['python', '-u', '-m', 'benchmarks', *sys.argv[1:]]
+    )
@@ -3,6 +3,7 @@ import copy
 from abc import ABC, abstractmethod
 
 import spotframework.util.monthstrings as monthstrings
+from spotframework.util.diff import plan_sort
 from spotframework.engine.processor.added import AddedSince
 
 from typing import List, Optional
@@ -133,30 +134,45 @@ class PlaylistEngine:
         if playlist.has_tracks() is False:
             playlist_source.get_playlist_tracks(playlist)
 
-        tracks_to_sort = list(playlist.tracks)
-        for i in range(len(playlist)):
-            counter_track = tracks_to_sort[0]
-            for track in tracks_to_sort:
-                if reverse is False:
-                    if counter_track.added_at > track.added_at:
-                        counter_track = track
-                else:
-                    if counter_track.added_at < track.added_at:
-                        counter_track = track
+        tracks = list(playlist.tracks)
+        order = sorted(range(len(tracks)), key=lambda i: tracks[i].added_at, reverse=reverse)
+
+        positions = [0] * len(tracks)
+        for position, index in enumerate(order):
+            positions[index] = position
 
-            if counter_track != tracks_to_sort[0]:
-                self.net.reorder_playlist_tracks(uri=playlist.uri,
-                                                 range_start=i + tracks_to_sort.index(counter_track),
-                                                 range_length=1,
-                                                 insert_before=i)
-            tracks_to_sort.remove(counter_track)
+        moves = plan_sort(positions)
+        logger.info(f'sorting {len(tracks)} tracks with {len(moves)} moves')
+
+        snapshot_id = playlist.snapshot_id
+        for move in moves:
+            resp = self.net.reorder_playlist_tracks(uri=playlist.uri,
+                                                    range_start=move.range_start,
+                                                    range_length=move.range_length,
+                                                    insert_before=move.insert_before,
+                                                    snapshot_id=snapshot_id)
+            snapshot_id = resp['snapshot_id'] if resp else None
 
     def execute_playlist(self,
                          tracks: List[TrackFull],
-                         uri: Uri) -> Optional[Response]:
+                         uri: Uri,
+                         diff: bool = False,
+                         fingerprint: str = None) -> Optional[List[str]]:
+        """write tracks to playlist
+
+        :param tracks: tracks to be written
+        :param uri: target playlist uri
+        :param diff: write only the changes against current playlist contents instead of replacing them
+        :param fingerprint: spotframework.util.diff.fingerprint of the last written uris, skips an unchanged write
+        :return: snapshot_ids of each write
+        """
+
+        if diff:
+            return self.net.sync_playlist_tracks(uri=uri, uris=[i.uri for i in tracks],
+                                                 current_fingerprint=fingerprint)
 
         resp = self.net.replace_playlist_tracks(uri=uri, uris=[i.uri for i in tracks])
-        if resp:
+        if resp is not None:
             return resp
         else:
             logger.error('error executing')
@@ -231,7 +247,7 @@ class PlaylistSource(TrackSource):
                             playlist: FullPlaylist) -> None:
         logger.info(f"pulling tracks for {playlist.name}")
 
-        tracks = self.net.playlist_tracks(uri=playlist.uri)
+        tracks = self.net.playlist_tracks(uri=playlist.uri, snapshot_id=playlist.snapshot_id)
         if tracks and len(tracks) > 0:
             playlist.tracks = tracks
         else:
@@ -280,8 +296,7 @@ class PlaylistSource(TrackSource):
             playlist_tracks = copy.deepcopy(playlist.tracks)
 
             for processor in [i for i in params.processors if i.has_targets()]:
-                if playlist.name in [i for i in processor.playlist_names]\
-                        or playlist.uri in [i for i in processor.playlist_uris]:
+                if playlist.name in processor.playlist_names or playlist.uri in processor.playlist_uris:
                     playlist_tracks = processor.process(playlist_tracks)
 
             tracks += [i for i in playlist_tracks if i.is_local is False]
@@ -320,7 +335,7 @@ class LibraryTrackSource(TrackSource):
 
         for index, track in enumerate(tracks):
             for processor in [i for i in params.processors if i.playlist_uris]:
-                if track.uri in [i for i in processor.playlist_uris]:
+                if track.uri in processor.playlist_uris:
                     new_track = processor.process([track])
 
                     if new_track and len(new_track) > 0:
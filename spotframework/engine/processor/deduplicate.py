@@ -20,9 +20,11 @@ class DeduplicateByID(BatchSingleTypeAwareProcessor):
 
     def process_batch(self, tracks: List[TrackFull]) -> List[TrackFull]:
         return_tracks = []
+        seen = set()
 
         for track in tracks:
-            if track.uri not in [i.uri for i in return_tracks]:
+            if track.uri not in seen:
+                seen.add(track.uri)
                 return_tracks.append(track)
 
         return return_tracks
@@ -47,8 +47,8 @@ class SortAddedDate(BatchSingleTypeAwareProcessor):
         self.reverse = reverse
 
     def process_batch(self, tracks: List[PlaylistTrack]) -> List[PlaylistTrack]:
-        tracks.sort(key=lambda x: (x.artists[0].name.lower(),
-                                   x.album.name.lower(),
-                                   x.track_number))
+        tracks.sort(key=lambda x: (x.track.artists[0].name.lower(),
+                                   x.track.album.name.lower(),
+                                   x.track.track_number))
         tracks.sort(key=lambda x: x.added_at, reverse=self.reverse)
         return tracks
@@ -12,9 +12,11 @@ def deduplicate_by_id(tracks: List, include_malformed=True) -> List:
     prop = 'uri'
 
     return_tracks = []
+    seen = set()
     for inner_track, whole_track in get_track_objects(tracks):
         if hasattr(inner_track, prop) and isinstance(getattr(inner_track, prop), Uri):
-            if getattr(inner_track, prop) not in [getattr(i, prop) for i in return_tracks]:
+            if getattr(inner_track, prop) not in seen:
+                seen.add(getattr(inner_track, prop))
                 return_tracks.append(whole_track)
         else:
             if include_malformed:
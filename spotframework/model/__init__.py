@@ -1,29 +1,157 @@
+import contextlib
+import contextvars
+import dataclasses
+import functools
 import logging
+import sys
+from dataclasses import dataclass
+from typing import Callable, Iterable, Optional
 
 logger = logging.getLogger(__name__)
 
+# models hold their fields in __slots__ rather than a per-instance __dict__ where supported, attributes outside the
+# declared fields can't be set and subclasses call their parent's __post_init__ explicitly
+if sys.version_info >= (3, 10):
+    model = functools.partial(dataclass, slots=True)
+else:
+    model = dataclass
+
+
+# models repeated across a load, albums of tracks for example, parsed once per uri while an intern pool is active
+interned_models = set()
+intern_pool = contextvars.ContextVar('intern_pool', default=None)
+
+
+def interned(class_type: type) -> type:
+    """share instances of the model with equal uris parsed within an interning block, instances are shared so
+    changes to one are seen by every holder"""
+    interned_models.add(class_type)
+    return class_type
+
+
+@contextlib.contextmanager
+def interning(pool: dict = None):
+    """share albums, artists and users parsed within the block by uri, nested blocks join the outer pool
+
+    :param pool: dictionary of interned models to reuse across blocks, eg over pages of a stream
+    """
+
+    current = intern_pool.get()
+    if current is not None:
+        yield current
+        return
+
+    pool = pool if pool is not None else dict()
+    token = intern_pool.set(pool)
+    try:
+        yield pool
+    finally:
+        intern_pool.reset(token)
+
+
+def intern(class_type: type, dict_obj: dict, build: Callable):
+    """instance of class_type for dict_obj from the active intern pool, built with build(class_type, dict_obj) when
+    not yet seen, no pool is active or the model isn't interned"""
+
+    pool = intern_pool.get() if class_type in interned_models else None
+    uri = dict_obj.get('uri') if pool is not None and isinstance(dict_obj, dict) else None
+    if not uri:
+        return build(class_type, dict_obj)
+
+    key = (class_type, str(uri))
+    obj = pool.get(key)
+    if obj is None:
+        obj = pool.setdefault(key, build(class_type, dict_obj))
+    return obj
+
+
+@functools.lru_cache(maxsize=None)
+def model_fields(class_type: type) -> Optional[frozenset]:
+    """names accepted by a dataclass constructor, None if not a dataclass"""
+
+    fields = class_type.__dict__.get('__dataclass_fields__')
+    return frozenset(fields) if fields is not None else None
+
+
 def init_with_key_filter(class_type: type, dict_obj: dict = None, merge_unrecognised_keys: bool = False, **kwargs):
 
-    if '__dataclass_fields__' not in class_type.__dict__:
+    if class_type in interned_models and not kwargs and not merge_unrecognised_keys:
+        return intern(class_type, dict_obj, build_model)
+
+    return build_model(class_type, dict_obj, merge_unrecognised_keys, **kwargs)
+
+
+def build_model(class_type: type, dict_obj: dict = None, merge_unrecognised_keys: bool = False, **kwargs):
+
+    fields = model_fields(class_type)
+    if fields is None:
         logger.error(f'{class_type} not a dataclass')
         return
 
-    if dict_obj is None:
+    if kwargs:
+        dict_obj = {**dict_obj, **kwargs} if dict_obj else kwargs
+    elif dict_obj is None:
         dict_obj = dict()
 
-    filtered_dict = dict()
-    unrecognised_keys = dict()
-    for i, j in {**dict_obj, **kwargs}.items():
-        if i in class_type.__dict__['__dataclass_fields__'].keys():
-            filtered_dict[i] = j
-        else:
-            unrecognised_keys[i] = j
-            logger.debug(f'unrecognised key found for {class_type}: {i} {type(j)}')
-
-    obj = class_type(**filtered_dict)
+    if fields.issuperset(dict_obj):
+        return class_type(**dict_obj)
 
     if merge_unrecognised_keys:
-        for i, j in unrecognised_keys.items():
-            setattr(obj, i, j)
+        obj = with_dict(class_type)(**{i: j for i, j in dict_obj.items() if i in fields})
+        for i, j in dict_obj.items():
+            if i not in fields:
+                setattr(obj, i, j)
+    else:
+        obj = class_type(**{i: j for i, j in dict_obj.items() if i in fields})
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug(f'unrecognised keys found for {class_type}: {sorted(set(dict_obj) - fields)}')
+
+    return obj
+
+
+@functools.lru_cache(maxsize=None)
+def with_dict(class_type: type) -> type:
+    """subclass of a slotted model with a __dict__ to hold attributes outside its fields, equal to instances of the
+    model with the same fields"""
+
+    if '__slots__' not in class_type.__dict__:
+        return class_type
+
+    def __eq__(self, other):
+        if type(other) not in (class_type, with_dict(class_type)):
+            return NotImplemented
+        return all(getattr(self, i.name) == getattr(other, i.name) for i in dataclasses.fields(class_type) if i.compare)
+
+    def __reduce__(self):
+        return restore_with_dict, (class_type, {i.name: getattr(self, i.name) for i in dataclasses.fields(class_type)},
+                                   self.__dict__)
+
+    return type(class_type.__name__, (class_type,), {
+        '__module__': class_type.__module__,
+        '__qualname__': class_type.__qualname__,
+        '__eq__': __eq__,
+        '__reduce__': __reduce__
+    })
+
+
+def restore_with_dict(class_type: type, fields: dict, extra: dict):
+    obj = object.__new__(with_dict(class_type))
+    for i, j in fields.items():
+        object.__setattr__(obj, i, j)
+    obj.__dict__.update(extra)
+    return obj
+
+
+def parse_many(class_type: type, dicts: Iterable[dict]) -> list:
+    """init_with_key_filter for each of a list of dictionaries"""
+
+    fields = model_fields(class_type)
+    if fields is None:
+        logger.error(f'{class_type} not a dataclass')
+        return []
+
+    if class_type in interned_models and intern_pool.get() is not None:
+        return [intern(class_type, i, build_model) for i in dicts]
 
-    return obj
\ No newline at end of file
+    return [class_type(**i) if i is not None and fields.issuperset(i) else init_with_key_filter(class_type, i)
+            for i in dicts]
@@ -1,19 +1,20 @@
 from __future__ import annotations
 from enum import Enum
-from dataclasses import dataclass
 from datetime import datetime
 from typing import List, Union
 import logging
 from spotframework.model.uri import Uri
+from spotframework.util.dates import parse_timestamp, parse_release_date, release_date_formats
 import spotframework.model.artist
 import spotframework.model.service
 import spotframework.model.track
 
-from spotframework.model import init_with_key_filter
+from spotframework.model import init_with_key_filter, parse_many, model, interned
 
 logger = logging.getLogger(__name__)
 
-@dataclass
+@interned
+@model
 class SimplifiedAlbum:
     class Type(Enum):
         single = 0
@@ -47,19 +48,15 @@ class SimplifiedAlbum:
                 raise TypeError('provided uri not for an album')
 
         if all((isinstance(i, dict) for i in self.artists)):
-            self.artists = [init_with_key_filter(spotframework.model.artist.SimplifiedArtist, i) for i in self.artists]
+            self.artists = parse_many(spotframework.model.artist.SimplifiedArtist, self.artists)
 
         if all((isinstance(i, dict) for i in self.images)):
-            self.images = [init_with_key_filter(spotframework.model.service.Image, i) for i in self.images]
+            self.images = parse_many(spotframework.model.service.Image, self.images)
 
         if isinstance(self.release_date, str):
             try:
-                if self.release_date_precision == 'year':
-                    self.release_date = datetime.strptime(self.release_date, '%Y')
-                elif self.release_date_precision == 'month':
-                    self.release_date = datetime.strptime(self.release_date, '%Y-%m')
-                elif self.release_date_precision == 'day':
-                    self.release_date = datetime.strptime(self.release_date, '%Y-%m-%d')
+                if self.release_date_precision in release_date_formats:
+                    self.release_date = parse_release_date(self.release_date, self.release_date_precision)
                 else:
                     logger.error(f'invalid release date type {self.release_date_precision} - {self.release_date}')
             except ValueError:
@@ -83,7 +80,7 @@ class SimplifiedAlbum:
         return f'{self.name} / {artists}'
 
 
-@dataclass
+@model
 class AlbumFull(SimplifiedAlbum):
 
     copyrights: List[dict] = None
@@ -95,13 +92,13 @@ class AlbumFull(SimplifiedAlbum):
     tracks: List[spotframework.model.track.SimplifiedTrack] = None
 
     def __post_init__(self):
-        super().__post_init__()
+        SimplifiedAlbum.__post_init__(self)
 
         if all((isinstance(i, dict) for i in self.tracks)):
-            self.tracks = [init_with_key_filter(spotframework.model.track.SimplifiedTrack, i) for i in self.tracks]
+            self.tracks = parse_many(spotframework.model.track.SimplifiedTrack, self.tracks)
 
 
-@dataclass
+@model
 class LibraryAlbum:
     added_at: datetime
     album: AlbumFull
@@ -111,4 +108,4 @@ class LibraryAlbum:
             self.album = init_with_key_filter(AlbumFull, self.album)
 
         if isinstance(self.added_at, str):
-            self.added_at = datetime.strptime(self.added_at, '%Y-%m-%dT%H:%M:%S%z')
+            self.added_at = parse_timestamp(self.added_at)
@@ -1,12 +1,12 @@
-from dataclasses import dataclass
 from typing import List, Union
 from spotframework.model.uri import Uri
 from spotframework.model.service import Image
 
-from spotframework.model import init_with_key_filter
+from spotframework.model import parse_many, model, interned
 
 
-@dataclass
+@interned
+@model
 class SimplifiedArtist:
     name: str
     external_urls: dict
@@ -27,14 +27,14 @@ class SimplifiedArtist:
         return f'{self.name}'
 
 
-@dataclass
+@model
 class ArtistFull(SimplifiedArtist):
     genres: List[str]
     images: List[Image]
     popularity: int
 
     def __post_init__(self):
-        super().__post_init__()
+        SimplifiedArtist.__post_init__(self)
 
         if all((isinstance(i, dict) for i in self.images)):
-            self.images = [init_with_key_filter(Image, i) for i in self.images]
+            self.images = parse_many(Image, self.images)
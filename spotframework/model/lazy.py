@@ -0,0 +1,180 @@
+from dataclasses import fields, MISSING
+from typing import Iterable
+
+from spotframework.model import init_with_key_filter, parse_many, build_model, intern, interning, intern_pool
+from spotframework.model.album import SimplifiedAlbum, AlbumFull
+from spotframework.model.artist import SimplifiedArtist, ArtistFull
+from spotframework.model.track import SimplifiedTrack, TrackFull, PlaylistTrack, LibraryTrack, PlayedTrack
+from spotframework.model.user import PublicUser
+from spotframework.model.uri import Uri
+from spotframework.util.dates import parse_timestamp
+
+# field converted by building the whole model from its dictionary
+hydrate = object()
+
+
+def to_uri(value):
+    return Uri(value) if isinstance(value, str) else value
+
+
+def to_datetime(value):
+    return parse_timestamp(value) if isinstance(value, str) else value
+
+
+def lazy_object(class_type: type):
+    def convert(value):
+        return lazy(class_type, value) if isinstance(value, dict) else value
+    return convert
+
+
+def lazy_list(class_type: type):
+    def convert(value):
+        return lazy_many(class_type, value) if isinstance(value, list) and all(isinstance(i, dict) for i in value) \
+            else value
+    return convert
+
+
+# fields needing conversion from their json value by model, any other field is used as is
+converters = {
+    SimplifiedArtist: {'uri': to_uri},
+    ArtistFull: {'images': hydrate},
+    SimplifiedAlbum: {'uri': to_uri, 'artists': lazy_list(SimplifiedArtist),
+                      'album_type': hydrate, 'images': hydrate, 'release_date': hydrate},
+    AlbumFull: {'tracks': hydrate},
+    SimplifiedTrack: {'uri': to_uri, 'artists': lazy_list(SimplifiedArtist)},
+    TrackFull: {'album': lazy_object(SimplifiedAlbum)},
+    PublicUser: {'uri': to_uri, 'images': hydrate},
+    PlaylistTrack: {'track': lazy_object(TrackFull), 'added_by': lazy_object(PublicUser), 'added_at': to_datetime},
+    LibraryTrack: {'track': lazy_object(TrackFull), 'added_at': to_datetime},
+    PlayedTrack: {'track': lazy_object(TrackFull), 'played_at': to_datetime, 'context': hydrate},
+}
+
+
+class LazyModel:
+    """Model built from a json dictionary one field at a time as fields are first read
+
+    Fields whose conversion is expensive to do alone, dates of albums for example, build the whole model from the
+    dictionary. The dictionary is kept until then, reading a field of this kind or calling hydrate releases it.
+
+    Models built within an interning block keep its pool, nested albums, artists and users read later are shared
+    through it.
+    """
+
+    __slots__ = ()
+
+    model = None
+    converters = dict()
+    defaults = dict()
+
+    def __getattr__(self, name):
+        if name not in self.converters:
+            raise AttributeError(f"'{type(self).__name__}' object has no attribute '{name}'")
+
+        converter = self.converters[name]
+        if converter is hydrate:
+            self.hydrate()
+            return object.__getattribute__(self, name)
+
+        if name in self.raw:
+            value = self.raw[name]
+            if converter is not None:
+                if self.pool is not None:
+                    with interning(self.pool):
+                        value = converter(value)
+                else:
+                    value = converter(value)
+        else:
+            value = self.defaults[name]()
+
+        object.__setattr__(self, name, value)
+        return value
+
+    def hydrate(self):
+        """set every unread field from a model built with init_with_key_filter, does nothing once hydrated"""
+
+        if self.raw is None:
+            return
+
+        if self.pool is not None:
+            with interning(self.pool):
+                built = build_model(self.model, self.raw)
+        else:
+            built = build_model(self.model, self.raw)
+        for name in self.converters:
+            try:
+                object.__getattribute__(self, name)
+            except AttributeError:
+                object.__setattr__(self, name, getattr(built, name))
+
+        self.raw = None
+        self.pool = None
+
+    def __eq__(self, other):
+        result = self.model.__eq__(self, other)
+        if result is NotImplemented and isinstance(other, self.model) \
+                and type(other) in (self.model, lazy_classes[self.model]):
+            return all(getattr(self, i.name) == getattr(other, i.name) for i in fields(self.model) if i.compare)
+        return result
+
+    __hash__ = None
+
+
+def field_default(field):
+    if field.default is not MISSING:
+        return lambda: field.default
+    if field.default_factory is not MISSING:
+        return field.default_factory
+    return lambda: None
+
+
+def lazy_class(class_type: type) -> type:
+    """LazyModel subclass of a slotted model"""
+
+    field_converters = dict()
+    for parent in reversed(class_type.__mro__):
+        field_converters.update(converters.get(parent, dict()))
+
+    model_fields = fields(class_type)
+    return type(f'Lazy{class_type.__name__}', (LazyModel, class_type), {
+        '__slots__': ('raw', 'pool'),
+        '__module__': __name__,
+        '__qualname__': f'Lazy{class_type.__name__}',
+        'model': class_type,
+        'converters': {i.name: field_converters.get(i.name) for i in model_fields},
+        'defaults': {i.name: field_default(i) for i in model_fields}
+    })
+
+
+# models without slots would shadow unread fields with their class level defaults
+lazy_classes = {i: lazy_class(i) for i in converters if '__slots__' in i.__dict__}
+globals().update({i.__name__: i for i in lazy_classes.values()})
+
+
+def lazy(class_type: type, dict_obj: dict):
+    """model reading its fields from dict_obj on first access, built with init_with_key_filter if not supported
+
+    :param class_type: model class, the returned object is an instance of it
+    :param dict_obj: json dictionary for the model, kept until the model is hydrated
+    """
+
+    if class_type not in lazy_classes:
+        return init_with_key_filter(class_type, dict_obj)
+
+    return intern(class_type, dict_obj, new_lazy)
+
+
+def new_lazy(class_type: type, dict_obj: dict):
+    obj = object.__new__(lazy_classes[class_type])
+    obj.raw = dict_obj
+    obj.pool = intern_pool.get()
+    return obj
+
+
+def lazy_many(class_type: type, dicts: Iterable[dict]) -> list:
+    """lazy for each of a list of dictionaries"""
+
+    lazy_type = lazy_classes.get(class_type)
+    if lazy_type is None:
+        return parse_many(class_type, dicts)
+
+    return [lazy(class_type, i) for i in dicts]
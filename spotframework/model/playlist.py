@@ -1,9 +1,8 @@
-from dataclasses import dataclass
 from spotframework.model.user import PublicUser
 from spotframework.model.track import TrackFull, PlaylistTrack
 from spotframework.model.uri import Uri
 from spotframework.model.service import Image
-from spotframework.model import init_with_key_filter
+from spotframework.model import init_with_key_filter, parse_many, model
 from tabulate import tabulate
 from typing import List, Union
 import logging
@@ -11,7 +10,7 @@ import logging
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@model
 class SimplifiedPlaylist:
     collaborative: bool
     description: str
@@ -40,7 +39,7 @@ class SimplifiedPlaylist:
                 raise TypeError('provided uri not for a playlist')
 
         if (images := getattr(self, "images")) and all((isinstance(i, dict) for i in images)):
-            self.images = [init_with_key_filter(Image, i) for i in self.images]
+            self.images = parse_many(Image, self.images)
 
         if isinstance(self.owner, dict):
             self.owner = init_with_key_filter(PublicUser, self.owner)
@@ -116,7 +115,7 @@ class SimplifiedPlaylist:
         return table
 
 
-@dataclass
+@model
 class FullPlaylist(SimplifiedPlaylist):
     followers: dict = None
 
@@ -132,7 +131,7 @@ class FullPlaylist(SimplifiedPlaylist):
                 raise TypeError('provided uri not for a playlist')
 
         if all((isinstance(i, dict) for i in self.images)):
-            self.images = [init_with_key_filter(Image, i) for i in self.images]
+            self.images = parse_many(Image, self.images)
 
         if isinstance(self.owner, dict):
             self.owner = init_with_key_filter(PublicUser, self.owner)
@@ -1,18 +1,18 @@
 from typing import List, Union
-from dataclasses import dataclass
 from datetime import datetime
 
-from spotframework.model import init_with_key_filter
+from spotframework.model import init_with_key_filter, parse_many, model
 
 from spotframework.model.service import Image
 from spotframework.model.uri import Uri
+from spotframework.util.dates import parse_release_date, release_date_formats
 
-@dataclass
+@model
 class ResumePoint:
     fully_played: bool
     resume_position_ms: int
 
-@dataclass
+@model
 class SimplifiedEpisode:
     audio_preview_url: str
     description: str
@@ -46,17 +46,13 @@ class SimplifiedEpisode:
             self.resume_point = init_with_key_filter(ResumePoint, self.resume_point)
 
         if all((isinstance(i, dict) for i in self.images)):
-            self.images = [init_with_key_filter(Image, i) for i in self.images]
+            self.images = parse_many(Image, self.images)
 
         if isinstance(self.release_date, str):
-            if self.release_date_precision == 'year':
-                self.release_date = datetime.strptime(self.release_date, '%Y')
-            elif self.release_date_precision == 'month':
-                self.release_date = datetime.strptime(self.release_date, '%Y-%m')
-            elif self.release_date_precision == 'day':
-                self.release_date = datetime.strptime(self.release_date, '%Y-%m-%d')
-
-@dataclass
+            if self.release_date_precision in release_date_formats:
+                self.release_date = parse_release_date(self.release_date, self.release_date_precision)
+
+@model
 class SimplifiedShow:
     available_markets: List[str]
     copyrights: List[dict]
@@ -85,23 +81,23 @@ class SimplifiedShow:
                 raise TypeError('provided uri not for an show')
 
         if all((isinstance(i, dict) for i in self.images)):
-            self.images = [init_with_key_filter(Image, i) for i in self.images]
+            self.images = parse_many(Image, self.images)
 
-@dataclass
+@model
 class EpisodeFull(SimplifiedEpisode):
     show: SimplifiedShow = None
 
     def __post_init__(self):
-        super().__post_init__()
+        SimplifiedEpisode.__post_init__(self)
 
         if isinstance(self.show, SimplifiedShow):
             self.show = init_with_key_filter(SimplifiedShow, self.show)
 
-@dataclass
+@model
 class ShowFull(SimplifiedShow):
     episodes: List[SimplifiedEpisode]
 
-@dataclass
+@model
 class SavedShow:
     added_at: datetime
     show: ShowFull
@@ -1,7 +1,7 @@
-from dataclasses import dataclass
+from spotframework.model import model
 
 
-@dataclass
+@model
 class Image:
     height: int
     width: int
@@ -1,11 +1,12 @@
 from __future__ import annotations
 from typing import Union, List
 from datetime import datetime
-from dataclasses import dataclass, field
+from dataclasses import field
 import logging
 
 import spotframework.model
 from spotframework.model.uri import Uri
+from spotframework.util.dates import parse_timestamp
 from enum import Enum
 import spotframework.model.album
 import spotframework.model.artist
@@ -13,12 +14,12 @@ import spotframework.model.service
 import spotframework.model.user
 from spotframework.model.podcast import EpisodeFull
 
-from spotframework.model import init_with_key_filter
+from spotframework.model import init_with_key_filter, parse_many, model
 
 logger = logging.getLogger(__name__)
 
 
-@dataclass
+@model
 class SimplifiedTrack:
     artists: List[spotframework.model.artist.SimplifiedArtist]
     available_markets: List[str]
@@ -37,6 +38,7 @@ class SimplifiedTrack:
     is_playable: bool = None
     episode: bool = None
     track: bool = None
+    audio_features: AudioFeatures = None
 
     def __post_init__(self):
         if isinstance(self.uri, str):
@@ -47,7 +49,7 @@ class SimplifiedTrack:
                 raise TypeError('provided uri not for a track')
 
         if all((isinstance(i, dict) for i in self.artists)):
-            self.artists = [init_with_key_filter(spotframework.model.artist.SimplifiedArtist, i) for i in self.artists]
+            self.artists = parse_many(spotframework.model.artist.SimplifiedArtist, self.artists)
 
     @property
     def artists_names(self) -> str:
@@ -66,7 +68,7 @@ class SimplifiedTrack:
         return isinstance(other, SimplifiedTrack) and other.name == self.name and other.artists == self.artists
 
 
-@dataclass
+@model
 class TrackFull(SimplifiedTrack):
     album: spotframework.model.album.SimplifiedAlbum = None
     external_ids: dict = None
@@ -77,7 +79,7 @@ class TrackFull(SimplifiedTrack):
         return self.album.artists_names
 
     def __post_init__(self):
-        super().__post_init__()
+        SimplifiedTrack.__post_init__(self)
 
         if isinstance(self.album, dict):
             self.album = init_with_key_filter(spotframework.model.album.SimplifiedAlbum, self.album)
@@ -86,7 +88,7 @@ class TrackFull(SimplifiedTrack):
         return isinstance(other, TrackFull) and other.uri == self.uri
 
 
-@dataclass
+@model
 class LibraryTrack:
     added_at: datetime
     track: TrackFull
@@ -96,10 +98,10 @@ class LibraryTrack:
             self.track = init_with_key_filter(TrackFull, self.track)
 
         if isinstance(self.added_at, str):
-            self.added_at = datetime.strptime(self.added_at, '%Y-%m-%dT%H:%M:%S%z')
+            self.added_at = parse_timestamp(self.added_at)
 
 
-@dataclass
+@model
 class PlaylistTrack:
     added_at: datetime
     added_by: spotframework.model.user.PublicUser
@@ -132,10 +134,10 @@ class PlaylistTrack:
             self.added_by = init_with_key_filter(spotframework.model.user.PublicUser, self.added_by)
 
         if isinstance(self.added_at, str):
-            self.added_at = datetime.strptime(self.added_at, '%Y-%m-%dT%H:%M:%S%z')
+            self.added_at = parse_timestamp(self.added_at)
 
 
-@dataclass
+@model
 class PlayedTrack:
     played_at: datetime
     context: Context
@@ -147,10 +149,10 @@ class PlayedTrack:
         if isinstance(self.track, dict):
             self.track = init_with_key_filter(TrackFull, self.track)
         if isinstance(self.played_at, str):
-            self.played_at = datetime.strptime(self.played_at, '%Y-%m-%dT%H:%M:%S%z')
+            self.played_at = parse_timestamp(self.played_at)
 
 
-@dataclass
+@model
 class AudioFeatures:
     acousticness: float
     analysis_url: str
@@ -288,7 +290,7 @@ class AudioFeatures:
             raise ValueError(f'value {value} is not float')
 
 
-@dataclass
+@model
 class Context:
     uri: Union[str, Uri]
     type: str = None
@@ -309,7 +311,7 @@ class Context:
         return str(self.uri)
 
 
-@dataclass
+@model
 class Device:
 
     class DeviceType(Enum):
@@ -343,7 +345,7 @@ class Device:
         return self.name
 
 
-@dataclass
+@model
 class CurrentlyPlaying:
     context: Context
     timestamp: str
@@ -385,7 +387,7 @@ class CurrentlyPlaying:
         return f'{playing} {self.item} on {self.device} from {self.context} ({self._format_duration(self.progress_ms)})'
 
 
-@dataclass
+@model
 class RecommendationsSeed:
     afterFilteringSize: int
     afterRelinkingSize: int
@@ -395,14 +397,14 @@ class RecommendationsSeed:
     type: str
 
 
-@dataclass
+@model
 class Recommendations:
     seeds: List[RecommendationsSeed]
     tracks: List[spotframework.model.track.SimplifiedTrack]
 
     def __post_init__(self):
         if all((isinstance(i, dict) for i in self.seeds)):
-            self.seeds = [init_with_key_filter(RecommendationsSeed, i) for i in self.seeds]
+            self.seeds = parse_many(RecommendationsSeed, self.seeds)
 
         if all((isinstance(i, dict) for i in self.tracks)):
-            self.tracks = [init_with_key_filter(spotframework.model.track.TrackFull, i) for i in self.tracks]
\ No newline at end of file
+            self.tracks = parse_many(spotframework.model.track.TrackFull, self.tracks)
\ No newline at end of file
@@ -1,7 +1,10 @@
+import threading
+import weakref
 from enum import Enum
 
 
 class Uri:
+    """Immutable, hashable spotify uri, equal strings share one object"""
 
     class ObjectType(Enum):
         track = 1
@@ -12,11 +15,26 @@ class Uri:
         episode = 6
         show = 7
 
-    def __init__(self, input_string: str):
-        self.object_type = None
-        self.object_id = None
-        self.username = None
-        self.is_local = False
+    __slots__ = ('object_type', 'object_id', 'username', 'is_local', 'input_string', 'hash_value', '__weakref__')
+
+    interned = weakref.WeakValueDictionary()
+    intern_lock = threading.Lock()
+
+    def __new__(cls, input_string: str):
+        uri = cls.interned.get(input_string) if isinstance(input_string, str) else None
+        if uri is not None:
+            return uri
+
+        uri = super().__new__(cls)
+        uri.parse(input_string)
+
+        with cls.intern_lock:
+            return cls.interned.setdefault(input_string, uri)
+
+    def parse(self, input_string: str):
+        object_type = None
+        object_id = None
+        is_local = False
 
         parts = input_string.split(':')
 
@@ -24,22 +42,33 @@ class Uri:
             raise ValueError('malformed uri')
 
         if len(parts) == 3:
-            self.object_type = self.ObjectType[parts[1]]
-            self.object_id = parts[2]
+            object_type = self.ObjectType[parts[1]]
+            object_id = parts[2]
         elif len(parts) == 5:
             if parts[1] != 'user':
                 raise ValueError('malformed uri')
-            self.object_type = self.ObjectType[parts[3]]
-            self.object_id = parts[4]
+            object_type = self.ObjectType[parts[3]]
+            object_id = parts[4]
         elif len(parts) == 6:
             if parts[1] == 'local':
-                self.object_type = self.ObjectType.track
-                self.is_local = True
+                object_type = self.ObjectType.track
+                is_local = True
             else:
                 raise ValueError(f'malformed uri: {len(parts)} parts')
         else:
             raise ValueError(f'malformed uri: {len(parts)} parts')
 
+        for name, value in (('object_type', object_type), ('object_id', object_id), ('username', None),
+                            ('is_local', is_local), ('input_string', input_string),
+                            ('hash_value', hash((object_type, object_id)))):
+            object.__setattr__(self, name, value)
+
+    def __setattr__(self, key, value):
+        raise AttributeError('uri is immutable')
+
+    def __delattr__(self, key):
+        raise AttributeError('uri is immutable')
+
     def __str__(self):
         if self.username:
             return f'spotify:user:{self.username}:{self.object_type.name}:{self.object_id}'
@@ -53,9 +82,23 @@ class Uri:
             return f'URI: {self.object_type.name} / {self.object_id}'
 
     def __eq__(self, other):
+        if self is other:
+            return True
+
         if isinstance(other, Uri):
             if other.object_type == self.object_type and other.object_id == self.object_id:
                 return True
 
         return False
 
+    def __hash__(self):
+        return self.hash_value
+
+    def __reduce__(self):
+        return Uri, (self.input_string,)
+
+    def __copy__(self):
+        return self
+
+    def __deepcopy__(self, memo):
+        return self
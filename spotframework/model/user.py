@@ -1,11 +1,12 @@
 from typing import Union, List
-from dataclasses import dataclass, field
+from dataclasses import field
 from spotframework.model.uri import Uri
 from spotframework.model.service import Image
-from spotframework.model import init_with_key_filter
+from spotframework.model import parse_many, model, interned
 
 
-@dataclass
+@interned
+@model
 class PublicUser:
     href: str
     id: str
@@ -27,13 +28,13 @@ class PublicUser:
                 raise TypeError('provided uri not for a user')
 
         if all((isinstance(i, dict) for i in self.images)):
-            self.images = [init_with_key_filter(Image, i) for i in self.images]
+            self.images = parse_many(Image, self.images)
 
     def __str__(self):
         return f'{self.id}'
 
 
-@dataclass
+@model
 class PrivateUser(PublicUser):
     country: str = None
     email: str = None
@@ -48,5 +49,5 @@ class PrivateUser(PublicUser):
                 raise TypeError('provided uri not for a user')
 
         if all((isinstance(i, dict) for i in self.images)):
-            self.images = [init_with_key_filter(Image, i) for i in self.images]
+            self.images = parse_many(Image, self.images)
 
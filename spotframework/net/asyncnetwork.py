@@ -0,0 +1,1219 @@
+import asyncio
+import random
+import logging
+import time
+import json as jsonlib
+from base64 import b64encode
+from typing import List, Optional, Union, AsyncIterator
+import datetime
+
+try:
+    import aiohttp
+except ImportError:
+    aiohttp = None
+
+from spotframework.net.user import NetworkUser
+from spotframework.net.ratelimit import RateLimiter, get_rate_limiter
+from spotframework.net.metrics import RequestEvent, endpoint_name
+from spotframework.net.network import Network, Page, SearchResponse, SpotifyNetworkException, filter_response
+
+from spotframework.model import init_with_key_filter, parse_many
+
+from spotframework.model.user import PublicUser
+from spotframework.model.playlist import SimplifiedPlaylist, FullPlaylist
+from spotframework.model.artist import ArtistFull
+from spotframework.model.album import AlbumFull, LibraryAlbum, SimplifiedAlbum
+from spotframework.model.track import SimplifiedTrack, TrackFull, PlaylistTrack, PlayedTrack, LibraryTrack, \
+    AudioFeatures, Device, CurrentlyPlaying, Recommendations
+from spotframework.model.podcast import SimplifiedEpisode, EpisodeFull, SimplifiedShow, ShowFull
+from spotframework.model.uri import Uri
+from spotframework.util.decorators import inject_uri, uri_type_check
+
+logger = logging.getLogger(__name__)
+
+
+def encode_params(params: dict = None) -> Optional[list]:
+    """flatten query parameters into key/value pairs, lists are repeated and None values dropped"""
+
+    if not params:
+        return None
+
+    encoded = []
+    for key, value in params.items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            encoded += [(key, str(i)) for i in value]
+        elif isinstance(value, bool):
+            encoded.append((key, str(value).lower()))
+        else:
+            encoded.append((key, str(value)))
+    return encoded
+
+
+class AsyncNetwork:
+    """asyncio network layer mirroring Network, requires aiohttp"""
+
+    api_root = Network.api_root
+    token_url = Network.token_url
+    unneeded_keys = Network.unneeded_keys
+
+    def __init__(self,
+                 user: NetworkUser,
+                 max_workers: int = 8,
+                 session=None,
+                 rate_limiter: RateLimiter = None,
+                 token_refresh_margin: int = 60):
+        """Create async network using NetworkUser containing credentials
+
+        :param user: target spotify user
+        :param max_workers: max concurrent requests when fanning out paged reads and batch lookups
+        :param session: optional aiohttp.ClientSession to share between networks
+        :param rate_limiter: request budget, defaults to the limiter shared by the user's client id
+        :param token_refresh_margin: seconds before expiry to refresh the access token
+        """
+        if aiohttp is None:
+            raise ImportError('aiohttp is required for AsyncNetwork, install spotframework[async]')
+
+        self.user = user
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter(user.client_id)
+        self.session = session
+        self.owns_session = session is None
+        self.token_refresh_margin = token_refresh_margin
+        self.refresh_lock = None
+        self.observers = []
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        await self.close()
+
+    async def close(self):
+        if self.session is not None and self.owns_session:
+            await self.session.close()
+            self.session = None
+
+    def get_session(self):
+        if self.session is None:
+            self.session = aiohttp.ClientSession()
+        return self.session
+
+    async def net_call(self,
+                       method: str,
+                       url_path: str = None,
+                       whole_url: str = None,
+                       params: dict = None,
+                       data: dict = None,
+                       json: dict = None,
+                       headers: dict = None,
+                       auth: bool = True,
+                       **kwargs) -> Optional[dict]:
+
+        method = method.strip().upper()
+
+        if not url_path and not whole_url:
+            raise KeyError("No URL provided for request")
+
+        if whole_url:
+            url = whole_url
+        else:
+            url = self.api_root + url_path
+
+        if not headers:
+            headers = dict()
+
+        if kwargs:
+            if method in ['GET', 'DELETE']:
+                if not params:
+                    params = dict()
+                params.update({i: j for i, j in kwargs.items() if j is not None})
+            elif method in ['POST', 'PUT']:
+                if not json:
+                    json = dict()
+                json.update({i: j for i, j in kwargs.items() if j is not None})
+
+        rate_limit_attempts = 0
+        refresh_attempts = 0
+        while True:
+            throttled = 0
+            if auth:
+                await self.ensure_access_token()
+                sent_token = self.user.access_token
+                headers['Authorization'] = 'Bearer ' + sent_token
+                throttled = await self.rate_limiter.acquire_async()
+
+            start = time.perf_counter()
+            async with self.get_session().request(method=method,
+                                                  url=url,
+                                                  headers=headers,
+                                                  params=encode_params(params),
+                                                  json=json,
+                                                  data=data) as response:
+                status = response.status
+                retry_after = response.headers.get('Retry-After', None)
+                text = await response.text()
+            duration = time.perf_counter() - start
+
+            if self.observers:
+                self.notify(RequestEvent(method=method,
+                                         endpoint=endpoint_name(url, self.api_root),
+                                         status=status,
+                                         duration=duration,
+                                         bytes_received=len(text.encode('utf-8')),
+                                         throttled=throttled,
+                                         retry_after=int(retry_after) + 1
+                                         if status == 429 and retry_after and rate_limit_attempts < 5 else 0))
+
+            if 200 <= status < 300:
+                logger.debug(f'{method} {url_path or whole_url} {status}')
+                if auth:
+                    self.rate_limiter.success()
+
+                if status == 204 or not text:
+                    return None
+
+                try:
+                    return jsonlib.loads(text)
+                except jsonlib.JSONDecodeError:
+                    return None
+
+            if status == 429:
+                if rate_limit_attempts < 5:
+                    rate_limit_attempts += 1
+                    if retry_after:
+                        logger.warning(f'{method} {url_path or whole_url} rate limit reached: '
+                                       f'retrying in {retry_after} seconds')
+                        self.rate_limiter.backoff(int(retry_after) + 1)
+                        continue
+                    else:
+                        logger.error(f'{method} {url_path or whole_url} rate limit reached: '
+                                     f'cannot find Retry-After header')
+                else:
+                    logger.critical(f'{method} {url_path or whole_url} rate limit retry limit (5) reached')
+
+            elif status == 401 and auth:
+                if refresh_attempts < 5:
+                    refresh_attempts += 1
+                    logger.warning(f'{method} {url_path or whole_url} access token expired, refreshing')
+                    await self.refresh_access_token(expired_token=sent_token)
+                    continue
+                else:
+                    logger.critical(f'{method} {url_path or whole_url} refresh token limit (5) reached')
+
+            try:
+                error_json = jsonlib.loads(text)
+                error_message = error_json.get("error", {})
+
+                if isinstance(error_message, dict):
+                    error_message = error_message.get("message", error_json)
+
+                logger.error(f'{method} {status} {error_message}')
+                raise SpotifyNetworkException(http_code=status, message=error_message)
+
+            except (KeyError, AttributeError, jsonlib.JSONDecodeError):
+                logger.error(f'{method} {status} no error object found')
+                raise SpotifyNetworkException(http_code=status, message=text)
+
+    def notify(self, event):
+        """pass a RequestEvent to each observer"""
+        for func in self.observers:
+            func(event)
+
+    async def get_request(self, url=None, params=None, headers=None, whole_url=None, auth=True,
+                          **kwargs) -> Optional[dict]:
+        """HTTP get request for reading from service
+
+        :param url: query url string following hostname and api version
+        :param params: dictionary of query parameters
+        :param headers: additional request headers
+        :param whole_url: override base api url with new hostname and url
+        :param auth: direct bearer authentication header to be injected
+        :return: dictionary of json response if available
+        """
+
+        return await self.net_call(method='GET', url_path=url, whole_url=whole_url, params=params,
+                                   headers=headers, auth=auth, **kwargs)
+
+    async def post_request(self, url=None, params=None, json=None, data=None,
+                           headers=None, whole_url=None, auth=True, **kwargs) -> Optional[dict]:
+        """HTTP post request for reading from service
+
+        :param url: query url string following hostname and api version
+        :param params: dictionary of query parameters
+        :param json: dictionary request body for conversion to json during transmission
+        :param data: dictionary request body for transmission
+        :param headers: additional request headers
+        :param whole_url: override base api url with new hostname and url
+        :param auth: direct bearer authentication header to be injected
+        :return: response object if available
+        """
+
+        return await self.net_call(method='POST', url_path=url, whole_url=whole_url, params=params,
+                                   json=json, data=data, headers=headers, auth=auth, **kwargs)
+
+    async def put_request(self, url=None, params=None, json=None, data=None,
+                          headers=None, whole_url=None, auth=True, **kwargs) -> Optional[dict]:
+        """HTTP put request for reading from service
+
+        :param url: query url string following hostname and api version
+        :param params: dictionary of query parameters
+        :param json: dictionary request body for conversion to json during transmission
+        :param data: dictionary request body for transmission
+        :param headers: additional request headers
+        :param whole_url: override base api url with new hostname and url
+        :param auth: direct bearer authentication header to be injected
+        :return: response object if available
+        """
+
+        return await self.net_call(method='PUT', url_path=url, whole_url=whole_url, params=params,
+                                   json=json, data=data, headers=headers, auth=auth, **kwargs)
+
+    def get_refresh_lock(self) -> asyncio.Lock:
+        if self.refresh_lock is None:
+            self.refresh_lock = asyncio.Lock()
+        return self.refresh_lock
+
+    async def ensure_access_token(self):
+        """refresh the access token ahead of requests if missing or about to expire"""
+
+        if self.user.refresh_token is None:
+            return
+
+        if self.user.access_token is None or self.user.token_expires_within(self.token_refresh_margin):
+            async with self.get_refresh_lock():
+                # re-check, another task may have refreshed while waiting for the lock
+                if self.user.access_token is None or self.user.token_expires_within(self.token_refresh_margin):
+                    await self.request_access_token()
+
+    async def refresh_access_token(self, expired_token: str = None):
+        """refresh access token, concurrent callers wait on a single refresh
+
+        :param expired_token: token rejected by the caller, skip refreshing if it has already been replaced
+        """
+
+        async with self.get_refresh_lock():
+            if expired_token is not None and expired_token != self.user.access_token:
+                logger.debug('access token already refreshed')
+                return self
+
+            await self.request_access_token()
+
+        return self
+
+    async def request_access_token(self):
+        logger.info(f'refreshing token')
+
+        if self.user.refresh_token is None:
+            raise NameError('no refresh token to query')
+
+        if self.user.client_id is None:
+            raise NameError('no client id')
+
+        if self.user.client_secret is None:
+            raise NameError('no client secret')
+
+        idsecret = b64encode(bytes(self.user.client_id + ':' + self.user.client_secret, "utf-8")).decode("ascii")
+        headers = {'Authorization': 'Basic %s' % idsecret}
+
+        try:
+            resp = await self.post_request(headers=headers,
+                                           whole_url=self.token_url,
+                                           auth=False,
+                                           data={"grant_type": "refresh_token",
+                                                 "refresh_token": self.user.refresh_token})
+
+            self.user.access_token = resp['access_token']
+            if resp.get('refresh_token', None):
+                self.user.refresh_token = resp['refresh_token']
+            self.user.token_expiry = resp['expires_in']
+            self.user.last_refreshed = datetime.datetime.utcnow()
+            for func in self.user.on_refresh:
+                func(self.user)
+        except SpotifyNetworkException:
+            logger.exception(f'error refreshing user token')
+
+    async def refresh_user_info(self):
+        self.user.user = await self.current_user()
+
+    async def gather_chunks(self, coroutine_function, chunks) -> list:
+        """run coroutine over each chunk with at most max_workers in flight, results kept in chunk order"""
+
+        semaphore = asyncio.Semaphore(max(self.max_workers or 1, 1))
+
+        async def run(chunk):
+            async with semaphore:
+                return await coroutine_function(chunk)
+
+        return list(await asyncio.gather(*[run(chunk) for chunk in chunks]))
+
+    @inject_uri(uris=False)
+    @uri_type_check(uri_type=Uri.ObjectType.playlist)
+    async def playlist(self,
+                       uri: Uri,
+                       tracks: bool = True) -> FullPlaylist:
+        """get playlist object with tracks for uri
+
+        :param uri: target request uri
+        :param tracks: populate tracks of playlist during generation
+        :return: playlist object
+        """
+
+        logger.info(f"retrieving {uri}")
+
+        resp = await self.get_request(f'playlists/{uri.object_id}')
+        playlist = init_with_key_filter(FullPlaylist, resp)
+
+        if resp.get('tracks') and tracks:
+            if 'next' in resp['tracks']:
+                logger.debug(f'paging tracks for {uri}')
+
+                track_pager = AsyncPageCollection(net=self, url=f'playlists/{uri.object_id}/tracks',
+                                                  page=resp['tracks'])
+                await track_pager.iterate_parallel(max_workers=self.max_workers)
+
+                playlist.tracks = parse_many(PlaylistTrack, track_pager.items)
+            else:
+                logger.debug(f'parsing {len(resp.get("tracks"))} tracks for {uri}')
+                playlist.tracks = parse_many(PlaylistTrack, resp.get('tracks', []))
+
+        return playlist
+
+    async def create_playlist(self,
+                              username: str,
+                              name: str = 'New Playlist',
+                              public: bool = True,
+                              collaborative: bool = False,
+                              description: str = None) -> FullPlaylist:
+        """create playlist for user
+
+        :param username: username for playlist creation
+        :param name: new playlist name
+        :param public: make playlist public
+        :param collaborative: make playlist collaborative
+        :param description: description for new playlist
+        :return: newly created playlist object
+        """
+        logger.info(f'creating {name} for {username}, '
+                    f'public: {public}, collaborative: {collaborative}, description: {description}')
+
+        if collaborative and public:
+            public = False
+            logger.warning(f'public collaborative playlist requested, defaulting to private {username} / {name}')
+
+        req = await self.post_request(f'users/{username}/playlists',
+                                      name=name,
+                                      public=public,
+                                      collaborative=collaborative,
+                                      description=description)
+        return init_with_key_filter(FullPlaylist, req)
+
+    async def playlists(self, response_limit: int = None) -> Optional[List[SimplifiedPlaylist]]:
+        """get current users playlists
+
+        :param response_limit: max playlists to return
+        :return: List of user created and followed playlists if available
+        """
+
+        logger.info(f"paging playlists")
+
+        pager = AsyncPageCollection(net=self, url='me/playlists', name='getPlaylists', total_limit=response_limit)
+        await pager.iterate_parallel(max_workers=self.max_workers)
+
+        return_items = parse_many(SimplifiedPlaylist, pager.items)
+
+        if len(return_items) == 0:
+            logger.error('no playlists returned')
+
+        return return_items
+
+    async def saved_albums(self, response_limit: int = None) -> Optional[List[LibraryAlbum]]:
+        """get user library albums
+
+        :param response_limit: max albums to return
+        :return: List of user library albums if available
+        """
+
+        logger.info(f"paging library albums")
+
+        pager = AsyncPageCollection(net=self, url='me/albums', name='getLibraryAlbums', total_limit=response_limit)
+        await pager.iterate_parallel(max_workers=self.max_workers)
+
+        return_items = parse_many(LibraryAlbum, pager.items)
+
+        if len(return_items) == 0:
+            logger.error('no albums returned')
+
+        return return_items
+
+    async def saved_tracks(self, response_limit: int = None) -> Optional[List[LibraryTrack]]:
+        """get user library tracks
+
+        :param response_limit: max tracks to return
+        :return: List of saved library trakcs if available
+        """
+
+        logger.info(f"paging library tracks")
+
+        pager = AsyncPageCollection(net=self, url='me/tracks', name='getLibraryTracks', total_limit=response_limit)
+        await pager.iterate_parallel(max_workers=self.max_workers)
+
+        return_items = parse_many(LibraryTrack, pager.items)
+
+        if len(return_items) == 0:
+            logger.error('no tracks returned')
+
+        return return_items
+
+    async def iter_saved_tracks(self, response_limit: int = None) -> AsyncIterator[LibraryTrack]:
+        """stream user library tracks page by page, the next page is downloaded while the current is consumed
+
+        :param response_limit: max tracks to return
+        :return: async generator of saved library tracks
+        """
+
+        logger.info(f"streaming library tracks")
+
+        pager = AsyncPageCollection(net=self, url='me/tracks', name='iterLibraryTracks', total_limit=response_limit)
+        async for page in pager.iter_pages():
+            for item in page.items:
+                yield init_with_key_filter(LibraryTrack, item)
+
+    async def user_playlists(self, response_limit: int = None) -> List[SimplifiedPlaylist]:
+        """retrieve user owned playlists
+
+        :param response_limit: max playlists to return
+        :return: List of user owned playlists if available
+        """
+
+        logger.info('pulling all playlists')
+
+        playlists = await self.playlists(response_limit=response_limit)
+
+        if self.user.user is None:
+            logger.debug('no user info, refreshing for filter')
+            await self.refresh_user_info()
+
+        if playlists is not None:
+            return list(filter(lambda x: x.owner.id == self.user.user.id, playlists))
+        else:
+            logger.error('no playlists returned to filter')
+
+    @inject_uri(uris=False)
+    @uri_type_check(uri_type=Uri.ObjectType.playlist)
+    async def playlist_tracks(self,
+                              uri: Uri,
+                              response_limit: int = None,
+                              reduced_mem: bool = False) -> List[PlaylistTrack]:
+        """get list of playlists tracks for uri
+
+        :param uri: target playlist uri
+        :param response_limit: max tracks to return
+        :return: list of playlist tracks if available
+        """
+
+        logger.info(f"paging tracks for {uri}")
+
+        pager = AsyncPageCollection(net=self, url=f'playlists/{uri.object_id}/tracks', name='getPlaylistTracks',
+                                    total_limit=response_limit)
+        await pager.iterate_parallel(max_workers=self.max_workers)
+
+        result = pager.items
+
+        if reduced_mem:
+            result = [filter_response(i, AsyncNetwork.unneeded_keys) for i in result]
+
+        return_items = parse_many(PlaylistTrack, result)
+
+        if len(return_items) == 0:
+            logger.error('no tracks returned')
+
+        return return_items
+
+    @inject_uri(uris=False)
+    @uri_type_check(uri_type=Uri.ObjectType.playlist)
+    async def iter_playlist_tracks(self,
+                                   uri: Uri,
+                                   response_limit: int = None,
+                                   reduced_mem: bool = False) -> AsyncIterator[PlaylistTrack]:
+        """stream playlist tracks for uri page by page, the next page is downloaded while the current is consumed
+
+        :param uri: target playlist uri
+        :param response_limit: max tracks to return
+        :return: async generator of playlist tracks
+        """
+
+        logger.info(f"streaming tracks for {uri}")
+
+        pager = AsyncPageCollection(net=self, url=f'playlists/{uri.object_id}/tracks', name='iterPlaylistTracks',
+                                    total_limit=response_limit)
+        async for page in pager.iter_pages():
+            for item in page.items:
+                if reduced_mem:
+                    item = filter_response(item, AsyncNetwork.unneeded_keys)
+                yield init_with_key_filter(PlaylistTrack, item)
+
+    @inject_uri(uris=False)
+    @uri_type_check(uri_type=Uri.ObjectType.show)
+    async def show_episodes(self,
+                            uri: Uri,
+                            response_limit: int = None) -> List[SimplifiedEpisode]:
+        """get list of shows episodes for uri
+
+        :param uri: target show uri
+        :param response_limit: max episodes to return
+        :return: list of show episodes if available
+        """
+
+        logger.info(f"paging episodes for {uri}")
+
+        pager = AsyncPageCollection(net=self, url=f'shows/{uri.object_id}/episodes', name='getShowEpisodes',
+                                    total_limit=response_limit)
+        await pager.iterate_parallel(max_workers=self.max_workers)
+
+        return_items = parse_many(SimplifiedEpisode, pager.items)
+
+        if len(return_items) == 0:
+            logger.error('no episodes returned')
+
+        return return_items
+
+    async def available_devices(self) -> List[Device]:
+        """get users available devices"""
+
+        logger.info("polling available devices")
+
+        resp = await self.get_request('me/player/devices')
+
+        if len(resp['devices']) == 0:
+            logger.error('no devices returned')
+        return parse_many(Device, resp['devices'])
+
+    async def recently_played_tracks(self,
+                                     response_limit: int = None,
+                                     after: datetime.datetime = None,
+                                     before: datetime.datetime = None) -> Optional[List[PlayedTrack]]:
+        """get list of recently played tracks
+
+        :param response_limit: max number of tracks to return
+        :param after: datetime after which to return tracks
+        :param before: datetime before which to return tracks
+        :return: list of recently played tracks if available
+        """
+
+        logger.info(f"paging {'all' if response_limit is None else response_limit} recent tracks ({after}/{before})")
+
+        params = dict()
+        if after and before:
+            raise ValueError('cant have before and after')
+        if after:
+            params['after'] = int(after.timestamp() * 1000)
+        if before:
+            params['before'] = int(before.timestamp() * 1000)
+
+        resp = await self.get_request('me/player/recently-played', params=params)
+
+        pager = AsyncPageCollection(self, page=resp)
+        if response_limit:
+            pager.total_limit = response_limit
+        else:
+            pager.total_limit = 20
+        await pager.continue_iteration()
+
+        return parse_many(PlayedTrack, pager.items)
+
+    async def player(self) -> CurrentlyPlaying:
+        """get currently playing snapshot (player)"""
+
+        logger.info("polling player")
+
+        resp = await self.get_request('me/player')
+        return init_with_key_filter(CurrentlyPlaying, resp)
+
+    async def map_device_name_to_id(self, device_name: str) -> Optional[str]:
+        """return device id of device as searched for by name
+
+        :param device_name: target device name
+        :return: device ID
+        """
+
+        logger.info(f"querying {device_name}")
+
+        devices = await self.available_devices()
+        device = next((i for i in devices if i.name == device_name), None)
+        if device:
+            return device.id
+        else:
+            logger.error(f'{device_name} not found')
+
+    async def current_user(self) -> PublicUser:
+        logger.info(f"getting current user")
+
+        resp = await self.get_request('me')
+        return init_with_key_filter(PublicUser, resp)
+
+    async def change_playback_device(self, device_id: str):
+        """migrate playback to different device"""
+        logger.info(f'shifting playback to {device_id}')
+        await self.put_request('me/player', device_ids=[device_id], play=True)
+
+    @inject_uri(uri_optional=True, uris_optional=True)
+    async def play(self,
+                   uri: Uri = None,
+                   uris: List[Uri] = None,
+                   deviceid: str = None):
+        """begin playback"""
+
+        logger.info(f"{uri}{' ' + deviceid if deviceid is not None else ''}")
+
+        if deviceid is not None:
+            params = {'device_id': deviceid}
+        else:
+            params = None
+
+        if uri and uris:
+            raise Exception('wont take both context uri and uris')
+
+        payload = dict()
+
+        if uri:
+            payload['context_uri'] = str(uri)
+        if uris:
+            payload['uris'] = [str(i) for i in uris[:200]]
+
+        await self.put_request('me/player/play', params=params, json=payload)
+
+    async def pause(self, deviceid: str = None):
+        """pause playback"""
+
+        logger.info(f"{deviceid or ''}")
+
+        if deviceid is not None:
+            params = {'device_id': deviceid}
+        else:
+            params = None
+
+        await self.put_request('me/player/pause', params=params)
+
+    async def next(self, deviceid: str = None):
+        """skip track playback"""
+
+        logger.info(f"{deviceid or ''}")
+
+        if deviceid is not None:
+            params = {'device_id': deviceid}
+        else:
+            params = None
+
+        await self.post_request('me/player/next', params=params)
+
+    async def previous(self, deviceid: str = None):
+        """skip playback backwards"""
+
+        logger.info(f"{deviceid if deviceid is not None else ''}")
+
+        if deviceid is not None:
+            params = {'device_id': deviceid}
+        else:
+            params = None
+
+        await self.post_request('me/player/previous', params=params)
+
+    async def shuffle(self, state: bool, deviceid: str = None):
+
+        logger.info(f"{state}{' ' + deviceid if deviceid is not None else ''}")
+
+        params = {'state': str(state).lower()}
+
+        if deviceid is not None:
+            params['device_id'] = deviceid
+
+        return await self.put_request('me/player/shuffle', params=params)
+
+    async def volume(self, volume: int, deviceid: str = None):
+
+        logger.info(f"{volume}{' ' + deviceid if deviceid is not None else ''}")
+
+        if 0 <= int(volume) <= 100:
+
+            params = {'volume_percent': volume}
+            if deviceid is not None:
+                params['device_id'] = deviceid
+
+            await self.put_request('me/player/volume', params=params)
+
+        else:
+            logger.error(f"{volume} not accepted value")
+
+    @inject_uri
+    @uri_type_check(uri_type=Uri.ObjectType.playlist, uris_type=(Uri.ObjectType.track, Uri.ObjectType.episode))
+    async def replace_playlist_tracks(self,
+                                      uri: Uri,
+                                      uris: List[Uri]) -> Optional[List[str]]:
+
+        logger.info(f"replacing {uri} with {'0' if uris is None else len(uris)} tracks")
+
+        resp = await self.put_request(f'playlists/{uri.object_id}/tracks', uris=[str(i) for i in uris[:100]])
+        snapshot_ids = [resp["snapshot_id"]]
+
+        if len(uris) > 100:
+            snapshot_ids += await self.add_playlist_tracks(uri=uri, uris=uris[100:])
+
+        return snapshot_ids
+
+    @inject_uri(uris=False)
+    @uri_type_check(uri_type=Uri.ObjectType.playlist)
+    async def change_playlist_details(self,
+                                      uri: Uri,
+                                      name: str = None,
+                                      public: bool = None,
+                                      collaborative: bool = None,
+                                      description: str = None):
+
+        logger.info(f"updating {uri}, name: {name}, public: {public}, collab: {collaborative}, "
+                    f"description: {(description[:30] + '...' if len(description) > 33 else description) if description is not None else None}")
+
+        if all(v is None for v in [name, public, collaborative, description]):
+            logger.warning('update dictionairy length 0')
+        else:
+            await self.put_request(f'playlists/{uri.object_id}',
+                                   name=name,
+                                   public=public,
+                                   collaborative=collaborative,
+                                   description=description)
+
+    @inject_uri
+    @uri_type_check(uri_type=Uri.ObjectType.playlist, uris_type=(Uri.ObjectType.track, Uri.ObjectType.episode))
+    async def add_playlist_tracks(self, uri: Uri, uris: List[Uri]) -> List[str]:
+
+        logger.info(f"adding {len(uris)} tracks to {uri}")
+
+        # sequential to preserve track order within the playlist
+        snapshot_ids = []
+        for chunk in Network.chunk(uris, 100):
+            resp = await self.post_request(f'playlists/{uri.object_id}/tracks', uris=[str(i) for i in chunk])
+            snapshot_ids.append(resp["snapshot_id"])
+
+        return snapshot_ids
+
+    async def recommendations(self,
+                              tracks: List[str] = None,
+                              artists: List[str] = None,
+                              response_limit=10) -> Optional[Recommendations]:
+
+        logger.info(f'getting {response_limit} recommendations, '
+                    f'tracks: {len(tracks) if tracks is not None else 0}, '
+                    f'artists: {len(artists) if artists is not None else 0}')
+
+        params = {'limit': response_limit}
+
+        if tracks:
+            random.shuffle(tracks)
+            params['seed_tracks'] = tracks[:5]
+        if artists:
+            random.shuffle(artists)
+            params['seed_artists'] = artists[:5]
+
+        if len(params) == 1:
+            logger.warning('update dictionairy length 0')
+        else:
+            return init_with_key_filter(Recommendations, await self.get_request('recommendations', params=params))
+
+    async def write_playlist_object(self,
+                                    playlist: FullPlaylist,
+                                    append_tracks: bool = False):
+        logger.info(f'writing {playlist.name}, append tracks: {append_tracks}')
+
+        if playlist.uri:
+            if playlist.tracks == -1:
+                logger.debug(f'wiping {playlist.name} tracks')
+                await self.replace_playlist_tracks(uri=playlist.uri, uris=[])
+            elif playlist.tracks:
+                if append_tracks:
+                    await self.add_playlist_tracks(uri=playlist.uri, uris=[i.uri for i in playlist.tracks if
+                                                                           isinstance(i, SimplifiedTrack)])
+                else:
+                    await self.replace_playlist_tracks(uri=playlist.uri, uris=[i.uri for i in playlist.tracks if
+                                                                               isinstance(i, SimplifiedTrack)])
+
+            if playlist.name or playlist.collaborative or playlist.public or playlist.description:
+                await self.change_playlist_details(uri=playlist.uri,
+                                                   name=playlist.name,
+                                                   public=playlist.public,
+                                                   collaborative=playlist.collaborative,
+                                                   description=playlist.description)
+
+        else:
+            logger.error('playlist has no id')
+
+    @inject_uri(uris=False)
+    @uri_type_check(uri_type=Uri.ObjectType.playlist)
+    async def reorder_playlist_tracks(self,
+                                      uri: Uri,
+                                      range_start: int,
+                                      range_length: int,
+                                      insert_before: int,
+                                      snapshot_id: str = None) -> dict:
+        """move range_length tracks from range_start to before insert_before
+
+        :param snapshot_id: snapshot the positions refer to, the service rebases or rejects the move if since edited
+        """
+
+        logger.info(f'reordering {uri} tracks, start: {range_start}, length: {range_length}, before: {insert_before}')
+
+        if range_start < 0:
+            logger.error('range_start must be positive')
+            raise ValueError('range_start must be positive')
+        if range_length < 0:
+            logger.error('range_length must be positive')
+            raise ValueError('range_length must be positive')
+        if insert_before < 0:
+            logger.error('insert_before must be positive')
+            raise ValueError('insert_before must be positive')
+
+        return await self.put_request(f'playlists/{uri.object_id}/tracks',
+                                      range_start=range_start,
+                                      range_length=range_length,
+                                      insert_before=insert_before,
+                                      snapshot_id=snapshot_id)
+
+    @inject_uri(uri=False)
+    @uri_type_check(uris_type=Uri.ObjectType.track)
+    async def track_audio_features(self, uris: List[Uri]) -> Optional[List[AudioFeatures]]:
+        logger.info(f'getting {len(uris)} features')
+
+        async def get_chunk(chunk):
+            resp = await self.get_request(url='audio-features', ids=','.join(i.object_id for i in chunk))
+
+            if resp.get('audio_features', None):
+                return parse_many(AudioFeatures, resp['audio_features'])
+            else:
+                logger.error('no audio features included')
+                return []
+
+        audio_features = [i for chunk in await self.gather_chunks(get_chunk, list(Network.chunk(uris, 100)))
+                          for i in chunk]
+
+        if len(audio_features) == len(uris):
+            return audio_features
+        else:
+            logger.error('mismatched length of input and response')
+
+    async def populate_track_audio_features(self, tracks: Union[SimplifiedTrack, List[SimplifiedTrack]]):
+        """set audio_features of a track or list of tracks
+
+        :return: tracks with audio features populated if available
+        """
+
+        if isinstance(tracks, SimplifiedTrack):
+            audio_features = await self.track_audio_features(uris=[tracks.uri])
+
+            if audio_features:
+                if len(audio_features) == 1:
+                    tracks.audio_features = audio_features[0]
+                    return tracks
+                else:
+                    logger.error(f'{len(audio_features)} features returned')
+            else:
+                logger.error(f'no audio features returned for {tracks.uri}')
+
+        elif isinstance(tracks, list) and all(isinstance(i, SimplifiedTrack) for i in tracks):
+            logger.info(f'populating {len(tracks)} features')
+
+            audio_features = await self.track_audio_features(uris=[i.uri for i in tracks])
+
+            if audio_features:
+                if len(audio_features) != len(tracks):
+                    logger.error(f'{len(audio_features)} features returned for {len(tracks)} tracks')
+
+                for track, audio_feature in zip(tracks, audio_features):
+                    track.audio_features = audio_feature
+
+                return tracks
+            else:
+                logger.error(f'no audio features returned')
+        else:
+            raise TypeError('must provide either single or list of spotify tracks')
+
+    async def get_batch(self, url: str, key: str, class_type: type, uris: List[Uri]) -> list:
+        """request ids from a batch lookup endpoint in chunks of 50, results kept in input order, ids not found are
+        skipped"""
+
+        async def get_chunk(chunk):
+            resp = await self.get_request(url=url, ids=','.join([i.object_id for i in chunk]))
+            if not resp:
+                return []
+
+            items = []
+            for uri, item in zip(chunk, resp.get(key, [])):
+                if item is None:
+                    logger.warning(f'{uri} not found')
+                else:
+                    items.append(item)
+            return parse_many(class_type, items)
+
+        return [i for chunk in await self.gather_chunks(get_chunk, list(Network.chunk(uris, 50))) for i in chunk]
+
+    @inject_uri(uri=False)
+    @uri_type_check(uris_type=Uri.ObjectType.track)
+    async def tracks(self, uris: List[Uri]) -> List[TrackFull]:
+
+        logger.info(f'getting {len(uris)} tracks')
+
+        return await self.get_batch('tracks', 'tracks', TrackFull, uris)
+
+    @inject_uri(uris=False)
+    @uri_type_check(uri_type=Uri.ObjectType.track)
+    async def track(self, uri) -> Optional[TrackFull]:
+
+        track = await self.tracks(uris=[uri])
+        if len(track) == 1:
+            return track[0]
+        else:
+            return None
+
+    @inject_uri(uri=False)
+    @uri_type_check(uris_type=Uri.ObjectType.album)
+    async def albums(self, uris: List[Uri]) -> List[AlbumFull]:
+
+        logger.info(f'getting {len(uris)} albums')
+
+        return await self.get_batch('albums', 'albums', AlbumFull, uris)
+
+    @inject_uri(uris=False)
+    @uri_type_check(uri_type=Uri.ObjectType.album)
+    async def album(self, uri: Uri) -> Optional[AlbumFull]:
+
+        album = await self.albums(uris=[uri])
+        if len(album) == 1:
+            return album[0]
+        else:
+            return None
+
+    @inject_uri(uri=False)
+    @uri_type_check(uris_type=Uri.ObjectType.artist)
+    async def artists(self, uris) -> List[ArtistFull]:
+
+        logger.info(f'getting {len(uris)} artists')
+
+        return await self.get_batch('artists', 'artists', ArtistFull, uris)
+
+    @inject_uri(uris=False)
+    @uri_type_check(uri_type=Uri.ObjectType.artist)
+    async def artist(self, uri) -> Optional[ArtistFull]:
+
+        artist = await self.artists(uris=[uri])
+        if len(artist) == 1:
+            return artist[0]
+        else:
+            return None
+
+    @inject_uri(uri=False)
+    @uri_type_check(uris_type=Uri.ObjectType.show)
+    async def shows(self, uris) -> List[SimplifiedShow]:
+
+        logger.info(f'getting {len(uris)} shows')
+
+        return await self.get_batch('shows', 'shows', SimplifiedShow, uris)
+
+    @inject_uri(uris=False)
+    @uri_type_check(uri_type=Uri.ObjectType.show)
+    async def show(self, uri, episodes: bool = True) -> Optional[ShowFull]:
+
+        logger.info(f"retrieving {uri}")
+
+        resp = await self.get_request(f'shows/{uri.object_id}')
+        show = init_with_key_filter(ShowFull, resp)
+
+        if resp.get('episodes') and episodes:
+            if 'next' in resp['episodes']:
+                logger.debug(f'paging episodes for {uri}')
+
+                track_pager = AsyncPageCollection(net=self, page=resp['episodes'])
+                await track_pager.continue_iteration()
+
+                show.episodes = parse_many(SimplifiedEpisode, track_pager.items)
+            else:
+                logger.debug(f'parsing {len(resp.get("episodes"))} tracks for {uri}')
+                show.episodes = parse_many(SimplifiedEpisode, resp.get('episodes', []))
+        return show
+
+    @inject_uri(uri=False)
+    @uri_type_check(uris_type=Uri.ObjectType.episode)
+    async def episodes(self, uris) -> List[EpisodeFull]:
+
+        logger.info(f'getting {len(uris)} episodes')
+
+        return await self.get_batch('episodes', 'episodes', EpisodeFull, uris)
+
+    @inject_uri(uris=False)
+    @uri_type_check(uri_type=Uri.ObjectType.episode)
+    async def episode(self, uri) -> EpisodeFull:
+
+        logger.info(f"retrieving {uri}")
+
+        resp = await self.get_request(f'episodes/{uri.object_id}')
+        return init_with_key_filter(EpisodeFull, resp)
+
+    async def search(self,
+                     query_types: List[Uri.ObjectType],
+                     query: str = None,
+                     track: str = None,
+                     album: str = None,
+                     artist: str = None,
+                     response_limit: int = 20) -> SearchResponse:
+
+        if query is None and track is None and album is None and artist is None:
+            raise ValueError('no query parameters')
+
+        queries = []
+
+        if query is not None:
+            queries.append(query)
+        if track is not None:
+            queries.append(f'track:{track}')
+        if album is not None:
+            queries.append(f'album:{album}')
+        if artist is not None:
+            queries.append(f'artist:{artist}')
+
+        logger.info(f'querying track: {track}, album: {album}, artist: {artist}')
+
+        resp = await self.get_request(url='search',
+                                      q=' '.join(queries),
+                                      type=','.join([i.name for i in query_types]),
+                                      limit=response_limit)
+
+        albums = parse_many(SimplifiedAlbum, resp.get('albums', {}).get('items', []))
+        artists = parse_many(ArtistFull, resp.get('artists', {}).get('items', []))
+        tracks = parse_many(TrackFull, resp.get('tracks', {}).get('items', []))
+        playlists = parse_many(SimplifiedPlaylist, resp.get('playlists', {}).get('items', []))
+
+        return SearchResponse(tracks=tracks, albums=albums, artists=artists, playlists=playlists)
+
+
+class AsyncPageCollection:
+    def __init__(self,
+                 net: AsyncNetwork,
+                 url: str = None,
+                 page_limit: int = 50,
+                 total_limit: int = None,
+                 name: str = None,
+                 page: dict = None):
+        self.net = net
+        self.url = url
+        self.pages = []
+        self.name = name
+        self.page_limit = page_limit
+        self.total_limit = total_limit
+
+        if page:
+            self.add_page(page)
+
+    def __len__(self):
+        return sum(len(page.items) for page in self.pages)
+
+    @property
+    def total(self):
+        if len(self.pages) > 0:
+            return self.pages[0].total
+        return 0
+
+    @property
+    def items(self):
+        items = [item for page in self.pages for item in page.items]
+        return items[:self.total_limit]
+
+    async def fetch_page(self, url=None, offset: int = None) -> dict:
+        params = {'limit': self.page_limit}
+        if offset is not None:
+            params['offset'] = offset
+
+        if url:
+            return await self.net.get_request(whole_url=url, params=params)
+        else:
+            if self.url:
+                return await self.net.get_request(url=self.url, params=params)
+            else:
+                raise ValueError('no url to query')
+
+    async def continue_iteration(self):
+        if len(self.pages) == 0:
+            raise IndexError('no pages')
+
+        while self.pages[-1].next:
+            if self.total_limit and len(self) >= self.total_limit:
+                return
+            self.add_page(await self.fetch_page(url=self.pages[-1].next))
+
+    async def iterate(self):
+        logger.debug(f'iterating {self.name}')
+
+        if len(self.pages) == 0:
+            self.add_page(await self.fetch_page())
+        await self.continue_iteration()
+
+    async def iterate_parallel(self, max_workers: int = 8):
+        """page through collection using the total from the first page to request all remaining offsets at once
+
+        :param max_workers: max concurrent page requests
+        """
+
+        if len(self.pages) == 0:
+            self.add_page(await self.fetch_page())
+
+        last_page = self.pages[-1]
+        if not last_page.next:
+            return
+
+        start = (last_page.offset or 0) + len(last_page.items)
+        end = last_page.total
+        if self.total_limit:
+            end = min(end, self.total_limit)
+
+        offsets = list(range(start, end, self.page_limit))
+        if len(offsets) == 0:
+            return
+
+        logger.debug(f'fanning out {self.name}, {len(offsets)} pages from offset {start}')
+
+        semaphore = asyncio.Semaphore(max(max_workers or 1, 1))
+
+        async def fetch(offset):
+            async with semaphore:
+                return await self.fetch_page(offset=offset)
+
+        for resp in await asyncio.gather(*[fetch(i) for i in offsets]):
+            self.add_page(resp)
+
+    async def iter_pages(self) -> AsyncIterator[Page]:
+        """yield pages without storing them on the collection, the following page is requested in the background
+        while the current one is consumed
+        """
+
+        task = asyncio.ensure_future(self.fetch_page())
+        count = 0
+
+        try:
+            while task is not None:
+                page = init_with_key_filter(Page, await task)
+                task = None
+
+                if self.total_limit:
+                    page.items = page.items[:self.total_limit - count]
+                count += len(page.items)
+
+                if page.next and (self.total_limit is None or count < self.total_limit):
+                    task = asyncio.ensure_future(self.fetch_page(page.next))
+
+                logger.debug(f'streaming {self.name}, {count}/{page.total}')
+                yield page
+        finally:
+            if task is not None:
+                task.cancel()
+
+    def add_page(self, page_dict):
+        page = init_with_key_filter(Page, page_dict)
+        self.pages.append(page)
+        return page
@@ -0,0 +1,247 @@
+import hashlib
+import json
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Dict, Optional
+
+from spotframework.net.const import api_url
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class CachedResponse:
+    url: str
+    etag: Optional[str]
+    stored_at: float
+    body: dict
+
+
+class ResponseCache:
+    """On-disk cache of GET responses revalidated with ETag / If-None-Match
+
+    Entries are stored one file per request and evicted least recently used once the directory grows past max_size
+    """
+
+    def __init__(self,
+                 path: str,
+                 max_size: int = 256 * 1024 * 1024,
+                 ttl: float = 0,
+                 ttl_overrides: Dict[str, float] = None,
+                 api_root: str = api_url):
+        """
+        :param path: directory for cache files, created if missing
+        :param max_size: max total bytes of cache files
+        :param ttl: seconds an entry is served without revalidating, 0 always revalidates
+        :param ttl_overrides: ttl by endpoint path prefix, eg {'albums': 86400}, longest matching prefix wins
+        :param api_root: root stripped from urls before matching ttl prefixes, unless given by the caller
+        """
+        self.path = path
+        self.max_size = max_size
+        self.ttl = ttl
+        self.ttl_overrides = ttl_overrides if ttl_overrides is not None else dict()
+        self.api_root = api_root
+
+        self.index = OrderedDict()
+        self.size = 0
+        self.lock = threading.Lock()
+
+        os.makedirs(path, exist_ok=True)
+        self.load_index()
+
+    def load_index(self):
+        entries = []
+        for file_name in os.listdir(self.path):
+            if file_name.endswith('.json'):
+                stat = os.stat(os.path.join(self.path, file_name))
+                entries.append((stat.st_mtime, file_name[:-5], stat.st_size))
+
+        for _, key, size in sorted(entries):
+            self.index[key] = size
+            self.size += size
+
+    @staticmethod
+    def key(url: str, params: dict = None, scope: str = None) -> str:
+        """
+        :param scope: identity of the user the response is for, responses to different users never share a key
+        """
+        identity = (scope or '') + '\n' + url + '?' + json.dumps(params or {}, sort_keys=True, default=str)
+        return hashlib.sha256(identity.encode('utf-8')).hexdigest()
+
+    def file_path(self, key: str) -> str:
+        return os.path.join(self.path, f'{key}.json')
+
+    def ttl_for(self, url: str, api_root: str = None) -> float:
+        """
+        :param api_root: root of the network making the request, the cache's api_root if None
+        """
+        api_root = api_root if api_root is not None else self.api_root
+        if api_root and url.startswith(api_root):
+            url = url[len(api_root):]
+
+        matches = [i for i in self.ttl_overrides if url.startswith(i)]
+        if matches:
+            return self.ttl_overrides[max(matches, key=len)]
+        return self.ttl
+
+    def is_fresh(self, entry: CachedResponse, api_root: str = None) -> bool:
+        return time.time() - entry.stored_at < self.ttl_for(entry.url, api_root=api_root)
+
+    def get(self, key: str) -> Optional[CachedResponse]:
+        with self.lock:
+            if key not in self.index:
+                return None
+
+            try:
+                with open(self.file_path(key), 'r') as fileobj:
+                    entry = CachedResponse(**json.load(fileobj))
+            except (OSError, ValueError, TypeError):
+                logger.warning(f'unreadable cache entry {key}, dropping')
+                self.remove(key)
+                return None
+
+            self.index.move_to_end(key)
+            os.utime(self.file_path(key))
+            return entry
+
+    def put(self, key: str, url: str, etag: Optional[str], body: dict, api_root: str = None):
+        if etag is None and self.ttl_for(url, api_root=api_root) <= 0:
+            return
+
+        self.write(key, CachedResponse(url=url, etag=etag, stored_at=time.time(), body=body))
+
+    def revalidate(self, key: str, entry: CachedResponse):
+        """mark entry as fresh after the service confirmed it unchanged"""
+        entry.stored_at = time.time()
+        self.write(key, entry)
+
+    def write(self, key: str, entry: CachedResponse):
+        data = json.dumps(entry.__dict__).encode('utf-8')
+
+        with self.lock:
+            temp_path = self.file_path(key) + f'.{threading.get_ident()}.tmp'
+            with open(temp_path, 'wb') as fileobj:
+                fileobj.write(data)
+            os.replace(temp_path, self.file_path(key))
+
+            self.size += len(data) - self.index.pop(key, 0)
+            self.index[key] = len(data)
+
+            while self.size > self.max_size and len(self.index) > 1:
+                self.remove(next(iter(self.index)))
+
+    def remove(self, key: str):
+        self.size -= self.index.pop(key, 0)
+        try:
+            os.remove(self.file_path(key))
+        except OSError:
+            pass
+
+    def clear(self):
+        with self.lock:
+            for key in list(self.index):
+                self.remove(key)
+
+
+class PlaylistTrackCache:
+    """Persistent cache of playlist track payloads keyed by playlist id and snapshot_id
+
+    Only the latest snapshot of each playlist is kept, payloads are stored rather than models so entries survive
+    changes to the model classes
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: directory for cache files, created if missing
+        """
+        self.path = path
+        self.lock = threading.Lock()
+
+        os.makedirs(path, exist_ok=True)
+
+    def file_path(self, playlist_id: str) -> str:
+        return os.path.join(self.path, f'{playlist_id}.json')
+
+    def get(self, playlist_id: str, snapshot_id: str) -> Optional[list]:
+        """get playlist track items if cached for snapshot_id"""
+
+        try:
+            with open(self.file_path(playlist_id), 'r') as fileobj:
+                entry = json.load(fileobj)
+        except FileNotFoundError:
+            return None
+        except (OSError, ValueError):
+            logger.warning(f'unreadable cache entry for {playlist_id}')
+            return None
+
+        if entry.get('snapshot_id') != snapshot_id:
+            return None
+
+        return entry.get('items')
+
+    def put(self, playlist_id: str, snapshot_id: str, items: list):
+        data = json.dumps({'snapshot_id': snapshot_id, 'items': items}).encode('utf-8')
+
+        with self.lock:
+            temp_path = self.file_path(playlist_id) + f'.{threading.get_ident()}.tmp'
+            with open(temp_path, 'wb') as fileobj:
+                fileobj.write(data)
+            os.replace(temp_path, self.file_path(playlist_id))
+
+    def remove(self, playlist_id: str):
+        try:
+            os.remove(self.file_path(playlist_id))
+        except OSError:
+            pass
+
+
+class EntityCache:
+    """In-memory LRU cache of parsed entities which expire after ttl seconds"""
+
+    def __init__(self, max_size: int = 10000, ttl: float = 3600):
+        """
+        :param max_size: max entities held before evicting the least recently used
+        :param ttl: seconds an entity is served before being requested again
+        """
+        self.max_size = max_size
+        self.ttl = ttl
+
+        self.entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+        self.lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def get(self, key):
+        with self.lock:
+            entry = self.entries.get(key)
+
+            if entry is not None:
+                stored_at, value = entry
+                if time.monotonic() - stored_at < self.ttl:
+                    self.entries.move_to_end(key)
+                    self.hits += 1
+                    return value
+
+                del self.entries[key]
+
+            self.misses += 1
+            return None
+
+    def put(self, key, value):
+        with self.lock:
+            self.entries[key] = (time.monotonic(), value)
+            self.entries.move_to_end(key)
+
+            while len(self.entries) > self.max_size:
+                self.entries.popitem(last=False)
+
+    def clear(self):
+        with self.lock:
+            self.entries.clear()
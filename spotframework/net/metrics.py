@@ -0,0 +1,207 @@
+import bisect
+import re
+import threading
+from collections import Counter
+from dataclasses import dataclass, field
+from typing import List, Tuple
+from urllib.parse import urlsplit
+
+id_segment = re.compile(r'^[0-9A-Za-z]{22}$')
+
+
+def endpoint_name(url: str, api_root: str) -> str:
+    """api path of url with ids replaced by {id}, eg playlists/{id}/tracks"""
+
+    if url.startswith(api_root):
+        path = url[len(api_root):]
+    else:
+        path = urlsplit(url).path
+
+    segments = urlsplit(path).path.strip('/').split('/')
+    return '/'.join('{id}' if id_segment.match(i) or (index > 0 and segments[index - 1] == 'users') else i
+                    for index, i in enumerate(segments))
+
+
+@dataclass
+class RequestEvent:
+    """A single request attempt sent by a network"""
+
+    method: str
+    endpoint: str
+    status: int
+    duration: float
+    bytes_received: int = 0
+    throttled: float = 0
+    retry_after: float = 0
+
+
+@dataclass
+class CacheEvent:
+    """Lookups answered by, or missed in, one of the network caches"""
+
+    cache: str
+    endpoint: str
+    hits: int = 0
+    misses: int = 0
+
+
+@dataclass
+class EndpointMetrics:
+    requests: int = 0
+    statuses: Counter = field(default_factory=Counter)
+    latency_buckets: List[int] = field(default_factory=list)
+    latency_sum: float = 0
+    bytes_received: int = 0
+    rate_limited: int = 0
+    unauthorised: int = 0
+    retry_after_seconds: float = 0
+    throttled_seconds: float = 0
+    cache_hits: Counter = field(default_factory=Counter)
+    cache_misses: Counter = field(default_factory=Counter)
+
+
+class NetworkMetrics:
+    """Observer aggregating request and cache events per endpoint
+
+        metrics = NetworkMetrics()
+        net.observers.append(metrics)
+    """
+
+    default_buckets = (0.025, 0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10)
+
+    def __init__(self, buckets: Tuple[float, ...] = default_buckets):
+        """
+        :param buckets: upper bounds in seconds of the latency histogram buckets
+        """
+        self.buckets = tuple(sorted(buckets))
+        self.endpoints = dict()
+        self.lock = threading.Lock()
+
+    def __call__(self, event):
+        with self.lock:
+            key = (event.method, event.endpoint) if isinstance(event, RequestEvent) else ('GET', event.endpoint)
+
+            metrics = self.endpoints.get(key)
+            if metrics is None:
+                metrics = self.endpoints[key] = EndpointMetrics(latency_buckets=[0] * (len(self.buckets) + 1))
+
+            if isinstance(event, RequestEvent):
+                metrics.requests += 1
+                metrics.statuses[event.status] += 1
+                metrics.latency_buckets[bisect.bisect_left(self.buckets, event.duration)] += 1
+                metrics.latency_sum += event.duration
+                metrics.bytes_received += event.bytes_received
+                metrics.throttled_seconds += event.throttled
+                metrics.retry_after_seconds += event.retry_after
+
+                if event.status == 429:
+                    metrics.rate_limited += 1
+                elif event.status == 401:
+                    metrics.unauthorised += 1
+
+            elif isinstance(event, CacheEvent):
+                metrics.cache_hits[event.cache] += event.hits
+                metrics.cache_misses[event.cache] += event.misses
+
+    def reset(self):
+        with self.lock:
+            self.endpoints.clear()
+
+    def snapshot(self) -> dict:
+        """metrics by 'METHOD endpoint' with a 'total' entry summing all endpoints"""
+
+        def describe(metrics: EndpointMetrics) -> dict:
+            caches = set(metrics.cache_hits) | set(metrics.cache_misses)
+            return {
+                'requests': metrics.requests,
+                'statuses': dict(metrics.statuses),
+                'latency_mean': metrics.latency_sum / metrics.requests if metrics.requests else None,
+                'latency_histogram': dict(zip([*self.buckets, float('inf')], metrics.latency_buckets)),
+                'bytes_received': metrics.bytes_received,
+                'rate_limited': metrics.rate_limited,
+                'unauthorised': metrics.unauthorised,
+                'retry_after_seconds': metrics.retry_after_seconds,
+                'throttled_seconds': metrics.throttled_seconds,
+                'cache': {i: {'hits': metrics.cache_hits[i],
+                              'misses': metrics.cache_misses[i],
+                              'hit_rate': metrics.cache_hits[i] / (metrics.cache_hits[i] + metrics.cache_misses[i])
+                              if metrics.cache_hits[i] + metrics.cache_misses[i] else None}
+                          for i in sorted(caches)}
+            }
+
+        with self.lock:
+            total = EndpointMetrics(latency_buckets=[0] * (len(self.buckets) + 1))
+            snapshot = dict()
+
+            for (method, endpoint), metrics in sorted(self.endpoints.items()):
+                snapshot[f'{method} {endpoint}'] = describe(metrics)
+
+                total.requests += metrics.requests
+                total.statuses.update(metrics.statuses)
+                total.latency_buckets = [i + j for i, j in zip(total.latency_buckets, metrics.latency_buckets)]
+                total.latency_sum += metrics.latency_sum
+                total.bytes_received += metrics.bytes_received
+                total.rate_limited += metrics.rate_limited
+                total.unauthorised += metrics.unauthorised
+                total.retry_after_seconds += metrics.retry_after_seconds
+                total.throttled_seconds += metrics.throttled_seconds
+                total.cache_hits.update(metrics.cache_hits)
+                total.cache_misses.update(metrics.cache_misses)
+
+            snapshot['total'] = describe(total)
+
+        return snapshot
+
+    def to_prometheus(self, prefix: str = 'spotframework') -> str:
+        """metrics in the prometheus text exposition format"""
+
+        lines = []
+
+        def metric(name: str, metric_type: str, help_text: str):
+            lines.append(f'# HELP {prefix}_{name} {help_text}')
+            lines.append(f'# TYPE {prefix}_{name} {metric_type}')
+
+        def labels(method: str, endpoint: str, **extra) -> str:
+            values = {'method': method, 'endpoint': endpoint, **extra}
+            return '{' + ','.join(f'{i}="{j}"' for i, j in values.items()) + '}'
+
+        with self.lock:
+            endpoints = sorted(self.endpoints.items())
+
+            metric('requests_total', 'counter', 'Requests sent by endpoint and response status')
+            for (method, endpoint), metrics in endpoints:
+                for status, count in sorted(metrics.statuses.items()):
+                    lines.append(f'{prefix}_requests_total{labels(method, endpoint, status=status)} {count}')
+
+            metric('request_duration_seconds', 'histogram', 'Request latency by endpoint')
+            for (method, endpoint), metrics in endpoints:
+                if not metrics.requests:
+                    continue
+                cumulative = 0
+                for bound, count in zip([*self.buckets, '+Inf'], metrics.latency_buckets):
+                    cumulative += count
+                    lines.append(f'{prefix}_request_duration_seconds_bucket'
+                                 f'{labels(method, endpoint, le=bound)} {cumulative}')
+                lines.append(f'{prefix}_request_duration_seconds_sum{labels(method, endpoint)} {metrics.latency_sum}')
+                lines.append(f'{prefix}_request_duration_seconds_count{labels(method, endpoint)} {metrics.requests}')
+
+            for name, attribute, metric_type, help_text in (
+                    ('received_bytes_total', 'bytes_received', 'counter', 'Response body bytes received'),
+                    ('rate_limited_total', 'rate_limited', 'counter', 'Responses with status 429'),
+                    ('unauthorised_total', 'unauthorised', 'counter', 'Responses with status 401'),
+                    ('retry_after_seconds_total', 'retry_after_seconds', 'counter',
+                     'Seconds of backoff requested by Retry-After headers'),
+                    ('throttled_seconds_total', 'throttled_seconds', 'counter',
+                     'Seconds spent waiting on the rate limiter')):
+                metric(name, metric_type, help_text)
+                for (method, endpoint), metrics in endpoints:
+                    lines.append(f'{prefix}_{name}{labels(method, endpoint)} {getattr(metrics, attribute)}')
+
+            metric('cache_lookups_total', 'counter', 'Cache lookups by cache and result')
+            for (method, endpoint), metrics in endpoints:
+                for cache in sorted(set(metrics.cache_hits) | set(metrics.cache_misses)):
+                    for result, counter in (('hit', metrics.cache_hits), ('miss', metrics.cache_misses)):
+                        lines.append(f'{prefix}_cache_lookups_total'
+                                     f'{labels(method, endpoint, cache=cache, result=result)} {counter[cache]}')
+
+        return '\n'.join(lines) + '\n'
@@ -0,0 +1,114 @@
+import logging
+import threading
+from dataclasses import dataclass, field
+from typing import List, Optional
+
+from spotframework.model.uri import Uri
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class PendingPlaylist:
+    """buffered edits to a single playlist"""
+
+    uri: Uri
+    replace: Optional[List[Uri]] = None
+    add: List[Uri] = field(default_factory=list)
+    details: dict = field(default_factory=dict)
+    calls: int = 0
+
+
+class MutationQueue:
+    """Write-behind buffer of playlist edits made through a network
+
+    Adds to a playlist are merged, a replace drops earlier adds and absorbs later ones and only the latest value of
+    each playlist detail is kept, so each playlist is written with at most one replace or add and one details update.
+
+        with net.write_behind() as queue:
+            net.add_playlist_tracks(uri=uri, uris=first)
+            net.add_playlist_tracks(uri=uri, uris=second)
+    """
+
+    def __init__(self, net):
+        """
+        :param net: network to write with
+        """
+        self.net = net
+        self.pending = dict()
+        self.lock = threading.RLock()
+        self.local = threading.local()
+
+    def __len__(self):
+        """buffered calls not yet written"""
+        with self.lock:
+            return sum(i.calls for i in self.pending.values())
+
+    def buffering(self) -> bool:
+        """whether edits made on this thread are buffered, false while it is writing them"""
+        return not getattr(self.local, 'committing', False)
+
+    def get_pending(self, uri: Uri) -> PendingPlaylist:
+        pending = self.pending.get(uri.object_id)
+        if pending is None:
+            pending = self.pending[uri.object_id] = PendingPlaylist(uri=uri)
+        pending.calls += 1
+        return pending
+
+    def replace(self, uri: Uri, uris: List[Uri]):
+        with self.lock:
+            pending = self.get_pending(uri)
+            pending.replace = list(uris)
+            pending.add = []
+
+    def add(self, uri: Uri, uris: List[Uri]):
+        with self.lock:
+            self.get_pending(uri).add += uris
+
+    def change_details(self, uri: Uri, **details):
+        with self.lock:
+            self.get_pending(uri).details.update({i: j for i, j in details.items() if j is not None})
+
+    def commit(self, uri: Uri = None) -> int:
+        """write buffered edits with the network
+
+        Each playlist is dropped from the buffer once written, edits to it and to later playlists stay buffered when
+        a write raises.
+
+        :param uri: only write edits to this playlist
+        :return: number of buffered calls written
+        """
+
+        with self.lock:
+            if uri is not None:
+                pending = [self.pending[uri.object_id]] if uri.object_id in self.pending else []
+            else:
+                pending = list(self.pending.values())
+
+            if not pending:
+                return 0
+
+            calls = sum(i.calls for i in pending)
+            logger.info(f'writing {calls} buffered calls to {len(pending)} playlists')
+
+            self.local.committing = True
+            try:
+                for playlist in pending:
+                    if playlist.replace is not None:
+                        self.net.replace_playlist_tracks(uri=playlist.uri, uris=playlist.replace + playlist.add)
+                    elif playlist.add:
+                        self.net.add_playlist_tracks(uri=playlist.uri, uris=playlist.add)
+                    playlist.replace, playlist.add = None, []
+
+                    if playlist.details:
+                        self.net.change_playlist_details(uri=playlist.uri, **playlist.details)
+
+                    del self.pending[playlist.uri.object_id]
+            finally:
+                self.local.committing = False
+
+            return calls
+
+    def discard(self):
+        with self.lock:
+            self.pending.clear()
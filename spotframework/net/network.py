@@ -1,16 +1,26 @@
-import requests
 import random
+import itertools
+import contextlib
 import logging
 import time
+import threading
 from base64 import b64encode
 from dataclasses import dataclass
-from typing import List, Optional, Union
+from typing import List, Optional, Union, Iterator
 import datetime
 from json import JSONDecodeError
+from concurrent.futures import ThreadPoolExecutor, Future
+import json as jsonlib
 
 from spotframework.net.user import NetworkUser
+from spotframework.net.ratelimit import RateLimiter, get_rate_limiter
+from spotframework.net.cache import ResponseCache, PlaylistTrackCache, EntityCache
+from spotframework.net.transport import Transport, RequestsTransport
+from spotframework.net.metrics import RequestEvent, CacheEvent, endpoint_name
+from spotframework.net.mutations import MutationQueue
 
-from spotframework.model import init_with_key_filter
+from spotframework.model import init_with_key_filter, parse_many, interning
+from spotframework.model.lazy import lazy, lazy_many
 
 from spotframework.model.user import PublicUser
 from spotframework.model.playlist import SimplifiedPlaylist, FullPlaylist
@@ -21,6 +31,7 @@ from spotframework.model.track import SimplifiedTrack, TrackFull, PlaylistTrack,
 from spotframework.model.podcast import SimplifiedEpisode, EpisodeFull, SimplifiedShow, ShowFull
 from spotframework.model.uri import Uri
 from spotframework.util.decorators import inject_uri, uri_type_check
+from spotframework.util.diff import Remove, Insert, Move, Change, fingerprint, plan_changes, replace_cost
 
 limit = 50
 
@@ -63,16 +74,91 @@ class Network:
     """Network layer class for reading and manipulating spotify service"""
 
     api_root = 'https://api.spotify.com/v1/'
+    token_url = 'https://accounts.spotify.com/api/token'
     unneeded_keys = ['available_markets', 'copyrights', 'external_ids', 'external_urls', 'href', 'preview_url', 'restrictions']
 
-    def __init__(self, user: NetworkUser):
+    def __init__(self,
+                 user: NetworkUser,
+                 max_workers: int = 8,
+                 rate_limiter: RateLimiter = None,
+                 token_refresh_margin: int = 60,
+                 response_cache: ResponseCache = None,
+                 playlist_track_cache: PlaylistTrackCache = None,
+                 entity_cache: EntityCache = None,
+                 coalesce_requests: bool = True,
+                 transport: Transport = None,
+                 lazy_models: bool = False,
+                 intern_models: bool = True):
         """Create network using NetworkUser containing credentials
 
         :param user: target spotify user
+        :param max_workers: max concurrent requests when fanning out paged reads and chunked batch lookups
+        :param rate_limiter: request budget, defaults to the limiter shared by the user's client id
+        :param token_refresh_margin: seconds before expiry to refresh the access token
+        :param response_cache: optional on-disk cache for GET responses
+        :param playlist_track_cache: optional cache of playlist tracks by snapshot_id
+        :param entity_cache: optional in-memory cache of tracks, albums, artists, shows and episodes
+        :param coalesce_requests: share one request and response between identical concurrent GETs
+        :param transport: HTTP client, defaults to a pooled requests session sized for max_workers
+        :param lazy_models: build playlist, library and played tracks field by field as they are read
+        :param intern_models: share one album, artist or user object between tracks of a load with the same uri
         """
         self.user = user
-        self.refresh_counter = 0
-        self.rsession = requests.Session()
+        self.max_workers = max_workers
+        self.rate_limiter = rate_limiter if rate_limiter is not None else get_rate_limiter(user.client_id)
+        self.token_refresh_margin = token_refresh_margin
+        self.refresh_lock = threading.RLock()
+        self.response_cache = response_cache
+        self.playlist_track_cache = playlist_track_cache
+        self.entity_cache = entity_cache
+        self.coalesce_requests = coalesce_requests
+        self.in_flight = dict()
+        self.in_flight_lock = threading.Lock()
+        self.snapshot_ids = dict()
+        self.transport = transport if transport is not None else RequestsTransport(pool_maxsize=max(max_workers, 10))
+        self.observers = []
+        self.write_queue = None
+        self.lazy_models = lazy_models
+        self.intern_models = intern_models
+
+    @contextlib.contextmanager
+    def write_behind(self) -> Iterator[MutationQueue]:
+        """buffer playlist track and detail edits, writing them with the fewest calls when the context exits
+
+        Reading or reordering a playlist with buffered edits writes them first. Edits still buffered when the block
+        raises are discarded, those not written when a write on exit raises are left in the queue. Buffered track
+        writes return no snapshot_ids.
+        """
+
+        queue = self.write_queue = MutationQueue(self)
+        try:
+            yield queue
+        except BaseException:
+            self.write_queue = None
+            if len(queue):
+                logger.warning(f'discarding {len(queue)} buffered calls after error')
+            queue.discard()
+            raise
+
+        self.write_queue = None
+        queue.commit()
+
+    def commit_pending(self, uri: Uri):
+        """write edits to playlist buffered by a write-behind queue"""
+        if self.write_queue is not None and self.write_queue.buffering():
+            self.write_queue.commit(uri=uri)
+
+    def interning(self, pool: dict = None):
+        """intern pool shared by models parsed within the block, does nothing if intern_models is not set"""
+        return interning(pool) if self.intern_models else contextlib.nullcontext()
+
+    def parse(self, class_type: type, dict_obj: dict, pool: dict = None):
+        with self.interning(pool):
+            return lazy(class_type, dict_obj) if self.lazy_models else init_with_key_filter(class_type, dict_obj)
+
+    def parse_many(self, class_type: type, dicts: List[dict]) -> list:
+        with self.interning():
+            return lazy_many(class_type, dicts) if self.lazy_models else parse_many(class_type, dicts)
 
     def net_call(self,
                  method: str,
@@ -93,14 +179,11 @@ class Network:
         if whole_url:
             url = whole_url
         else:
-            url = Network.api_root + url_path
+            url = self.api_root + url_path
 
         if not headers:
             headers = dict()
 
-        if auth:
-            headers['Authorization'] = 'Bearer ' + self.user.access_token
-
         if kwargs:
             if method in ['GET', 'DELETE']:
                 if not params:
@@ -111,63 +194,159 @@ class Network:
                     json = dict()
                 json.update({i: j for i, j in kwargs.items() if j is not None})
 
-        response = self.rsession.request(method=method,
-                                         url=url,
-                                         headers=headers,
-                                         params=params,
-                                         json=json,
-                                         data=data)
+        if method == 'GET' and self.coalesce_requests:
+            return self.coalesced_request(method=method, url=url, name=url_path or whole_url, params=params,
+                                          headers=headers, auth=auth)
 
-        if 200 <= response.status_code < 300:
-            logger.debug(f'{method} {url_path or whole_url} {response.status_code}')
-            self.refresh_counter = 0
+        return self.send_request(method=method, url=url, name=url_path or whole_url, params=params,
+                                 data=data, json=json, headers=headers, auth=auth)
 
-            if response.status_code == 204:
-                return None
+    def coalesced_request(self,
+                          method: str,
+                          url: str,
+                          name: str,
+                          params: dict = None,
+                          headers: dict = None,
+                          auth: bool = True) -> Optional[dict]:
+        """send request unless an identical one is in flight, in which case wait for and share its response"""
 
-            try:
-                return response.json()
-            except JSONDecodeError:
-                return None
-        else:
-            if response.status_code == 429:
-                retry_after = response.headers.get('Retry-After', None)
+        key = (method, url, auth,
+               jsonlib.dumps(params or {}, sort_keys=True, default=str),
+               jsonlib.dumps(headers or {}, sort_keys=True, default=str))
+
+        with self.in_flight_lock:
+            future = self.in_flight.get(key)
+            leader = future is None
+            if leader:
+                future = self.in_flight[key] = Future()
+
+        if not leader:
+            logger.debug(f'{method} {name} joining in-flight request')
+            return future.result()
+
+        try:
+            result = self.send_request(method=method, url=url, name=name, params=params, headers=headers, auth=auth)
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.in_flight_lock:
+                del self.in_flight[key]
+
+    def cache_scope(self) -> str:
+        """identity of the user for response cache keys, the refresh token or the access token without one"""
+        return f'{self.user.client_id}:{self.user.refresh_token or self.user.access_token}'
+
+    def send_request(self,
+                     method: str,
+                     url: str,
+                     name: str,
+                     params: dict = None,
+                     data: dict = None,
+                     json: dict = None,
+                     headers: dict = None,
+                     auth: bool = True) -> Optional[dict]:
+
+        cache_key = None
+        cached = None
+        if self.response_cache is not None and method == 'GET' and auth:
+            cache_key = self.response_cache.key(url, params, scope=self.cache_scope())
+            cached = self.response_cache.get(cache_key)
+
+            if cached is not None:
+                if self.response_cache.is_fresh(cached, api_root=self.api_root):
+                    logger.debug(f'{method} {name} served from cache')
+                    self.notify(CacheEvent(cache='response', endpoint=endpoint_name(url, self.api_root), hits=1))
+                    return cached.body
+
+                if cached.etag:
+                    headers['If-None-Match'] = cached.etag
+
+        rate_limit_attempts = 0
+        refresh_attempts = 0
+        while True:
+            throttled = 0
+            if auth:
+                self.ensure_access_token()
+                sent_token = self.user.access_token
+                headers['Authorization'] = 'Bearer ' + sent_token
+                # token endpoint requests are not counted against the api budget
+                throttled = self.rate_limiter.acquire()
+
+            start = time.perf_counter()
+            response = self.transport.request(method=method,
+                                              url=url,
+                                              headers=headers,
+                                              params=params,
+                                              json=json,
+                                              data=data)
+            duration = time.perf_counter() - start
+
+            retry_after = response.headers.get('Retry-After', None) if response.status_code == 429 else None
+
+            if self.observers:
+                endpoint = endpoint_name(url, self.api_root)
+                self.notify(RequestEvent(method=method,
+                                         endpoint=endpoint,
+                                         status=response.status_code,
+                                         duration=duration,
+                                         bytes_received=len(response.content or b''),
+                                         throttled=throttled,
+                                         retry_after=int(retry_after) + 1
+                                         if retry_after and rate_limit_attempts < 5 else 0))
+
+                if cache_key is not None and 200 <= response.status_code < 400:
+                    hit = response.status_code == 304 and cached is not None
+                    self.notify(CacheEvent(cache='response', endpoint=endpoint, hits=int(hit), misses=int(not hit)))
+
+            if response.status_code == 304 and cached is not None:
+                logger.debug(f'{method} {name} not modified, served from cache')
+                self.rate_limiter.success()
+                self.response_cache.revalidate(cache_key, cached)
+                return cached.body
+
+            if 200 <= response.status_code < 300:
+                logger.debug(f'{method} {name} {response.status_code}')
+                if auth:
+                    self.rate_limiter.success()
+
+                if response.status_code == 204:
+                    return None
+
+                try:
+                    body = response.json()
+                except JSONDecodeError:
+                    return None
+
+                if cache_key is not None:
+                    self.response_cache.put(cache_key, url, response.headers.get('ETag'), body, api_root=self.api_root)
+
+                return body
 
-                if self.refresh_counter < 5:
-                    self.refresh_counter += 1
+            if response.status_code == 429:
+                if rate_limit_attempts < 5:
+                    rate_limit_attempts += 1
                     if retry_after:
-                        logger.warning(f'{method} {url_path or whole_url} rate limit reached: '
+                        logger.warning(f'{method} {name} rate limit reached: '
                                        f'retrying in {retry_after} seconds')
-                        time.sleep(int(retry_after) + 1)
-                        return self.net_call(method=method,
-                                             url_path=url_path,
-                                             whole_url=whole_url,
-                                             params=params,
-                                             data=data,
-                                             json=json,
-                                             headers=headers)
+                        self.rate_limiter.backoff(int(retry_after) + 1)
+                        continue
                     else:
-                        logger.error(f'{method} {url_path or whole_url} rate limit reached: '
+                        logger.error(f'{method} {name} rate limit reached: '
                                      f'cannot find Retry-After header')
                 else:
-                    self.refresh_counter = 0
-                    logger.critical(f'{method} {url_path or whole_url} refresh token limit (5) reached')
-
-            elif response.status_code == 401:
-                logger.warning(f'{method} {url_path or whole_url} access token expired, refreshing')
-                self.refresh_access_token()
-                if self.refresh_counter < 5:
-                    self.refresh_counter += 1
-                    return self.net_call(method=method,
-                                         url_path=url_path,
-                                         whole_url=whole_url,
-                                         params=params,
-                                         data=data,
-                                         json=json,
-                                         headers=headers)
+                    logger.critical(f'{method} {name} rate limit retry limit (5) reached')
+
+            elif response.status_code == 401 and auth:
+                if refresh_attempts < 5:
+                    refresh_attempts += 1
+                    logger.warning(f'{method} {name} access token expired, refreshing')
+                    self.refresh_access_token(expired_token=sent_token)
+                    continue
                 else:
-                    self.refresh_counter = 0
-                    logger.critical(f'{method} {url_path or whole_url} refresh token limit (5) reached')
+                    logger.critical(f'{method} {name} refresh token limit (5) reached')
 
             try:
                 error_json = response.json()
@@ -183,6 +362,11 @@ class Network:
                 logger.error(f'{method} {response.status_code} no error object found')
                 raise SpotifyNetworkException(http_code=response.status_code, message=response.text)
 
+    def notify(self, event):
+        """pass a RequestEvent or CacheEvent to each observer"""
+        for func in self.observers:
+            func(event)
+
     def get_request(self, url=None, params=None, headers=None, whole_url=None, auth=True, **kwargs) -> Optional[dict]:
         """HTTP get request for reading from service
 
@@ -231,37 +415,76 @@ class Network:
         return self.net_call(method='PUT', url_path=url, whole_url=whole_url, params=params,
                              json=json, data=data, headers=headers, auth=auth, **kwargs)
 
-    def refresh_access_token(self):
-        logger.info(f'refreshing token')
+    def delete_request(self, url=None, params=None, json=None, data=None,
+                       headers=None, whole_url=None, auth=True, **kwargs) -> Optional[dict]:
+        """HTTP delete request for removing from service
+
+        :param url: query url string following hostname and api version
+        :param params: dictionary of query parameters
+        :param json: dictionary request body for conversion to json during transmission
+        :param data: dictionary request body for transmission
+        :param headers: additional request headers
+        :param whole_url: override base api url with new hostname and url
+        :param auth: direct bearer authentication header to be injected
+        :return: response object if available
+        """
+
+        return self.net_call(method='DELETE', url_path=url, whole_url=whole_url, params=params,
+                             json=json, data=data, headers=headers, auth=auth, **kwargs)
+
+    def ensure_access_token(self):
+        """refresh the access token ahead of requests if missing or about to expire"""
 
         if self.user.refresh_token is None:
-            raise NameError('no refresh token to query')
+            return
 
-        if self.user.client_id is None:
-            raise NameError('no client id')
+        if self.user.access_token is None or self.user.token_expires_within(self.token_refresh_margin):
+            with self.refresh_lock:
+                # re-check, another thread may have refreshed while waiting for the lock
+                if self.user.access_token is None or self.user.token_expires_within(self.token_refresh_margin):
+                    self.refresh_access_token()
 
-        if self.user.client_secret is None:
-            raise NameError('no client secret')
+    def refresh_access_token(self, expired_token: str = None):
+        """refresh access token, concurrent callers wait on a single refresh
 
-        idsecret = b64encode(bytes(self.user.client_id + ':' + self.user.client_secret, "utf-8")).decode("ascii")
-        headers = {'Authorization': 'Basic %s' % idsecret}
+        :param expired_token: token rejected by the caller, skip refreshing if it has already been replaced
+        """
 
-        try:
-            resp = self.post_request(headers=headers,
-                                     whole_url='https://accounts.spotify.com/api/token',
-                                     auth=False,
-                                     data={"grant_type": "refresh_token",
-                                           "refresh_token": self.user.refresh_token})
-
-            self.user.access_token = resp['access_token']
-            if resp.get('refresh_token', None):
-                self.user.refresh_token = resp['refresh_token']
-            self.user.token_expiry = resp['expires_in']
-            self.user.last_refreshed = datetime.datetime.utcnow()
-            for func in self.user.on_refresh:
-                func(self.user)
-        except SpotifyNetworkException:
-            logger.exception(f'error refreshing user token')
+        with self.refresh_lock:
+            if expired_token is not None and expired_token != self.user.access_token:
+                logger.debug('access token already refreshed')
+                return self
+
+            logger.info(f'refreshing token')
+
+            if self.user.refresh_token is None:
+                raise NameError('no refresh token to query')
+
+            if self.user.client_id is None:
+                raise NameError('no client id')
+
+            if self.user.client_secret is None:
+                raise NameError('no client secret')
+
+            idsecret = b64encode(bytes(self.user.client_id + ':' + self.user.client_secret, "utf-8")).decode("ascii")
+            headers = {'Authorization': 'Basic %s' % idsecret}
+
+            try:
+                resp = self.post_request(headers=headers,
+                                         whole_url=self.token_url,
+                                         auth=False,
+                                         data={"grant_type": "refresh_token",
+                                               "refresh_token": self.user.refresh_token})
+
+                self.user.access_token = resp['access_token']
+                if resp.get('refresh_token', None):
+                    self.user.refresh_token = resp['refresh_token']
+                self.user.token_expiry = resp['expires_in']
+                self.user.last_refreshed = datetime.datetime.utcnow()
+                for func in self.user.on_refresh:
+                    func(self.user)
+            except SpotifyNetworkException:
+                logger.exception(f'error refreshing user token')
 
         return self
 
@@ -280,22 +503,26 @@ class Network:
         :return: playlist object
         """
 
+        self.commit_pending(uri)
+
         logger.info(f"retrieving {uri}")
 
         resp = self.get_request(f'playlists/{uri.object_id}')
-        playlist = init_with_key_filter(FullPlaylist, resp)
 
-        if resp.get('tracks') and tracks:
-            if 'next' in resp['tracks']:
-                logger.debug(f'paging tracks for {uri}')
+        with self.interning():
+            playlist = init_with_key_filter(FullPlaylist, resp)
 
-                track_pager = PageCollection(net=self, page=resp['tracks'])
-                track_pager.continue_iteration()
+            if resp.get('tracks') and tracks:
+                if 'next' in resp['tracks']:
+                    logger.debug(f'paging tracks for {uri}')
 
-                playlist.tracks = [init_with_key_filter(PlaylistTrack, i) for i in track_pager.items]
-            else:
-                logger.debug(f'parsing {len(resp.get("tracks"))} tracks for {uri}')
-                playlist.tracks = [init_with_key_filter(PlaylistTrack, i) for i in resp.get('tracks', [])]
+                    track_pager = PageCollection(net=self, page=resp['tracks'])
+                    track_pager.continue_iteration()
+
+                    playlist.tracks = self.parse_many(PlaylistTrack, track_pager.items)
+                else:
+                    logger.debug(f'parsing {len(resp.get("tracks"))} tracks for {uri}')
+                    playlist.tracks = self.parse_many(PlaylistTrack, resp.get('tracks', []))
 
         return playlist
 
@@ -342,11 +569,13 @@ class Network:
             pager.total_limit = response_limit
         pager.iterate()
 
-        return_items = [init_with_key_filter(SimplifiedPlaylist, i) for i in pager.items]
+        return_items = parse_many(SimplifiedPlaylist, pager.items)
 
         if len(return_items) == 0:
             logger.error('no playlists returned')
 
+        self.snapshot_ids = {i.id: i.snapshot_id for i in return_items}
+
         return return_items
 
     def saved_albums(self, response_limit: int = None) -> Optional[List[LibraryAlbum]]:
@@ -363,7 +592,7 @@ class Network:
             pager.total_limit = response_limit
         pager.iterate()
 
-        return_items = [init_with_key_filter(LibraryAlbum, i) for i in pager.items]
+        return_items = parse_many(LibraryAlbum, pager.items)
 
         if len(return_items) == 0:
             logger.error('no albums returned')
@@ -382,15 +611,30 @@ class Network:
         pager = PageCollection(net=self, url='me/tracks', name='getLibraryTracks')
         if response_limit:
             pager.total_limit = response_limit
-        pager.iterate()
+        pager.iterate_parallel(max_workers=self.max_workers)
 
-        return_items = [init_with_key_filter(LibraryTrack, i) for i in pager.items]
+        return_items = self.parse_many(LibraryTrack, pager.items)
 
         if len(return_items) == 0:
             logger.error('no tracks returned')
 
         return return_items
 
+    def iter_saved_tracks(self, response_limit: int = None) -> Iterator[LibraryTrack]:
+        """stream user library tracks page by page, the next page is downloaded while the current is consumed
+
+        :param response_limit: max tracks to return
+        :return: generator of saved library tracks
+        """
+
+        logger.info(f"streaming library tracks")
+
+        pager = PageCollection(net=self, url='me/tracks', name='iterLibraryTracks', total_limit=response_limit)
+        pool = dict()
+        for page in pager.iter_pages():
+            for item in page.items:
+                yield self.parse(LibraryTrack, item, pool=pool)
+
     def user_playlists(self, response_limit: int = None) -> List[SimplifiedPlaylist]:
         """retrieve user owned playlists
 
@@ -416,33 +660,103 @@ class Network:
     def playlist_tracks(self,
                         uri: Uri,
                         response_limit: int = None,
-                        reduced_mem: bool = False) -> List[PlaylistTrack]:
+                        reduced_mem: bool = False,
+                        snapshot_id: str = None) -> List[PlaylistTrack]:
         """get list of playlists tracks for uri
 
         :param uri: target playlist uri
         :param response_limit: max tracks to return
+        :param snapshot_id: current playlist snapshot for the track cache, looked up if not provided
         :return: list of playlist tracks if available
         """
 
-        logger.info(f"paging tracks for {uri}")
+        self.commit_pending(uri)
 
-        pager = PageCollection(net=self, url=f'playlists/{uri.object_id}/tracks', name='getPlaylistTracks')
-        if response_limit:
-            pager.total_limit = response_limit
-        pager.iterate()
+        result = None
+        use_cache = self.playlist_track_cache is not None and response_limit is None
+
+        if use_cache:
+            snapshot_id = snapshot_id or self.playlist_snapshot_id(uri=uri)
+            result = self.playlist_track_cache.get(uri.object_id, snapshot_id)
+
+            if result is not None:
+                logger.info(f"{uri} unchanged, using {len(result)} cached tracks")
+
+            self.notify(CacheEvent(cache='playlist_tracks', endpoint='playlists/{id}/tracks',
+                                   hits=int(result is not None), misses=int(result is None)))
 
-        result = pager.items
+        if result is None:
+            logger.info(f"paging tracks for {uri}")
+
+            pager = PageCollection(net=self, url=f'playlists/{uri.object_id}/tracks', name='getPlaylistTracks')
+            if response_limit:
+                pager.total_limit = response_limit
+            pager.iterate_parallel(max_workers=self.max_workers)
+
+            result = pager.items
+
+            if use_cache:
+                self.playlist_track_cache.put(uri.object_id, snapshot_id, result)
 
         if reduced_mem:
             result = [filter_response(i, Network.unneeded_keys) for i in result]
 
-        return_items = [init_with_key_filter(PlaylistTrack, i) for i in result]
+        return_items = self.parse_many(PlaylistTrack, result)
 
         if len(return_items) == 0:
             logger.error('no tracks returned')
 
         return return_items
 
+    @inject_uri(uris=False)
+    @uri_type_check(uri_type=Uri.ObjectType.playlist)
+    def playlist_snapshot_id(self, uri: Uri) -> str:
+        """get current snapshot_id for playlist, an id seen by the last call to playlists is used once, otherwise the
+        snapshot_id is requested as it may have been changed by other clients
+
+        :param uri: target playlist uri
+        :return: playlist snapshot_id
+        """
+
+        snapshot_id = self.snapshot_ids.pop(uri.object_id, None)
+        if snapshot_id is None:
+            snapshot_id = self.get_request(f'playlists/{uri.object_id}', fields='snapshot_id')['snapshot_id']
+
+        return snapshot_id
+
+    def invalidate_playlist(self, uri: Uri):
+        """forget cached snapshot and tracks for playlist after writing to it"""
+
+        self.snapshot_ids.pop(uri.object_id, None)
+        if self.playlist_track_cache is not None:
+            self.playlist_track_cache.remove(uri.object_id)
+
+    @inject_uri(uris=False)
+    @uri_type_check(uri_type=Uri.ObjectType.playlist)
+    def iter_playlist_tracks(self,
+                             uri: Uri,
+                             response_limit: int = None,
+                             reduced_mem: bool = False) -> Iterator[PlaylistTrack]:
+        """stream playlist tracks for uri page by page, the next page is downloaded while the current is consumed
+
+        :param uri: target playlist uri
+        :param response_limit: max tracks to return
+        :return: generator of playlist tracks
+        """
+
+        self.commit_pending(uri)
+
+        logger.info(f"streaming tracks for {uri}")
+
+        pager = PageCollection(net=self, url=f'playlists/{uri.object_id}/tracks', name='iterPlaylistTracks',
+                               total_limit=response_limit)
+        pool = dict()
+        for page in pager.iter_pages():
+            for item in page.items:
+                if reduced_mem:
+                    item = filter_response(item, Network.unneeded_keys)
+                yield self.parse(PlaylistTrack, item, pool=pool)
+
     @inject_uri(uris=False)
     @uri_type_check(uri_type=Uri.ObjectType.show)
     def show_episodes(self,
@@ -462,7 +776,7 @@ class Network:
             pager.total_limit = response_limit
         pager.iterate()
 
-        return_items = [init_with_key_filter(SimplifiedEpisode, i) for i in pager.items]
+        return_items = parse_many(SimplifiedEpisode, pager.items)
 
         if len(return_items) == 0:
             logger.error('no episodes returned')
@@ -478,7 +792,7 @@ class Network:
 
         if len(resp['devices']) == 0:
             logger.error('no devices returned')
-        return [init_with_key_filter(Device, i) for i in resp['devices']]
+        return parse_many(Device, resp['devices'])
 
     def recently_played_tracks(self,
                                response_limit: int = None,
@@ -511,7 +825,7 @@ class Network:
             pager.total_limit = 20
         pager.continue_iteration()
 
-        return [init_with_key_filter(PlayedTrack, i) for i in pager.items]
+        return self.parse_many(PlayedTrack, pager.items)
 
     def player(self) -> CurrentlyPlaying:
         """get currently playing snapshot (player)"""
@@ -641,13 +955,122 @@ class Network:
     def replace_playlist_tracks(self,
                                 uri: Uri,
                                 uris: List[Uri]) -> Optional[List[str]]:
+        """replace playlist tracks with uris
+
+        :return: snapshot_ids of each write, empty if buffered by write_behind
+        """
+
+        if self.write_queue is not None and self.write_queue.buffering():
+            self.write_queue.replace(uri=uri, uris=uris)
+            return []
 
         logger.info(f"replacing {uri} with {'0' if uris is None else len(uris)} tracks")
 
-        self.put_request(f'playlists/{uri.object_id}/tracks', uris=[str(i) for i in uris[:100]])
+        self.invalidate_playlist(uri)
+
+        snapshot_ids = [
+            self.put_request(f'playlists/{uri.object_id}/tracks', uris=[str(i) for i in uris[:100]])["snapshot_id"]
+        ]
 
         if len(uris) > 100:
-            return self.add_playlist_tracks(uri=uri, uris=uris[100:])
+            snapshot_ids += self.add_playlist_tracks(uri=uri, uris=uris[100:])
+
+        return snapshot_ids
+
+    @inject_uri
+    @uri_type_check(uri_type=Uri.ObjectType.playlist, uris_type=(Uri.ObjectType.track, Uri.ObjectType.episode))
+    def sync_playlist_tracks(self,
+                             uri: Uri,
+                             uris: List[Uri],
+                             current: List[Uri] = None,
+                             current_fingerprint: str = None,
+                             snapshot_id: str = None) -> List[str]:
+        """write uris to playlist with only the removals, insertions and moves needed to match current contents
+
+        Falls back to replacing the playlist when that takes fewer calls.
+
+        :param uri: target playlist uri
+        :param uris: tracks to be written
+        :param current: current playlist tracks, fetched if not provided
+        :param current_fingerprint: fingerprint of the last written tracks, skips writing when equal to uris'
+        :param snapshot_id: snapshot current was read from, sent with positional changes
+        :return: snapshot_ids of each write, empty if unchanged
+        """
+
+        self.commit_pending(uri)
+
+        target = [str(i) for i in uris]
+
+        if current_fingerprint is not None and current_fingerprint == fingerprint(target):
+            logger.info(f"{uri} fingerprint unchanged, skipping write")
+            return []
+
+        if current is None:
+            snapshot_id = self.playlist_snapshot_id(uri=uri)
+            current = [i.track.uri if i.track is not None else None
+                       for i in self.playlist_tracks(uri=uri, snapshot_id=snapshot_id)]
+
+        if None in current:
+            logger.warning(f"{uri} has unavailable tracks, replacing")
+            return self.replace_playlist_tracks(uri=uri, uris=uris)
+
+        changes = plan_changes([str(i) for i in current], target)
+
+        if not changes:
+            logger.info(f"{uri} unchanged, skipping write")
+            return []
+
+        if len(changes) >= replace_cost(len(target)):
+            logger.info(f"{uri} diff needs {len(changes)} calls, replacing")
+            return self.replace_playlist_tracks(uri=uri, uris=uris)
+
+        return self.apply_playlist_changes(uri=uri, changes=changes, snapshot_id=snapshot_id)
+
+    @inject_uri(uris=False)
+    @uri_type_check(uri_type=Uri.ObjectType.playlist)
+    def apply_playlist_changes(self, uri: Uri, changes: List[Change], snapshot_id: str = None) -> List[str]:
+        """send changes planned by spotframework.util.diff in order
+
+        Removals and moves are sent with the snapshot they were planned against, the snapshot of the previous write
+        after the first, so the service rebases or rejects them rather than applying them to the wrong tracks when
+        the playlist has been edited since it was read.
+
+        :param uri: target playlist uri
+        :param changes: removals, insertions and moves
+        :param snapshot_id: snapshot the changes were planned against
+        :return: snapshot_ids of each write
+        """
+
+        self.commit_pending(uri)
+
+        logger.info(f"applying {len(changes)} changes to {uri}")
+
+        self.invalidate_playlist(uri)
+
+        snapshot_ids = []
+        for change in changes:
+            if isinstance(change, Remove):
+                body = {'tracks': [{'uri': j, 'positions': [i]} for i, j in zip(change.positions, change.uris)]}
+                if snapshot_id is not None:
+                    body['snapshot_id'] = snapshot_id
+                resp = self.delete_request(f'playlists/{uri.object_id}/tracks', json=body)
+            elif isinstance(change, Insert):
+                resp = self.post_request(f'playlists/{uri.object_id}/tracks',
+                                         uris=change.uris,
+                                         position=change.position)
+            elif isinstance(change, Move):
+                resp = self.put_request(f'playlists/{uri.object_id}/tracks',
+                                        range_start=change.range_start,
+                                        range_length=change.range_length,
+                                        insert_before=change.insert_before,
+                                        snapshot_id=snapshot_id)
+            else:
+                raise TypeError(f'unknown playlist change {type(change)}')
+
+            snapshot_id = resp["snapshot_id"]
+            snapshot_ids.append(snapshot_id)
+
+        return snapshot_ids
 
     @inject_uri(uris=False)
     @uri_type_check(uri_type=Uri.ObjectType.playlist)
@@ -658,6 +1081,10 @@ class Network:
                                 collaborative: bool = None,
                                 description: str = None):
 
+        if self.write_queue is not None and self.write_queue.buffering():
+            return self.write_queue.change_details(uri=uri, name=name, public=public,
+                                                   collaborative=collaborative, description=description)
+
         logger.info(f"updating {uri}, name: {name}, public: {public}, collab: {collaborative}, "
                     f"description: {(description[:30] + '...' if len(description) > 33 else description) if description is not None else None}")
 
@@ -673,9 +1100,19 @@ class Network:
     @inject_uri
     @uri_type_check(uri_type=Uri.ObjectType.playlist, uris_type=(Uri.ObjectType.track, Uri.ObjectType.episode))
     def add_playlist_tracks(self, uri: Uri, uris: List[Uri]) -> List[str]:
+        """append uris to playlist
+
+        :return: snapshot_ids of each write, empty if buffered by write_behind
+        """
+
+        if self.write_queue is not None and self.write_queue.buffering():
+            self.write_queue.add(uri=uri, uris=uris)
+            return []
 
         logger.info(f"adding {len(uris)} tracks to {uri}")
 
+        self.invalidate_playlist(uri)
+
         snapshot_ids = [
             self.post_request(f'playlists/{uri.object_id}/tracks',
                               uris=[str(i) for i in uris[:100]])["snapshot_id"]
@@ -742,7 +1179,14 @@ class Network:
                                 uri: Uri,
                                 range_start: int,
                                 range_length: int,
-                                insert_before: int) -> dict:
+                                insert_before: int,
+                                snapshot_id: str = None) -> dict:
+        """move range_length tracks from range_start to before insert_before
+
+        :param snapshot_id: snapshot the positions refer to, the service rebases or rejects the move if since edited
+        """
+
+        self.commit_pending(uri)
 
         logger.info(f'reordering {uri} tracks, start: {range_start}, length: {range_length}, before: {insert_before}')
 
@@ -756,25 +1200,29 @@ class Network:
             logger.error('insert_before must be positive')
             raise ValueError('insert_before must be positive')
 
+        self.invalidate_playlist(uri)
+
         return self.put_request(f'playlists/{uri.object_id}/tracks',
                                 range_start=range_start,
                                 range_length=range_length,
-                                insert_before=insert_before)
+                                insert_before=insert_before,
+                                snapshot_id=snapshot_id)
 
     @inject_uri(uri=False)
     @uri_type_check(uris_type=Uri.ObjectType.track)
     def track_audio_features(self, uris: List[Uri]) -> Optional[List[AudioFeatures]]:
         logger.info(f'getting {len(uris)} features')
 
-        audio_features = []
-        chunked_uris = list(self.chunk(uris, 100))
-        for chunk in chunked_uris:
+        def get_chunk(chunk):
             resp = self.get_request(url='audio-features', ids=','.join(i.object_id for i in chunk))
 
             if resp.get('audio_features', None):
-                return [init_with_key_filter(AudioFeatures, i) for i in resp['audio_features']]
+                return parse_many(AudioFeatures, resp['audio_features'])
             else:
                 logger.error('no audio features included')
+                return []
+
+        audio_features = [i for chunk in self.map_chunks(get_chunk, list(self.chunk(uris, 100))) for i in chunk]
 
         if len(audio_features) == len(uris):
             return audio_features
@@ -799,9 +1247,7 @@ class Network:
         elif isinstance(tracks, List):
             if all(isinstance(i, SimplifiedTrack) for i in tracks):
                 
-                audio_features = list()
-                for chunk in self.chunk(tracks, 100):
-                    audio_features += self.track_audio_features(uris=[i.uri for i in chunk])
+                audio_features = self.track_audio_features(uris=[i.uri for i in tracks])
 
                 if audio_features:
                     if len(audio_features) != len(tracks):
@@ -822,14 +1268,7 @@ class Network:
 
         logger.info(f'getting {len(uris)} tracks')
 
-        tracks = []
-        chunked_uris = list(self.chunk(uris, 50))
-        for chunk in chunked_uris:
-            resp = self.get_request(url='tracks', ids=','.join([i.object_id for i in chunk]))
-            if resp:
-                tracks += [init_with_key_filter(TrackFull, i) for i in resp.get('tracks', [])]
-
-        return tracks
+        return self.get_batch(url='tracks', key='tracks', class_type=TrackFull, uris=uris)
 
     @inject_uri(uris=False)
     @uri_type_check(uri_type=Uri.ObjectType.track)
@@ -847,14 +1286,7 @@ class Network:
 
         logger.info(f'getting {len(uris)} albums')
 
-        albums = []
-        chunked_uris = list(self.chunk(uris, 50))
-        for chunk in chunked_uris:
-            resp = self.get_request(url='albums', ids=','.join([i.object_id for i in chunk]))
-            if resp:
-                albums += [init_with_key_filter(AlbumFull, i) for i in resp.get('albums', [])]
-
-        return albums
+        return self.get_batch(url='albums', key='albums', class_type=AlbumFull, uris=uris)
 
     @inject_uri(uris=False)
     @uri_type_check(uri_type=Uri.ObjectType.album)
@@ -872,14 +1304,7 @@ class Network:
 
         logger.info(f'getting {len(uris)} artists')
 
-        artists = []
-        chunked_uris = list(self.chunk(uris, 50))
-        for chunk in chunked_uris:
-            resp = self.get_request(url='artists', ids=','.join([i.object_id for i in chunk]))
-            if resp:
-                artists += [init_with_key_filter(ArtistFull, i) for i in resp.get('artists', [])]
-
-        return artists
+        return self.get_batch(url='artists', key='artists', class_type=ArtistFull, uris=uris)
 
     @inject_uri(uris=False)
     @uri_type_check(uri_type=Uri.ObjectType.artist)
@@ -897,14 +1322,7 @@ class Network:
 
         logger.info(f'getting {len(uris)} shows')
 
-        shows = []
-        chunked_uris = list(self.chunk(uris, 50))
-        for chunk in chunked_uris:
-            resp = self.get_request(url='shows', ids=','.join([i.object_id for i in chunk]))
-            if resp:
-                shows += [init_with_key_filter(SimplifiedShow, i) for i in resp.get('shows', [])]
-
-        return shows
+        return self.get_batch(url='shows', key='shows', class_type=SimplifiedShow, uris=uris)
 
     @inject_uri(uris=False)
     @uri_type_check(uri_type=Uri.ObjectType.show)
@@ -922,10 +1340,10 @@ class Network:
                 track_pager = PageCollection(net=self, page=resp['episodes'])
                 track_pager.continue_iteration()
 
-                show.episodes = [init_with_key_filter(SimplifiedEpisode, i) for i in track_pager.items]
+                show.episodes = parse_many(SimplifiedEpisode, track_pager.items)
             else:
                 logger.debug(f'parsing {len(resp.get("episodes"))} tracks for {uri}')
-                show.episodes = [init_with_key_filter(SimplifiedEpisode, i) for i in resp.get('episodes', [])]
+                show.episodes = parse_many(SimplifiedEpisode, resp.get('episodes', []))
         return show
 
     @inject_uri(uri=False)
@@ -934,14 +1352,7 @@ class Network:
 
         logger.info(f'getting {len(uris)} episodes')
 
-        episodes = []
-        chunked_uris = list(self.chunk(uris, 50))
-        for chunk in chunked_uris:
-            resp = self.get_request(url='episodes', ids=','.join([i.object_id for i in chunk]))
-            if resp:
-                episodes += [init_with_key_filter(EpisodeFull, i) for i in resp.get('episodes', [])]
-
-        return episodes
+        return self.get_batch(url='episodes', key='episodes', class_type=EpisodeFull, uris=uris)
 
     @inject_uri(uris=False)
     @uri_type_check(uri_type=Uri.ObjectType.episode)
@@ -981,13 +1392,64 @@ class Network:
                                 type=','.join([i.name for i in query_types]),
                                 limit=response_limit)
 
-        albums = [init_with_key_filter(SimplifiedAlbum, i) for i in resp.get('albums', {}).get('items', [])]
-        artists = [init_with_key_filter(ArtistFull, i) for i in resp.get('artists', {}).get('items', [])]
-        tracks = [init_with_key_filter(TrackFull, i) for i in resp.get('tracks', {}).get('items', [])]
-        playlists = [init_with_key_filter(SimplifiedPlaylist, i) for i in resp.get('playlists', {}).get('items', [])]
+        albums = parse_many(SimplifiedAlbum, resp.get('albums', {}).get('items', []))
+        artists = parse_many(ArtistFull, resp.get('artists', {}).get('items', []))
+        tracks = parse_many(TrackFull, resp.get('tracks', {}).get('items', []))
+        playlists = parse_many(SimplifiedPlaylist, resp.get('playlists', {}).get('items', []))
 
         return SearchResponse(tracks=tracks, albums=albums, artists=artists, playlists=playlists)
 
+    def get_batch(self, url: str, key: str, class_type: type, uris: List[Uri], chunk_size: int = 50) -> list:
+        """request objects from a batch lookup endpoint, only cache misses are requested
+
+        :param url: endpoint taking comma separated ids
+        :param key: response key of the returned objects
+        :param class_type: model to parse objects into
+        :param uris: target uris
+        :param chunk_size: max ids per request
+        :return: objects in order of uris, ids not found are skipped
+        """
+
+        found = dict()
+
+        if self.entity_cache is not None:
+            for uri in uris:
+                if str(uri) not in found and (cached := self.entity_cache.get(str(uri))) is not None:
+                    found[str(uri)] = cached
+
+        missing = list({str(i): i for i in uris if str(i) not in found}.values())
+
+        if self.entity_cache is not None:
+            self.notify(CacheEvent(cache='entity', endpoint=url, hits=len(found), misses=len(missing)))
+
+        def get_chunk(chunk):
+            resp = self.get_request(url=url, ids=','.join([i.object_id for i in chunk]))
+            if resp:
+                return list(zip(chunk, resp.get(key, [])))
+            return []
+
+        with self.interning():
+            for chunk in self.map_chunks(get_chunk, list(self.chunk(missing, chunk_size))):
+                for uri, item in chunk:
+                    if item is None:
+                        logger.warning(f'{uri} not found')
+                        continue
+
+                    found[str(uri)] = obj = init_with_key_filter(class_type, item)
+                    if self.entity_cache is not None:
+                        self.entity_cache.put(str(uri), obj)
+
+        return [found[str(i)] for i in uris if str(i) in found]
+
+    def map_chunks(self, func, chunks: list) -> list:
+        """call func for each chunk on up to max_workers threads, results kept in chunk order"""
+
+        if self.max_workers is None or self.max_workers <= 1 or len(chunks) <= 1:
+            return [func(chunk) for chunk in chunks]
+
+        with ThreadPoolExecutor(max_workers=min(self.max_workers, len(chunks))) as executor:
+            return list(executor.map(func, chunks))
+
     @staticmethod
     def chunk(l, n):
         for i in range(0, len(l), n):
@@ -1013,10 +1475,7 @@ class PageCollection:
             self.add_page(page)
 
     def __len__(self):
-        length = 0
-        for page in self.pages:
-            length += len(page.items)
-        return length
+        return sum(len(page.items) for page in self.pages)
 
     @property
     def total(self):
@@ -1026,10 +1485,8 @@ class PageCollection:
 
     @property
     def items(self):
-        items = []
-        for page in self.pages:
-            items += page.items
-        return items[:self.total_limit]
+        return list(itertools.islice(itertools.chain.from_iterable(page.items for page in self.pages),
+                                     self.total_limit))
 
     def continue_iteration(self):
         if self.total_limit:
@@ -1042,19 +1499,23 @@ class PageCollection:
         else:
             raise IndexError('no pages')
 
-    def iterate(self, url=None):
-        logger.debug(f'iterating {self.name}, {len(self.pages)}/{self.page_limit}')
-
+    def fetch_page(self, url=None, offset: int = None) -> dict:
         params = {'limit': self.page_limit}
+        if offset is not None:
+            params['offset'] = offset
+
         if url:
-            resp = self.net.get_request(whole_url=url, params=params)
+            return self.net.get_request(whole_url=url, params=params)
         else:
             if self.url:
-                resp = self.net.get_request(url=self.url, params=params)
+                return self.net.get_request(url=self.url, params=params)
             else:
                 raise ValueError('no url to query')
 
-        page = self.add_page(resp)
+    def iterate(self, url=None):
+        logger.debug(f'iterating {self.name}, {len(self.pages)}/{self.page_limit}')
+
+        page = self.add_page(self.fetch_page(url=url))
         if page.next:
             if self.total_limit:
                 if len(self) < self.total_limit:
@@ -1062,6 +1523,62 @@ class PageCollection:
             else:
                 self.iterate(page.next)
 
+    def iterate_parallel(self, max_workers: int = 8):
+        """page through collection using the total from the first page to request all remaining offsets at once
+
+        :param max_workers: max concurrent page requests
+        """
+
+        if len(self.pages) == 0:
+            self.add_page(self.fetch_page())
+
+        last_page = self.pages[-1]
+        if not last_page.next:
+            return
+
+        start = (last_page.offset or 0) + len(last_page.items)
+        end = last_page.total
+        if self.total_limit:
+            end = min(end, self.total_limit)
+
+        offsets = list(range(start, end, self.page_limit))
+        if len(offsets) == 0:
+            return
+
+        logger.debug(f'fanning out {self.name}, {len(offsets)} pages from offset {start}')
+
+        if max_workers is None or max_workers <= 1 or len(offsets) == 1:
+            responses = [self.fetch_page(offset=i) for i in offsets]
+        else:
+            with ThreadPoolExecutor(max_workers=min(max_workers, len(offsets))) as executor:
+                responses = list(executor.map(lambda i: self.fetch_page(offset=i), offsets))
+
+        for resp in responses:
+            self.add_page(resp)
+
+    def iter_pages(self) -> Iterator['Page']:
+        """yield pages without storing them on the collection, the following page is requested in the background
+        while the current one is consumed
+        """
+
+        with ThreadPoolExecutor(max_workers=1) as executor:
+            future = executor.submit(self.fetch_page)
+            count = 0
+
+            while future is not None:
+                page = init_with_key_filter(Page, future.result())
+                future = None
+
+                if self.total_limit:
+                    page.items = page.items[:self.total_limit - count]
+                count += len(page.items)
+
+                if page.next and (self.total_limit is None or count < self.total_limit):
+                    future = executor.submit(self.fetch_page, page.next)
+
+                logger.debug(f'streaming {self.name}, {count}/{page.total}')
+                yield page
+
     def add_page(self, page_dict):
         page = init_with_key_filter(Page, page_dict)
         self.pages.append(page)
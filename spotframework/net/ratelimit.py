@@ -0,0 +1,128 @@
+import asyncio
+import logging
+import threading
+import time
+from typing import Dict
+
+logger = logging.getLogger(__name__)
+
+
+class RateLimiter:
+    """Token bucket acquired before every request, shared between networks of the same client id
+
+    Budget shrinks multiplicatively when the service responds with a Retry-After and grows additively on
+    success, past the starting rate up to max_rate, so the rate settles just below the service's limit. A
+    Retry-After also pauses every caller until it has elapsed
+
+    The defaults start at 100 requests per second, above what a sequential client or the default fan-out of 8 workers
+    sends, so requests are not delayed until the service first rate limits. The rate grows to at most 200 requests
+    per second
+    """
+
+    def __init__(self,
+                 rate: float = 100.0,
+                 capacity: float = 100.0,
+                 max_rate: float = 200.0,
+                 min_rate: float = 1.0,
+                 decrease_factor: float = 0.5,
+                 recovery: float = 0.1):
+        """
+        :param rate: starting requests per second
+        :param capacity: max requests allowed in a burst
+        :param max_rate: ceiling the rate grows to on success, unbounded if None
+        :param min_rate: floor for the rate when shrinking after rate limiting
+        :param decrease_factor: multiplier applied to the rate on each Retry-After
+        :param recovery: requests per second regained after each successful request
+        """
+        self.max_rate = max_rate
+        self.rate = rate
+        self.capacity = capacity
+        self.min_rate = min_rate
+        self.decrease_factor = decrease_factor
+        self.recovery = recovery
+
+        self.tokens = capacity
+        self.updated = time.monotonic()
+        self.paused_until = 0.0
+
+        self.lock = threading.Lock()
+
+    def try_acquire(self) -> float:
+        """take a token if available
+
+        :return: 0 if a token was taken, otherwise seconds to wait before trying again
+        """
+        with self.lock:
+            now = time.monotonic()
+
+            if now < self.paused_until:
+                return self.paused_until - now
+
+            self.tokens = min(self.capacity, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0.0
+
+            return (1 - self.tokens) / self.rate
+
+    def acquire(self) -> float:
+        """block until a token is available
+
+        :return: seconds spent waiting
+        """
+        waited = 0.0
+        while (wait := self.try_acquire()) > 0:
+            time.sleep(wait)
+            waited += wait
+        return waited
+
+    async def acquire_async(self) -> float:
+        """wait without blocking the event loop until a token is available
+
+        :return: seconds spent waiting
+        """
+        waited = 0.0
+        while (wait := self.try_acquire()) > 0:
+            await asyncio.sleep(wait)
+            waited += wait
+        return waited
+
+    def success(self):
+        with self.lock:
+            if self.max_rate is None:
+                self.rate += self.recovery
+            elif self.rate < self.max_rate:
+                self.rate = min(self.max_rate, self.rate + self.recovery)
+
+    def backoff(self, retry_after: float):
+        """pause all callers for retry_after seconds and shrink the rate
+
+        :param retry_after: seconds given by the Retry-After header
+        """
+        with self.lock:
+            now = time.monotonic()
+
+            # responses from the same burst only shrink the rate once
+            if now >= self.paused_until:
+                self.rate = max(self.min_rate, self.rate * self.decrease_factor)
+                logger.debug(f'pausing for {retry_after}s, rate reduced to {self.rate:.2f}/s')
+
+            self.paused_until = max(self.paused_until, now + retry_after)
+            self.updated = self.paused_until
+            self.tokens = 0
+
+
+rate_limiters: Dict[str, RateLimiter] = dict()
+rate_limiters_lock = threading.Lock()
+
+
+def get_rate_limiter(client_id: str) -> RateLimiter:
+    """get the rate limiter shared by every network using client_id, creating one if needed"""
+
+    with rate_limiters_lock:
+        limiter = rate_limiters.get(client_id)
+        if limiter is None:
+            limiter = rate_limiters[client_id] = RateLimiter()
+        return limiter
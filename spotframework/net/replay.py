@@ -0,0 +1,244 @@
+import json as jsonlib
+import logging
+import os
+import random
+import threading
+import time
+from typing import Optional, Union, Tuple
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+
+from requests.structures import CaseInsensitiveDict
+
+from spotframework.net.transport import Transport, RetryingTransport
+
+logger = logging.getLogger(__name__)
+
+redacted_keys = ['access_token', 'refresh_token']
+
+
+class TransportResponse:
+    """Minimal stand in for requests.Response returned by replayed and injected responses"""
+
+    def __init__(self, status_code: int, headers: dict = None, content: Union[bytes, str] = b''):
+        self.status_code = status_code
+        self.headers = CaseInsensitiveDict(headers or {})
+        self.content = content.encode('utf-8') if isinstance(content, str) else content
+
+    @property
+    def text(self) -> str:
+        return self.content.decode('utf-8')
+
+    def json(self):
+        return jsonlib.loads(self.content)
+
+    def __repr__(self):
+        return f'<TransportResponse [{self.status_code}]>'
+
+
+def request_key(method: str, url: str, params: dict = None, json: dict = None) -> str:
+    """identify a request by method, url with sorted query parameters and json body"""
+
+    parts = urlsplit(url)
+    query = parse_qsl(parts.query)
+    for key, value in (params or {}).items():
+        if value is None:
+            continue
+        if isinstance(value, (list, tuple)):
+            query += [(key, str(i)) for i in value]
+        else:
+            query.append((key, str(value)))
+
+    url = urlunsplit((parts.scheme, parts.netloc, parts.path, urlencode(sorted(set(query))), ''))
+    body = jsonlib.dumps(json, sort_keys=True) if json is not None else ''
+
+    return f'{method} {url} {body}'.strip()
+
+
+def redact(body: str) -> str:
+    """replace credentials in a json response body before it is written to a cassette"""
+
+    try:
+        obj = jsonlib.loads(body)
+    except ValueError:
+        return body
+
+    if isinstance(obj, dict) and any(i in obj for i in redacted_keys):
+        obj.update({i: 'redacted' for i in redacted_keys if i in obj})
+        return jsonlib.dumps(obj)
+    return body
+
+
+class RecordingTransport(Transport):
+    """Transport passing requests to another transport and recording each exchange to a cassette file
+
+    Request headers and form bodies are not recorded and tokens in response bodies are redacted
+    """
+
+    def __init__(self, transport: Transport, path: str):
+        """
+        :param transport: transport sending the live requests
+        :param path: cassette file written by save()
+        """
+        self.transport = transport
+        self.path = path
+        self.interactions = []
+        self.lock = threading.Lock()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.save()
+
+    def request(self,
+                method: str,
+                url: str,
+                headers: dict = None,
+                params: dict = None,
+                json: dict = None,
+                data: dict = None):
+
+        response = self.transport.request(method=method, url=url, headers=headers, params=params, json=json,
+                                          data=data)
+
+        with self.lock:
+            self.interactions.append({
+                'key': request_key(method, url, params, json),
+                'status_code': response.status_code,
+                'headers': {i: j for i, j in response.headers.items()
+                            if i.lower() in ['content-type', 'etag', 'retry-after']},
+                'body': redact(response.text)
+            })
+
+        return response
+
+    def save(self):
+        logger.info(f'saving {len(self.interactions)} interactions to {self.path}')
+
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+
+        with open(self.path, 'w') as fileobj:
+            jsonlib.dump({'interactions': self.interactions}, fileobj, indent=1)
+
+    def close(self):
+        self.transport.close()
+
+
+class ReplayTransport(Transport):
+    """Transport answering requests from a recorded cassette without network access
+
+    Repeated requests are answered with their recorded responses in order, the last response is repeated once
+    exhausted
+    """
+
+    def __init__(self, path: str):
+        """
+        :param path: cassette file written by RecordingTransport
+        """
+        with open(path, 'r') as fileobj:
+            interactions = jsonlib.load(fileobj)['interactions']
+
+        self.responses = dict()
+        for interaction in interactions:
+            self.responses.setdefault(interaction['key'], []).append(interaction)
+
+        self.played = dict()
+        self.lock = threading.Lock()
+
+    def request(self,
+                method: str,
+                url: str,
+                headers: dict = None,
+                params: dict = None,
+                json: dict = None,
+                data: dict = None):
+
+        key = request_key(method, url, params, json)
+
+        with self.lock:
+            recorded = self.responses.get(key)
+            if not recorded:
+                raise LookupError(f'no recorded response for {key}')
+
+            index = self.played.get(key, 0)
+            self.played[key] = index + 1
+            interaction = recorded[min(index, len(recorded) - 1)]
+
+        return TransportResponse(status_code=interaction['status_code'],
+                                 headers=interaction['headers'],
+                                 content=interaction['body'])
+
+
+class FaultInjectingTransport(RetryingTransport):
+    """Transport adding latency and randomly failing requests before passing them to another transport
+
+    Injected 5xx responses go through the usual transient retry handling
+    """
+
+    def __init__(self,
+                 transport: Transport,
+                 latency: Union[float, Tuple[float, float]] = 0,
+                 rate_limit_rate: float = 0,
+                 retry_after: int = 1,
+                 unauthorised_rate: float = 0,
+                 server_error_rate: float = 0,
+                 seed: Optional[int] = None,
+                 **kwargs):
+        """
+        :param transport: transport handling requests which are not failed
+        :param latency: seconds added to each request, or a (min, max) range
+        :param rate_limit_rate: probability of a 429 response
+        :param retry_after: Retry-After seconds of injected 429 responses
+        :param unauthorised_rate: probability of a 401 response for authenticated requests
+        :param server_error_rate: probability of a 503 response
+        :param seed: random seed for reproducible faults
+        """
+        super().__init__(**kwargs)
+        self.transport = transport
+        self.latency = latency
+        self.rate_limit_rate = rate_limit_rate
+        self.retry_after = retry_after
+        self.unauthorised_rate = unauthorised_rate
+        self.server_error_rate = server_error_rate
+
+        self.random = random.Random(seed)
+        self.lock = threading.Lock()
+
+    @staticmethod
+    def error_response(status_code: int, message: str, headers: dict = None) -> TransportResponse:
+        return TransportResponse(status_code=status_code,
+                                 headers=headers,
+                                 content=jsonlib.dumps({'error': {'status': status_code, 'message': message}}))
+
+    def send(self, method: str, url: str, headers: dict, params: dict, json: dict, data: dict):
+
+        with self.lock:
+            if isinstance(self.latency, tuple):
+                latency = self.random.uniform(*self.latency)
+            else:
+                latency = self.latency
+            roll = self.random.random()
+
+        if latency > 0:
+            time.sleep(latency)
+
+        authenticated = 'Bearer' in (headers or {}).get('Authorization', '')
+
+        unauthorised_threshold = self.rate_limit_rate + self.unauthorised_rate
+
+        if roll < self.rate_limit_rate:
+            return self.error_response(429, 'API rate limit exceeded', {'Retry-After': str(self.retry_after)})
+
+        if roll < unauthorised_threshold:
+            if authenticated:
+                return self.error_response(401, 'The access token expired')
+
+        elif roll < unauthorised_threshold + self.server_error_rate:
+            return self.error_response(503, 'Service unavailable')
+
+        return self.transport.request(method=method, url=url, headers=headers, params=params, json=json, data=data)
+
+    def close(self):
+        self.transport.close()
@@ -0,0 +1,198 @@
+import logging
+import random
+import time
+from abc import ABC, abstractmethod
+from typing import Optional
+
+import requests
+import urllib3
+from requests.adapters import HTTPAdapter
+
+try:
+    import httpx
+except ImportError:
+    httpx = None
+
+logger = logging.getLogger(__name__)
+
+
+class Transport(ABC):
+    """HTTP client used by Network to send requests
+
+    Responses are expected to provide status_code, headers, content, text and json() in the manner of
+    requests.Response
+    """
+
+    @abstractmethod
+    def request(self,
+                method: str,
+                url: str,
+                headers: dict = None,
+                params: dict = None,
+                json: dict = None,
+                data: dict = None):
+        pass
+
+    def close(self):
+        pass
+
+
+class RetryingTransport(Transport, ABC):
+    """Transport retrying failures with jittered exponential backoff
+
+    Failures to connect are retried for every method as the request was never sent. Other transient errors and
+    server errors are only retried for retry_methods, a write whose response was lost may already have been applied
+    and range moves or positional removals sent twice would be applied twice
+    """
+
+    transient_errors = ()
+
+    def __init__(self,
+                 retries: int = 3,
+                 backoff_factor: float = 0.5,
+                 backoff_max: float = 30,
+                 retry_statuses: frozenset = frozenset({500, 502, 503, 504}),
+                 retry_methods: frozenset = frozenset({'GET'})):
+        """
+        :param retries: max retries after the first attempt
+        :param backoff_factor: base of the exponential backoff in seconds
+        :param backoff_max: ceiling of a single backoff in seconds
+        :param retry_statuses: response codes treated as transient
+        :param retry_methods: methods safe to send again after the request may have reached the service
+        """
+        self.retries = retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        self.retry_statuses = retry_statuses
+        self.retry_methods = retry_methods
+
+    @abstractmethod
+    def send(self, method: str, url: str, headers: dict, params: dict, json: dict, data: dict):
+        pass
+
+    def is_connect_error(self, error: Exception) -> bool:
+        """whether error was raised before the request was sent"""
+        return False
+
+    def backoff(self, attempt: int) -> float:
+        """full jitter backoff for attempt, starting at 0"""
+        return random.uniform(0, min(self.backoff_max, self.backoff_factor * (2 ** attempt)))
+
+    def request(self,
+                method: str,
+                url: str,
+                headers: dict = None,
+                params: dict = None,
+                json: dict = None,
+                data: dict = None):
+
+        attempt = 0
+        while True:
+            can_retry = attempt < self.retries and method in self.retry_methods
+
+            try:
+                response = self.send(method=method, url=url, headers=headers, params=params, json=json, data=data)
+            except self.transient_errors as e:
+                if not (can_retry or attempt < self.retries and self.is_connect_error(e)):
+                    raise
+                logger.warning(f'{method} {url} failed ({type(e).__name__}), attempt {attempt + 1}/{self.retries}')
+            else:
+                if response.status_code not in self.retry_statuses or not can_retry:
+                    return response
+                logger.warning(f'{method} {url} {response.status_code}, attempt {attempt + 1}/{self.retries}')
+
+            time.sleep(self.backoff(attempt))
+            attempt += 1
+
+
+class RequestsTransport(RetryingTransport):
+    """Pooled requests session with connect and read timeouts"""
+
+    transient_errors = (requests.exceptions.ConnectionError,
+                        requests.exceptions.Timeout,
+                        requests.exceptions.ChunkedEncodingError)
+
+    def __init__(self,
+                 pool_connections: int = 10,
+                 pool_maxsize: int = 32,
+                 connect_timeout: float = 5,
+                 read_timeout: Optional[float] = 30,
+                 **kwargs):
+        """
+        :param pool_connections: number of host pools to keep
+        :param pool_maxsize: max connections kept per host, should cover the number of concurrent workers
+        :param connect_timeout: seconds to wait for a connection
+        :param read_timeout: seconds to wait between bytes of the response
+        """
+        super().__init__(**kwargs)
+        self.timeout = (connect_timeout, read_timeout)
+
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=pool_connections, pool_maxsize=pool_maxsize)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+
+    def is_connect_error(self, error: Exception) -> bool:
+        if isinstance(error, requests.exceptions.ConnectTimeout):
+            return True
+
+        # connection refused or name resolution failures are wrapped by urllib3
+        reason = getattr(error.args[0], 'reason', None) if error.args else None
+        return isinstance(error, requests.exceptions.ConnectionError) \
+            and isinstance(reason, (urllib3.exceptions.NewConnectionError, urllib3.exceptions.ConnectTimeoutError))
+
+    def send(self, method: str, url: str, headers: dict, params: dict, json: dict, data: dict):
+        return self.session.request(method=method,
+                                    url=url,
+                                    headers=headers,
+                                    params=params,
+                                    json=json,
+                                    data=data,
+                                    timeout=self.timeout)
+
+    def close(self):
+        self.session.close()
+
+
+class HttpxTransport(RetryingTransport):
+    """Pooled httpx client with connect and read timeouts, requires httpx"""
+
+    def __init__(self,
+                 max_connections: int = 32,
+                 max_keepalive_connections: int = 32,
+                 connect_timeout: float = 5,
+                 read_timeout: Optional[float] = 30,
+                 http2: bool = False,
+                 **kwargs):
+        """
+        :param max_connections: max open connections
+        :param max_keepalive_connections: max idle connections kept open
+        :param connect_timeout: seconds to wait for a connection
+        :param read_timeout: seconds to wait between bytes of the response
+        :param http2: negotiate http/2, requires the httpx http2 extra
+        """
+        if httpx is None:
+            raise ImportError('httpx is required for HttpxTransport, install spotframework[httpx]')
+
+        super().__init__(**kwargs)
+        self.transient_errors = (httpx.TransportError,)
+        self.connect_errors = (httpx.ConnectError, httpx.ConnectTimeout, httpx.PoolTimeout)
+
+        self.client = httpx.Client(limits=httpx.Limits(max_connections=max_connections,
+                                                       max_keepalive_connections=max_keepalive_connections),
+                                   timeout=httpx.Timeout(read_timeout, connect=connect_timeout),
+                                   http2=http2)
+
+    def is_connect_error(self, error: Exception) -> bool:
+        return isinstance(error, self.connect_errors)
+
+    def send(self, method: str, url: str, headers: dict, params: dict, json: dict, data: dict):
+        return self.client.request(method=method,
+                                   url=url,
+                                   headers=headers,
+                                   params=params,
+                                   json=json,
+                                   data=data)
+
+    def close(self):
+        self.client.close()
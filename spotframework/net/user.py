@@ -2,7 +2,7 @@ from __future__ import annotations
 from spotframework.model.user import PublicUser
 from dataclasses import dataclass, field
 from typing import List
-from datetime import datetime
+from datetime import datetime, timedelta
 
 
 @dataclass
@@ -21,3 +21,16 @@ class NetworkUser:
     on_refresh: List = field(default_factory=list, init=False)
 
     refresh_counter: int = field(default=0, init=False)
+
+    def token_expires_within(self, seconds: float) -> bool:
+        """check whether the access token expires in the next number of seconds, False if the expiry is unknown"""
+
+        if self.last_refreshed is None or self.token_expiry is None:
+            return False
+
+        if isinstance(self.token_expiry, datetime):
+            expiry = self.token_expiry
+        else:
+            expiry = self.last_refreshed + timedelta(seconds=self.token_expiry)
+
+        return datetime.utcnow() + timedelta(seconds=seconds) >= expiry
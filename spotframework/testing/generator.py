@@ -0,0 +1,257 @@
+import random
+from datetime import datetime, timezone, timedelta
+from typing import List, Tuple
+
+import spotframework.testing.payloads as payloads
+
+words = ['velvet', 'harbor', 'neon', 'echo', 'glass', 'river', 'static', 'golden', 'midnight', 'paper', 'silver',
+         'shadow', 'summer', 'winter', 'electric', 'hollow', 'crystal', 'desert', 'ocean', 'wild', 'quiet', 'broken',
+         'burning', 'distant', 'lucid', 'violet', 'cold', 'northern', 'fading', 'little', 'heavy', 'secret', 'satellite',
+         'garden', 'signal', 'machine', 'mirror', 'thunder', 'honey', 'ghost', 'lantern', 'orbit', 'tide', 'ember',
+         'canyon', 'arcade', 'fever', 'cathedral', 'meadow', 'circuit', 'dream', 'forest', 'parade', 'horizon']
+
+market_codes = ['AD', 'AE', 'AR', 'AT', 'AU', 'BE', 'BG', 'BH', 'BO', 'BR', 'CA', 'CH', 'CL', 'CO', 'CR', 'CY',
+                'CZ', 'DE', 'DK', 'DO', 'DZ', 'EC', 'EE', 'EG', 'ES', 'FI', 'FR', 'GB', 'GR', 'GT', 'HK', 'HN', 'HU',
+                'ID', 'IE', 'IL', 'IN', 'IS', 'IT', 'JO', 'JP', 'KW', 'LB', 'LI', 'LT', 'LU', 'LV', 'MA', 'MC', 'MT',
+                'MX', 'MY', 'NI', 'NL', 'NO', 'NZ', 'OM', 'PA', 'PE', 'PH', 'PL', 'PS', 'PT', 'PY', 'QA', 'RO', 'SA',
+                'SE', 'SG', 'SK', 'SV', 'TH', 'TN', 'TR', 'TW', 'US', 'UY', 'VN', 'ZA']
+
+album_sizes = {'single': (1, 4), 'album': (8, 16), 'compilation': (15, 30)}
+
+
+def timestamp(time: datetime) -> str:
+    return time.strftime('%Y-%m-%dT%H:%M:%SZ')
+
+
+class LibraryGenerator:
+    """Seeded generator of realistic catalogue and library payloads
+
+    Artists are partly reused with preferential attachment so a few artists account for many tracks, as in a real
+    library. Equal seeds and parameters produce identical payloads.
+    """
+
+    def __init__(self,
+                 seed: int = 0,
+                 artist_reuse: float = 0.7,
+                 album_sharing: float = 0.6,
+                 featured_artist_rate: float = 0.15,
+                 album_type_weights: Tuple[float, float, float] = (0.25, 0.7, 0.05),
+                 duplicate_rate: float = 0.03,
+                 rerelease_rate: float = 0.02,
+                 added_from: datetime = datetime(2015, 1, 1, tzinfo=timezone.utc),
+                 added_to: datetime = datetime(2021, 1, 1, tzinfo=timezone.utc),
+                 burstiness: float = 0.5,
+                 release_years: Tuple[int, int] = (1960, 2021),
+                 markets: int = 79,
+                 user: dict = None):
+        """
+        :param seed: random seed
+        :param artist_reuse: probability a new album is by an existing artist rather than a new one
+        :param album_sharing: probability a new track joins an existing album with free track slots
+        :param featured_artist_rate: probability a track credits a second artist
+        :param album_type_weights: relative weights of single, album and compilation releases
+        :param duplicate_rate: probability a playlist or library item repeats an earlier track
+        :param rerelease_rate: probability a playlist or library item is another release of an earlier track,
+            same name and artists on a different album
+        :param added_from: earliest added_at timestamp
+        :param added_to: latest added_at timestamp
+        :param burstiness: probability an item is added minutes after the previous one rather than at a random time
+        :param release_years: range of album release years, skewed towards recent years
+        :param markets: number of available_markets per release
+        :param user: payload of the user adding tracks
+        """
+        self.random = random.Random(seed)
+        self.artist_reuse = artist_reuse
+        self.album_sharing = album_sharing
+        self.featured_artist_rate = featured_artist_rate
+        self.album_type_weights = album_type_weights
+        self.duplicate_rate = duplicate_rate
+        self.rerelease_rate = rerelease_rate
+        self.added_from = added_from
+        self.added_to = added_to
+        self.burstiness = burstiness
+        self.release_years = release_years
+        self.markets = market_codes[:markets]
+        self.user = user if user is not None else payloads.user('generated', 'Generated User')
+
+        self.artists = []
+        self.album_credits = []
+        self.open_albums = []
+        self.catalogue = []
+
+    def new_id(self) -> str:
+        return payloads.spotify_id(self.random.getrandbits(128))
+
+    def name(self, length: int = 2) -> str:
+        return ' '.join(self.random.choice(words) for _ in range(length)).title()
+
+    def artist(self) -> dict:
+        """existing artist, half the time weighted by number of albums, or a new artist"""
+
+        if self.album_credits and self.random.random() < self.artist_reuse:
+            if self.random.random() < 0.5:
+                return self.random.choice(self.album_credits)
+            return self.random.choice(self.artists)
+
+        artist = payloads.artist(self.new_id(), self.name(self.random.randint(1, 3)))
+        self.artists.append(artist)
+        return artist
+
+    def release_date(self) -> Tuple[str, str]:
+        year = int(self.random.triangular(*self.release_years, self.release_years[1]))
+        precision = self.random.choices(['day', 'month', 'year'], weights=[0.85, 0.05, 0.1])[0]
+
+        if precision == 'year':
+            return str(year), precision
+        if precision == 'month':
+            return f'{year}-{self.random.randint(1, 12):02d}', precision
+        return f'{year}-{self.random.randint(1, 12):02d}-{self.random.randint(1, 28):02d}', precision
+
+    def album(self, artist: dict = None) -> dict:
+        album_type = self.random.choices(list(album_sizes), weights=self.album_type_weights)[0]
+        artist = artist if artist is not None else self.artist()
+        release_date, precision = self.release_date()
+
+        album = payloads.album(self.new_id(),
+                               self.name(self.random.randint(1, 3)),
+                               [artist],
+                               release_date=release_date,
+                               release_date_precision=precision,
+                               album_type=album_type,
+                               total_tracks=self.random.randint(*album_sizes[album_type]),
+                               available_markets=list(self.markets))
+        self.album_credits.append(artist)
+        return album
+
+    def track(self, name: str = None, artists: List[dict] = None) -> dict:
+        """new track on an open album or a new one
+
+        :param name: track name, random if None
+        :param artists: track artists, the album artist and an occasional featured artist if None
+        """
+
+        if artists is not None:
+            album, next_number = self.album(artist=artists[0]), 1
+        elif self.open_albums and self.random.random() < self.album_sharing:
+            album, next_number = self.open_albums.pop(self.random.randrange(len(self.open_albums)))
+        else:
+            album, next_number = self.album(), 1
+
+        if next_number < album['total_tracks']:
+            self.open_albums.append((album, next_number + 1))
+
+        if artists is None:
+            artists = list(album['artists'])
+            if self.random.random() < self.featured_artist_rate:
+                featured = self.artist()
+                if featured is not artists[0]:
+                    artists.append(featured)
+
+        track = payloads.track(self.new_id(),
+                               name if name is not None else self.name(self.random.randint(1, 4)),
+                               album,
+                               artists,
+                               duration_ms=int(self.random.gauss(220000, 60000)) % 600000 + 30000,
+                               popularity=min(int(self.random.expovariate(1 / 30)), 100),
+                               track_number=next_number,
+                               explicit=self.random.random() < 0.1,
+                               available_markets=list(self.markets))
+        self.catalogue.append(track)
+        return track
+
+    def tracks(self, count: int) -> List[dict]:
+        """full track payloads, each distinct"""
+        return [self.track() for _ in range(count)]
+
+    def track_selection(self, count: int) -> List[dict]:
+        """tracks for a playlist or library including exact duplicates and re-releases of earlier tracks"""
+
+        selection = []
+        for _ in range(count):
+            roll = self.random.random()
+
+            if selection and roll < self.duplicate_rate:
+                selection.append(self.random.choice(selection))
+            elif selection and roll < self.duplicate_rate + self.rerelease_rate:
+                original = self.random.choice(selection)
+                selection.append(self.track(name=original['name'], artists=original['artists']))
+            else:
+                selection.append(self.track())
+
+        return selection
+
+    def timestamps(self, count: int) -> List[str]:
+        """ascending timestamps between added_from and added_to, some clustered into bursts"""
+
+        span = (self.added_to - self.added_from).total_seconds()
+
+        times = []
+        for _ in range(count):
+            if times and self.random.random() < self.burstiness:
+                times.append(times[-1] + timedelta(seconds=self.random.randint(10, 600)))
+            else:
+                times.append(self.added_from + timedelta(seconds=self.random.uniform(0, span)))
+
+        return [timestamp(min(i, self.added_to)) for i in sorted(times)]
+
+    def playlist_tracks(self, count: int) -> List[dict]:
+        return [payloads.playlist_track(track, added_at, self.user)
+                for track, added_at in zip(self.track_selection(count), self.timestamps(count))]
+
+    def library_tracks(self, count: int) -> List[dict]:
+        """saved tracks, most recently added first as returned by the service"""
+
+        tracks = self.track_selection(count)
+        return [payloads.library_track(track, added_at)
+                for track, added_at in zip(tracks, reversed(self.timestamps(count)))]
+
+    def playlist(self, count: int, name: str = None) -> Tuple[dict, List[dict]]:
+        """simplified playlist payload and its playlist track items"""
+
+        items = self.playlist_tracks(count)
+        playlist = payloads.playlist(self.new_id(),
+                                     name if name is not None else self.name(),
+                                     self.user,
+                                     snapshot_id=self.new_id(),
+                                     total=len(items),
+                                     description=self.name(self.random.randint(0, 8)))
+        return playlist, items
+
+    def recently_played(self, count: int, contexts: List[str] = None) -> List[dict]:
+        """listening history drawn from generated tracks, most recent first, each play following the last
+
+        :param count: number of plays
+        :param contexts: uris to use as play contexts, album contexts if None
+        """
+
+        if not self.catalogue:
+            self.tracks(count)
+
+        played_at = self.added_to
+        history = []
+        for _ in range(count):
+            track = self.random.choice(self.catalogue[-max(count, 50):])
+            context = self.random.choice(contexts) if contexts else track['album']['uri']
+
+            history.append(payloads.played_track(track, timestamp(played_at), payloads.context(context)))
+            played_at -= timedelta(milliseconds=track['duration_ms'] + self.random.randint(0, 120000))
+
+        return history
+
+    def audio_features(self, track: dict) -> dict:
+        features = random.Random(track['id'])
+
+        return payloads.audio_features(track['id'],
+                                       duration_ms=track['duration_ms'],
+                                       acousticness=round(features.betavariate(0.6, 1.5), 4),
+                                       danceability=round(features.betavariate(4, 3), 4),
+                                       energy=round(features.betavariate(3, 2), 4),
+                                       instrumentalness=round(features.betavariate(0.3, 1.2), 4),
+                                       key=features.randint(0, 11),
+                                       liveness=round(features.betavariate(1.2, 6), 4),
+                                       loudness=round(features.uniform(-20, -2), 3),
+                                       mode=features.randint(0, 1),
+                                       speechiness=round(features.betavariate(1, 12), 4),
+                                       tempo=round(features.gauss(122, 25), 3),
+                                       time_signature=features.choices([3, 4, 5], weights=[1, 18, 1])[0],
+                                       valence=round(features.betavariate(2, 2), 4))
@@ -0,0 +1,234 @@
+import string
+from typing import List
+
+base62 = string.digits + string.ascii_letters
+api_url = 'https://api.spotify.com/v1/'
+open_url = 'https://open.spotify.com/'
+
+
+def spotify_id(number: int) -> str:
+    """22 character base62 id for number, in the style of service ids"""
+
+    chars = []
+    while number:
+        number, remainder = divmod(number, 62)
+        chars.append(base62[remainder])
+    return ''.join(reversed(chars)).rjust(22, '0')
+
+
+def image(url: str, size: int = 640) -> dict:
+    return {'height': size, 'width': size, 'url': url}
+
+
+def user(id: str, display_name: str = None) -> dict:
+    return {
+        'display_name': display_name if display_name is not None else id,
+        'external_urls': {'spotify': f'{open_url}user/{id}'},
+        'followers': {'href': None, 'total': 0},
+        'href': f'{api_url}users/{id}',
+        'id': id,
+        'images': [],
+        'type': 'user',
+        'uri': f'spotify:user:{id}'
+    }
+
+
+def artist(id: str, name: str) -> dict:
+    return {
+        'external_urls': {'spotify': f'{open_url}artist/{id}'},
+        'href': f'{api_url}artists/{id}',
+        'id': id,
+        'name': name,
+        'type': 'artist',
+        'uri': f'spotify:artist:{id}'
+    }
+
+
+def full_artist(id: str, name: str, genres: List[str] = None, popularity: int = 50) -> dict:
+    return {
+        **artist(id, name),
+        'followers': {'href': None, 'total': popularity * 1000},
+        'genres': genres if genres is not None else [],
+        'images': [image(f'https://i.scdn.co/image/{id}')],
+        'popularity': popularity
+    }
+
+
+def album(id: str,
+          name: str,
+          artists: List[dict],
+          release_date: str = '2020-01-01',
+          release_date_precision: str = 'day',
+          album_type: str = 'album',
+          total_tracks: int = 10,
+          available_markets: List[str] = None) -> dict:
+    return {
+        'album_type': album_type,
+        'artists': artists,
+        'available_markets': available_markets if available_markets is not None else [],
+        'external_urls': {'spotify': f'{open_url}album/{id}'},
+        'href': f'{api_url}albums/{id}',
+        'id': id,
+        'images': [image(f'https://i.scdn.co/image/{id}', size) for size in (640, 300, 64)],
+        'name': name,
+        'release_date': release_date,
+        'release_date_precision': release_date_precision,
+        'total_tracks': total_tracks,
+        'type': 'album',
+        'uri': f'spotify:album:{id}'
+    }
+
+
+def full_album(album_obj: dict, tracks: List[dict], label: str = None, popularity: int = 50) -> dict:
+    """album with a page of simplified tracks"""
+
+    href = f'{album_obj["href"]}/tracks'
+    return {
+        **album_obj,
+        'copyrights': [],
+        'external_ids': {'upc': album_obj['id']},
+        'genres': [],
+        'label': label,
+        'popularity': popularity,
+        'tracks': page(items=[{i: j for i, j in track_obj.items() if i not in ('album', 'external_ids', 'popularity')}
+                              for track_obj in tracks],
+                       href=href, offset=0, limit=50, total=len(tracks))
+    }
+
+
+def track(id: str,
+          name: str,
+          album: dict,
+          artists: List[dict],
+          duration_ms: int = 200000,
+          popularity: int = 50,
+          track_number: int = 1,
+          disc_number: int = 1,
+          explicit: bool = False,
+          available_markets: List[str] = None) -> dict:
+    return {
+        'album': album,
+        'artists': artists,
+        'available_markets': available_markets if available_markets is not None else [],
+        'disc_number': disc_number,
+        'duration_ms': duration_ms,
+        'episode': False,
+        'explicit': explicit,
+        'external_ids': {'isrc': id[-12:]},
+        'external_urls': {'spotify': f'{open_url}track/{id}'},
+        'href': f'{api_url}tracks/{id}',
+        'id': id,
+        'is_local': False,
+        'name': name,
+        'popularity': popularity,
+        'preview_url': None,
+        'track': True,
+        'track_number': track_number,
+        'type': 'track',
+        'uri': f'spotify:track:{id}'
+    }
+
+
+def playlist_track(track_obj: dict, added_at: str, added_by: dict = None) -> dict:
+    return {
+        'added_at': added_at,
+        'added_by': added_by,
+        'is_local': False,
+        'primary_color': None,
+        'track': track_obj,
+        'video_thumbnail': {'url': None}
+    }
+
+
+def library_track(track_obj: dict, added_at: str) -> dict:
+    return {'added_at': added_at, 'track': track_obj}
+
+
+def played_track(track_obj: dict, played_at: str, context: dict = None) -> dict:
+    return {'context': context, 'played_at': played_at, 'track': track_obj}
+
+
+def context(uri: str) -> dict:
+    object_type, id = uri.split(':')[-2:]
+    return {
+        'external_urls': {'spotify': f'{open_url}{object_type}/{id}'},
+        'href': f'{api_url}{object_type}s/{id}',
+        'type': object_type,
+        'uri': uri
+    }
+
+
+def audio_features(id: str,
+                   duration_ms: int = 200000,
+                   acousticness: float = 0.5,
+                   danceability: float = 0.5,
+                   energy: float = 0.5,
+                   instrumentalness: float = 0.0,
+                   key: int = 0,
+                   liveness: float = 0.1,
+                   loudness: float = -8.0,
+                   mode: int = 1,
+                   speechiness: float = 0.05,
+                   tempo: float = 120.0,
+                   time_signature: int = 4,
+                   valence: float = 0.5) -> dict:
+    return {
+        'acousticness': acousticness,
+        'analysis_url': f'{api_url}audio-analysis/{id}',
+        'danceability': danceability,
+        'duration_ms': duration_ms,
+        'energy': energy,
+        'id': id,
+        'instrumentalness': instrumentalness,
+        'key': key,
+        'liveness': liveness,
+        'loudness': loudness,
+        'mode': mode,
+        'speechiness': speechiness,
+        'tempo': tempo,
+        'time_signature': time_signature,
+        'track_href': f'{api_url}tracks/{id}',
+        'type': 'audio_features',
+        'uri': f'spotify:track:{id}',
+        'valence': valence
+    }
+
+
+def playlist(id: str,
+             name: str,
+             owner: dict,
+             snapshot_id: str,
+             total: int,
+             description: str = '',
+             public: bool = True,
+             collaborative: bool = False) -> dict:
+    """simplified playlist, tracks holds the href and total rather than items"""
+
+    return {
+        'collaborative': collaborative,
+        'description': description,
+        'external_urls': {'spotify': f'{open_url}playlist/{id}'},
+        'href': f'{api_url}playlists/{id}',
+        'id': id,
+        'images': [image(f'https://mosaic.scdn.co/640/{id}')],
+        'name': name,
+        'owner': owner,
+        'primary_color': None,
+        'public': public,
+        'snapshot_id': snapshot_id,
+        'tracks': {'href': f'{api_url}playlists/{id}/tracks', 'total': total},
+        'type': 'playlist',
+        'uri': f'spotify:playlist:{id}'
+    }
+
+
+def page(items: list, href: str, offset: int, limit: int, total: int, next: str = None, previous: str = None) -> dict:
+    return {
+        'href': href,
+        'items': items,
+        'limit': limit,
+        'next': next,
+        'offset': offset,
+        'previous': previous,
+        'total': total
+    }
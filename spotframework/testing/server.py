@@ -0,0 +1,670 @@
+import json
+import logging
+import math
+import random
+import re
+import secrets
+import threading
+import time
+from collections import Counter, deque
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import List, Optional
+from urllib.parse import urlsplit, parse_qs
+
+import spotframework.testing.payloads as payloads
+from spotframework.testing.generator import LibraryGenerator
+from spotframework.net.user import NetworkUser
+
+logger = logging.getLogger(__name__)
+
+
+class FakeLibrary:
+    """In-memory catalogue and user library served by FakeSpotifyServer"""
+
+    def __init__(self, user: dict = None):
+        """
+        :param user: current user payload
+        """
+        self.user = user if user is not None else payloads.user('fakeuser', 'Fake User')
+
+        self.tracks = dict()
+        self.albums = dict()
+        self.album_tracks = dict()
+        self.artists = dict()
+        self.audio_features = dict()
+
+        self.playlists = dict()
+        self.playlist_items = dict()
+
+        self.saved_tracks = []
+        self.recently_played = []
+        self.devices = []
+        self.player = None
+
+        self.id_counter = 0
+        self.lock = threading.RLock()
+
+    def new_id(self) -> str:
+        with self.lock:
+            self.id_counter += 1
+            return payloads.spotify_id(self.id_counter + 10 ** 10)
+
+    def add_track(self, track: dict, features: dict = None):
+        """register a track with its album, artists and audio features"""
+
+        with self.lock:
+            if track['id'] in self.tracks:
+                return
+            self.tracks[track['id']] = track
+
+            album = track.get('album')
+            if album is not None:
+                self.albums.setdefault(album['id'], album)
+                self.album_tracks.setdefault(album['id'], []).append(track)
+
+                for artist in album['artists']:
+                    self.artists.setdefault(artist['id'], payloads.full_artist(artist['id'], artist['name']))
+
+            for artist in track['artists']:
+                self.artists.setdefault(artist['id'], payloads.full_artist(artist['id'], artist['name']))
+
+            self.audio_features[track['id']] = features if features is not None \
+                else payloads.audio_features(track['id'], duration_ms=track['duration_ms'])
+
+    def add_playlist(self, playlist: dict, items: List[dict] = None):
+        """register a playlist with its playlist track items"""
+
+        with self.lock:
+            items = items if items is not None else []
+            for item in items:
+                self.add_track(item['track'])
+
+            self.playlists[playlist['id']] = playlist
+            self.playlist_items[playlist['id']] = list(items)
+
+    def save_track(self, track: dict, added_at: str):
+        with self.lock:
+            self.add_track(track)
+            self.saved_tracks.append(payloads.library_track(track, added_at))
+
+    def play_track(self, track: dict, played_at: str, context: dict = None):
+        with self.lock:
+            self.add_track(track)
+            self.recently_played.append(payloads.played_track(track, played_at, context))
+
+    def playlist(self, playlist_id: str) -> Optional[dict]:
+        with self.lock:
+            playlist = self.playlists.get(playlist_id)
+            if playlist is None:
+                return None
+
+            playlist['tracks']['total'] = len(self.playlist_items[playlist_id])
+            return playlist
+
+    def update_snapshot(self, playlist_id: str) -> str:
+        with self.lock:
+            snapshot_id = self.playlists[playlist_id]['snapshot_id'] = self.new_id()
+            return snapshot_id
+
+    def playlist_track_item(self, uri: str) -> Optional[dict]:
+        track = self.tracks.get(uri.split(':')[-1])
+        if track is None:
+            return None
+
+        return payloads.playlist_track(track, datetime.now(timezone.utc).strftime('%Y-%m-%dT%H:%M:%SZ'), self.user)
+
+    @classmethod
+    def sample(cls,
+               tracks: int = 1000,
+               playlists: int = 10,
+               playlist_size: int = 100,
+               saved_tracks: int = 500,
+               recently_played: int = 50,
+               seed: int = 0,
+               **kwargs):
+        """library of generated tracks, see LibraryGenerator for the distributions
+
+        :param tracks: catalogue tracks outside of any playlist or the saved tracks
+        :param playlists: number of user playlists
+        :param playlist_size: tracks per playlist
+        :param saved_tracks: size of the saved tracks library
+        :param recently_played: length of the listening history
+        :param seed: generator seed
+        :param kwargs: generator parameters
+        """
+        library = cls()
+        generator = LibraryGenerator(seed=seed, user=library.user, **kwargs)
+
+        for track in generator.tracks(tracks):
+            library.add_track(track)
+
+        for _ in range(playlists):
+            library.add_playlist(*generator.playlist(playlist_size))
+
+        for item in reversed(generator.library_tracks(saved_tracks)):
+            library.save_track(item['track'], item['added_at'])
+
+        for item in generator.recently_played(recently_played):
+            library.play_track(item['track'], item['played_at'], item['context'])
+
+        for track in library.tracks.values():
+            library.audio_features[track['id']] = generator.audio_features(track)
+
+        return library
+
+
+class FakeSpotifyHandler(BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        self.server.fake.handle(self, 'GET')
+
+    def do_POST(self):
+        self.server.fake.handle(self, 'POST')
+
+    def do_PUT(self):
+        self.server.fake.handle(self, 'PUT')
+
+    def do_DELETE(self):
+        self.server.fake.handle(self, 'DELETE')
+
+    def log_message(self, format, *args):
+        logger.debug(format % args)
+
+
+class FakeSpotifyRequest:
+
+    def __init__(self, handler: BaseHTTPRequestHandler, method: str):
+        self.handler = handler
+        self.method = method
+
+        parts = urlsplit(handler.path)
+        self.path = parts.path
+        self.query = parse_qs(parts.query)
+        self.headers = handler.headers
+
+        length = int(handler.headers.get('Content-Length') or 0)
+        self.raw_body = handler.rfile.read(length) if length else b''
+
+    def param(self, name: str, default=None):
+        values = self.query.get(name)
+        return values[0] if values else default
+
+    def int_param(self, name: str, default: int = None, maximum: int = None) -> int:
+        value = int(self.param(name, default))
+        return min(value, maximum) if maximum is not None else value
+
+    def list_param(self, name: str) -> List[str]:
+        return [j for i in self.query.get(name, []) for j in i.split(',') if j]
+
+    @property
+    def json(self) -> dict:
+        return json.loads(self.raw_body) if self.raw_body else {}
+
+    @property
+    def form(self) -> dict:
+        return {i: j[0] for i, j in parse_qs(self.raw_body.decode('utf-8')).items()}
+
+
+def is_index(value, maximum: int) -> bool:
+    """whether a client supplied position is an integer from 0 to maximum"""
+    return isinstance(value, int) and not isinstance(value, bool) and 0 <= value <= maximum
+
+
+class FakeSpotifyServer:
+    """Local HTTP server emulating the web API endpoints used by Network
+
+    Point a network at it with api_root and token_url, network_user() creates credentials accepted by the server
+
+        with FakeSpotifyServer(FakeLibrary.sample()) as server:
+            net = Network(server.network_user())
+            net.api_root = server.api_root
+            net.token_url = server.token_url
+    """
+
+    def __init__(self,
+                 library: FakeLibrary = None,
+                 host: str = '127.0.0.1',
+                 port: int = 0,
+                 token_lifetime: float = 3600,
+                 rate_limit: int = None,
+                 rate_limit_window: float = 30,
+                 latency: float = 0):
+        """
+        :param library: catalogue and user library to serve, defaults to FakeLibrary.sample()
+        :param host: interface to bind
+        :param port: port to bind, 0 picks a free port
+        :param token_lifetime: seconds an issued access token is accepted for
+        :param rate_limit: max requests per rate_limit_window before responding 429, None for unlimited
+        :param rate_limit_window: length of the rolling rate limit window in seconds
+        :param latency: seconds added to each response
+        """
+        self.library = library if library is not None else FakeLibrary.sample()
+        self.token_lifetime = token_lifetime
+        self.rate_limit = rate_limit
+        self.rate_limit_window = rate_limit_window
+        self.latency = latency
+
+        self.client_id = 'fakeclient'
+        self.client_secret = 'fakesecret'
+        self.refresh_token = secrets.token_hex(16)
+        self.tokens = dict()
+        self.request_times = deque()
+        self.endpoint_counts = Counter()
+        self.status_counts = Counter()
+        self.lock = threading.Lock()
+
+        self.httpd = ThreadingHTTPServer((host, port), FakeSpotifyHandler)
+        self.httpd.daemon_threads = True
+        self.httpd.fake = self
+        self.thread = None
+
+        self.routes = [
+            ('GET', r'me', self.get_me),
+            ('GET', r'me/playlists', self.get_playlists),
+            ('GET', r'me/tracks', self.get_saved_tracks),
+            ('GET', r'me/player', self.get_player),
+            ('GET', r'me/player/devices', self.get_devices),
+            ('GET', r'me/player/recently-played', self.get_recently_played),
+            ('POST', r'users/([^/]+)/playlists', self.create_playlist),
+            ('GET', r'playlists/([^/]+)', self.get_playlist),
+            ('PUT', r'playlists/([^/]+)', self.change_playlist_details),
+            ('GET', r'playlists/([^/]+)/tracks', self.get_playlist_tracks),
+            ('PUT', r'playlists/([^/]+)/tracks', self.put_playlist_tracks),
+            ('POST', r'playlists/([^/]+)/tracks', self.add_playlist_tracks),
+            ('DELETE', r'playlists/([^/]+)/tracks', self.remove_playlist_tracks),
+            ('GET', r'tracks', self.batch('tracks', self.library.tracks, 50)),
+            ('GET', r'albums', self.batch('albums', self.library.albums, 50, self.full_album)),
+            ('GET', r'artists', self.batch('artists', self.library.artists, 50)),
+            ('GET', r'audio-features', self.batch('audio_features', self.library.audio_features, 100)),
+            ('GET', r'recommendations', self.get_recommendations),
+        ]
+        self.routes = [(method, re.compile(f'/v1/{pattern}'), func) for method, pattern, func in self.routes]
+
+    @property
+    def url(self) -> str:
+        host, port = self.httpd.server_address[:2]
+        return f'http://{host}:{port}/'
+
+    @property
+    def api_root(self) -> str:
+        return self.url + 'v1/'
+
+    @property
+    def token_url(self) -> str:
+        return self.url + 'api/token'
+
+    def start(self):
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        logger.info(f'serving fake api at {self.api_root}')
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+        if self.thread is not None:
+            self.thread.join()
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        self.stop()
+
+    def issue_token(self) -> str:
+        token = secrets.token_hex(16)
+        with self.lock:
+            self.tokens[token] = time.monotonic() + self.token_lifetime
+        return token
+
+    def expire_tokens(self):
+        """invalidate all issued access tokens, the next requests will be answered 401"""
+        with self.lock:
+            self.tokens.clear()
+
+    def network_user(self) -> NetworkUser:
+        """credentials with a freshly issued access token and a refresh token accepted by the server"""
+
+        user = NetworkUser(client_id=self.client_id,
+                           client_secret=self.client_secret,
+                           access_token=self.issue_token(),
+                           refresh_token=self.refresh_token)
+        user.token_expiry = self.token_lifetime
+        user.last_refreshed = datetime.utcnow()
+        return user
+
+    def handle(self, handler: BaseHTTPRequestHandler, method: str):
+        request = FakeSpotifyRequest(handler, method)
+
+        if self.latency > 0:
+            time.sleep(self.latency)
+
+        try:
+            if request.path == '/api/token':
+                status, body, headers = self.post_token(request) if method == 'POST' else (405, None, None)
+            else:
+                status, body, headers = self.route(request)
+        except (ValueError, KeyError, TypeError) as e:
+            status, body, headers = self.error(400, f'bad request: {e}')
+
+        with self.lock:
+            self.status_counts[status] += 1
+
+        data = json.dumps(body).encode('utf-8') if body is not None else b''
+
+        handler.send_response(status)
+        for name, value in (headers or {}).items():
+            handler.send_header(name, value)
+        if data:
+            handler.send_header('Content-Type', 'application/json; charset=utf-8')
+        handler.send_header('Content-Length', str(len(data)))
+        handler.end_headers()
+        handler.wfile.write(data)
+
+    def route(self, request: FakeSpotifyRequest):
+
+        authorization = request.headers.get('Authorization', '')
+        token = authorization[len('Bearer '):] if authorization.startswith('Bearer ') else None
+
+        with self.lock:
+            if token is None:
+                return self.error(401, 'No token provided')
+
+            if self.tokens.get(token, 0) < time.monotonic():
+                return self.error(401, 'The access token expired')
+
+            if self.rate_limit is not None:
+                now = time.monotonic()
+                while self.request_times and self.request_times[0] <= now - self.rate_limit_window:
+                    self.request_times.popleft()
+
+                if len(self.request_times) >= self.rate_limit:
+                    retry_after = math.ceil(self.request_times[0] + self.rate_limit_window - now)
+                    return self.error(429, 'API rate limit exceeded', {'Retry-After': str(max(retry_after, 1))})
+
+                self.request_times.append(now)
+
+        for method, pattern, func in self.routes:
+            match = pattern.fullmatch(request.path)
+            if method == request.method and match:
+                with self.lock:
+                    self.endpoint_counts[f'{method} {pattern.pattern[len("/v1/"):]}'] += 1
+                return func(request, *match.groups())
+
+        return self.error(404, 'Service not found')
+
+    @staticmethod
+    def error(status: int, message: str, headers: dict = None):
+        return status, {'error': {'status': status, 'message': message}}, headers
+
+    @staticmethod
+    def ok(body: Optional[dict], status: int = 200):
+        return status, body, None
+
+    def post_token(self, request: FakeSpotifyRequest):
+        form = request.form
+
+        if form.get('grant_type') != 'refresh_token' or form.get('refresh_token') != self.refresh_token:
+            return 400, {'error': 'invalid_grant', 'error_description': 'Invalid refresh token'}, None
+
+        return self.ok({
+            'access_token': self.issue_token(),
+            'token_type': 'Bearer',
+            'expires_in': self.token_lifetime,
+            'scope': ''
+        })
+
+    def page(self, path: str, items: list, offset: int, limit: int) -> dict:
+        href = self.url.rstrip('/') + path
+
+        following = None
+        if offset + limit < len(items):
+            following = f'{href}?offset={offset + limit}&limit={limit}'
+
+        previous = None
+        if offset > 0:
+            previous = f'{href}?offset={max(offset - limit, 0)}&limit={limit}'
+
+        return payloads.page(items=items[offset:offset + limit], href=f'{href}?offset={offset}&limit={limit}',
+                             offset=offset, limit=limit, total=len(items), next=following, previous=previous)
+
+    def get_me(self, request):
+        return self.ok({**self.library.user, 'country': 'GB', 'email': None, 'product': 'premium'})
+
+    def get_playlists(self, request):
+        with self.library.lock:
+            playlists = [self.library.playlist(i) for i in self.library.playlists]
+        return self.ok(self.page(request.path, playlists, request.int_param('offset', 0),
+                                 request.int_param('limit', 20, 50)))
+
+    def get_saved_tracks(self, request):
+        with self.library.lock:
+            items = list(reversed(self.library.saved_tracks))
+        return self.ok(self.page(request.path, items, request.int_param('offset', 0),
+                                 request.int_param('limit', 20, 50)))
+
+    def get_player(self, request):
+        if self.library.player is None:
+            return self.ok(None, 204)
+        return self.ok(self.library.player)
+
+    def get_devices(self, request):
+        return self.ok({'devices': self.library.devices})
+
+    def get_recently_played(self, request):
+        limit = request.int_param('limit', 20, 50)
+        before = request.param('before')
+        after = request.param('after')
+
+        def played_ms(item):
+            played_at = datetime.strptime(item['played_at'], '%Y-%m-%dT%H:%M:%S%z')
+            return int(played_at.timestamp() * 1000)
+
+        with self.library.lock:
+            items = sorted(self.library.recently_played, key=played_ms, reverse=True)
+
+        if before is not None:
+            items = [i for i in items if played_ms(i) < int(before)]
+        if after is not None:
+            items = [i for i in items if played_ms(i) > int(after)]
+
+        href = self.url.rstrip('/') + request.path
+        following = None
+        if len(items) > limit:
+            following = f'{href}?before={played_ms(items[limit - 1])}&limit={limit}'
+
+        page = items[:limit]
+        return self.ok({
+            'cursors': {'after': str(played_ms(page[0])), 'before': str(played_ms(page[-1]))} if page else None,
+            'href': f'{href}?limit={limit}',
+            'items': page,
+            'limit': limit,
+            'next': following,
+            'previous': None,
+            'total': len(items)
+        })
+
+    def create_playlist(self, request, username):
+        body = request.json
+
+        with self.library.lock:
+            playlist = payloads.playlist(self.library.new_id(), body.get('name', 'New Playlist'), self.library.user,
+                                         snapshot_id=self.library.new_id(), total=0,
+                                         description=body.get('description') or '',
+                                         public=body.get('public', True),
+                                         collaborative=body.get('collaborative', False))
+            self.library.add_playlist(playlist)
+
+        return self.ok({**playlist, 'followers': {'href': None, 'total': 0},
+                        'tracks': payloads.page([], playlist['tracks']['href'], 0, 100, 0)}, 201)
+
+    def get_playlist(self, request, playlist_id):
+        with self.library.lock:
+            playlist = self.library.playlist(playlist_id)
+            if playlist is None:
+                return self.error(404, 'Not found.')
+
+            if request.param('fields') == 'snapshot_id':
+                return self.ok({'snapshot_id': playlist['snapshot_id']})
+
+            items = list(self.library.playlist_items[playlist_id])
+
+        return self.ok({**playlist, 'followers': {'href': None, 'total': 0},
+                        'tracks': self.page(f'{request.path}/tracks', items, 0, 100)})
+
+    def change_playlist_details(self, request, playlist_id):
+        with self.library.lock:
+            playlist = self.library.playlist(playlist_id)
+            if playlist is None:
+                return self.error(404, 'Not found.')
+
+            playlist.update({i: j for i, j in request.json.items()
+                             if i in ('name', 'description', 'public', 'collaborative')})
+
+        return self.ok(None)
+
+    def get_playlist_tracks(self, request, playlist_id):
+        with self.library.lock:
+            if playlist_id not in self.library.playlists:
+                return self.error(404, 'Not found.')
+            items = list(self.library.playlist_items[playlist_id])
+
+        return self.ok(self.page(request.path, items, request.int_param('offset', 0),
+                                 request.int_param('limit', 100, 100)))
+
+    def put_playlist_tracks(self, request, playlist_id):
+        body = request.json
+
+        with self.library.lock:
+            if playlist_id not in self.library.playlists:
+                return self.error(404, 'Not found.')
+            items = self.library.playlist_items[playlist_id]
+
+            if 'range_start' in body:
+                if not self.snapshot_current(playlist_id, body):
+                    return self.error(400, 'Snapshot out of date')
+
+                start, length = body['range_start'], body.get('range_length', 1)
+                insert_before = body.get('insert_before')
+                if not (is_index(start, len(items) - 1) and is_index(length, len(items)) and length > 0
+                        and is_index(insert_before, len(items))) or start + length > len(items):
+                    return self.error(400, 'Index out of bounds')
+
+                moved = items[start:start + length]
+                if start < insert_before:
+                    insert_before -= length
+                del items[start:start + length]
+                items[insert_before:insert_before] = moved
+
+            else:
+                uris = body.get('uris', [])
+                if len(uris) > 100:
+                    return self.error(400, 'You can add a maximum of 100 tracks per request.')
+
+                new_items = [self.library.playlist_track_item(i) for i in uris]
+                if None in new_items:
+                    return self.error(400, 'Invalid track uri')
+                items[:] = new_items
+
+            return self.ok({'snapshot_id': self.library.update_snapshot(playlist_id)})
+
+    def add_playlist_tracks(self, request, playlist_id):
+        body = request.json
+
+        with self.library.lock:
+            if playlist_id not in self.library.playlists:
+                return self.error(404, 'Not found.')
+            items = self.library.playlist_items[playlist_id]
+
+            uris = body.get('uris', [])
+            if len(uris) > 100:
+                return self.error(400, 'You can add a maximum of 100 tracks per request.')
+
+            new_items = [self.library.playlist_track_item(i) for i in uris]
+            if None in new_items:
+                return self.error(400, 'Invalid track uri')
+
+            position = body.get('position', len(items))
+            if not is_index(position, len(items)):
+                return self.error(400, 'Index out of bounds')
+            items[position:position] = new_items
+
+            return self.ok({'snapshot_id': self.library.update_snapshot(playlist_id)}, 201)
+
+    def remove_playlist_tracks(self, request, playlist_id):
+        body = request.json
+
+        with self.library.lock:
+            if playlist_id not in self.library.playlists:
+                return self.error(404, 'Not found.')
+            items = self.library.playlist_items[playlist_id]
+
+            if not self.snapshot_current(playlist_id, body):
+                return self.error(400, 'Snapshot out of date')
+
+            tracks = body.get('tracks', [])
+            if len(tracks) > 100:
+                return self.error(400, 'You can remove a maximum of 100 tracks per request.')
+
+            if any(not is_index(i, len(items) - 1) for track in tracks for i in track.get('positions', [])):
+                return self.error(400, 'Index out of bounds')
+
+            remove_positions = set()
+            for track in tracks:
+                if 'positions' in track:
+                    remove_positions.update(i for i in track['positions'] if items[i]['track']['uri'] == track['uri'])
+                else:
+                    remove_positions.update(index for index, item in enumerate(items)
+                                            if item['track']['uri'] == track['uri'])
+
+            items[:] = [item for index, item in enumerate(items) if index not in remove_positions]
+
+            return self.ok({'snapshot_id': self.library.update_snapshot(playlist_id)})
+
+    def snapshot_current(self, playlist_id: str, body: dict) -> bool:
+        """whether a positional edit refers to the current snapshot, the service rebases edits made against older
+        snapshots where it can which is not modelled so they are rejected"""
+        return body.get('snapshot_id') in (None, self.library.playlists[playlist_id]['snapshot_id'])
+
+    def full_album(self, album: dict) -> dict:
+        return payloads.full_album(album, self.library.album_tracks.get(album['id'], []))
+
+    def batch(self, key: str, source: dict, max_ids: int, transform=None):
+
+        def get_batch(request):
+            ids = request.list_param('ids')
+            if len(ids) > max_ids:
+                return self.error(400, 'Too many ids requested')
+
+            with self.library.lock:
+                items = [source.get(i) for i in ids]
+
+            if transform is not None:
+                items = [transform(i) if i is not None else None for i in items]
+
+            return self.ok({key: items})
+
+        return get_batch
+
+    def get_recommendations(self, request):
+        limit = request.int_param('limit', 20, 100)
+        seeds = request.list_param('seed_tracks') + request.list_param('seed_artists')
+
+        if not seeds:
+            return self.error(400, 'No seeds provided')
+
+        with self.library.lock:
+            catalogue = list(self.library.tracks.values())
+
+        tracks = random.Random(','.join(sorted(seeds))).sample(catalogue, min(limit, len(catalogue)))
+
+        return self.ok({
+            'seeds': [{'afterFilteringSize': len(catalogue), 'afterRelinkingSize': len(catalogue),
+                       'href': None, 'id': i, 'initialPoolSize': len(catalogue),
+                       'type': 'TRACK' if i in self.library.tracks else 'ARTIST'} for i in seeds],
+            'tracks': tracks
+        })
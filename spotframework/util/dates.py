@@ -0,0 +1,40 @@
+import functools
+from datetime import datetime
+
+
+def parse_timestamp(value: str) -> datetime:
+    """parse a service timestamp, eg 2020-01-01T12:00:00Z, as datetime.strptime(value, '%Y-%m-%dT%H:%M:%S%z')
+    would, fractional seconds are also accepted"""
+
+    if value.endswith('Z'):
+        value = value[:-1] + '+00:00'
+
+    try:
+        return datetime.fromisoformat(value)
+    except ValueError:
+        return datetime.strptime(value, '%Y-%m-%dT%H:%M:%S%z')
+
+
+release_date_formats = {'year': '%Y', 'month': '%Y-%m', 'day': '%Y-%m-%d'}
+
+
+@functools.lru_cache(maxsize=8192)
+def parse_release_date(value: str, precision: str) -> datetime:
+    """parse a release date of year, month or day precision as datetime.strptime would, cached as albums repeat
+    across tracks
+
+    :raises ValueError: when value does not match the precision or precision is unknown
+    """
+
+    if precision == 'day' and len(value) == 10 and value[4] == '-' and value[7] == '-' \
+            and (value[:4] + value[5:7] + value[8:]).isdigit():
+        return datetime(int(value[:4]), int(value[5:7]), int(value[8:10]))
+    if precision == 'month' and len(value) == 7 and value[4] == '-' and (value[:4] + value[5:]).isdigit():
+        return datetime(int(value[:4]), int(value[5:7]), 1)
+    if precision == 'year' and len(value) == 4 and value.isdigit():
+        return datetime(int(value), 1, 1)
+
+    if precision not in release_date_formats:
+        raise ValueError(f'invalid release date precision {precision}')
+
+    return datetime.strptime(value, release_date_formats[precision])
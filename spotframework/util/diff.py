@@ -0,0 +1,274 @@
+import bisect
+import hashlib
+from collections import Counter, defaultdict
+from dataclasses import dataclass
+from typing import List, Hashable, Sequence, Union
+
+
+@dataclass
+class Remove:
+    """remove items at positions, descending so earlier positions are unaffected"""
+    positions: List[int]
+    uris: List[str]
+
+
+@dataclass
+class Insert:
+    """insert uris before position"""
+    position: int
+    uris: List[str]
+
+
+@dataclass
+class Move:
+    """move range_length items from range_start to before insert_before, positions before the move"""
+    range_start: int
+    range_length: int
+    insert_before: int
+
+
+Change = Union[Remove, Insert, Move]
+
+
+def fingerprint(uris: Sequence) -> str:
+    """digest of an ordered list of uris for detecting an unchanged playlist without fetching it"""
+    return hashlib.sha1('\n'.join(str(i) for i in uris).encode()).hexdigest()
+
+
+def replace_cost(count: int, chunk_size: int = 100) -> int:
+    """calls needed to wipe a playlist and write count items"""
+    return max(1, -(-count // chunk_size))
+
+
+def plan_changes(current: Sequence[Hashable], target: Sequence[Hashable], chunk_size: int = 100) -> List[Change]:
+    """changes turning current into target, applied in order
+
+    Surplus occurrences are removed from the end of current, kept items are then reordered with range moves and
+    missing items are finally inserted at their target positions.
+
+    :param current: items currently in the playlist
+    :param target: items to be written
+    :param chunk_size: max items per removal or insertion
+    :return: list of changes, empty if current equals target
+    """
+
+    current, target = list(current), list(target)
+    if current == target:
+        return []
+
+    current_counts, target_counts = Counter(current), Counter(target)
+    changes = []
+
+    # surplus occurrences, latest first
+    surplus = current_counts - target_counts
+    removals = []
+    for index in range(len(current) - 1, -1, -1):
+        if surplus[current[index]] > 0:
+            surplus[current[index]] -= 1
+            removals.append(index)
+
+    for chunk in chunks(removals, chunk_size):
+        changes.append(Remove(positions=chunk, uris=[current[i] for i in chunk]))
+
+    removed = set(removals)
+    remaining = [j for i, j in enumerate(current) if i not in removed]
+
+    # missing occurrences, latest first
+    missing = target_counts - current_counts
+    inserted = set()
+    for index in range(len(target) - 1, -1, -1):
+        if missing[target[index]] > 0:
+            missing[target[index]] -= 1
+            inserted.add(index)
+
+    desired = [j for i, j in enumerate(target) if i not in inserted]
+    changes += plan_moves(remaining, desired)
+
+    run = []
+    for index in sorted(inserted):
+        if run and (index != run[-1] + 1 or len(run) == chunk_size):
+            changes.append(Insert(position=run[0], uris=[target[i] for i in run]))
+            run = []
+        run.append(index)
+    if run:
+        changes.append(Insert(position=run[0], uris=[target[i] for i in run]))
+
+    return changes
+
+
+def plan_moves(current: Sequence[Hashable], target: Sequence[Hashable], max_candidates: int = 16) -> List[Move]:
+    """range moves reordering current into target, both holding the same items
+
+    Repeated items are matched to target positions along a longest common subsequence so duplicates stay in place.
+    Items repeated more than max_candidates times are instead handed their target positions in order, keeping the
+    candidates linear in the number of items.
+    """
+
+    positions = defaultdict(list)
+    for index, item in enumerate(target):
+        positions[item].append(index)
+
+    # candidate target positions of each current item, descending so at most one per item is increasing
+    candidates = []
+    seen = Counter()
+    for index, item in enumerate(current):
+        if len(positions[item]) > max_candidates:
+            candidates.append((index, positions[item][seen[item]]))
+        else:
+            candidates += [(index, position) for position in reversed(positions[item])]
+        seen[item] += 1
+
+    matched = {candidates[i][0]: candidates[i][1]
+               for i in longest_increasing_subsequence([j for _, j in candidates])}
+
+    taken = set(matched.values())
+    free = defaultdict(int)
+    order = []
+    for index, item in enumerate(current):
+        if index in matched:
+            order.append(matched[index])
+            continue
+
+        while positions[item][free[item]] in taken:
+            free[item] += 1
+        order.append(positions[item][free[item]])
+        free[item] += 1
+
+    return plan_sort(order)
+
+
+def plan_sort(order: Sequence[int]) -> List[Move]:
+    """range moves sorting a list whose items belong at positions order
+
+    The longest increasing subsequence of order stays in place, the remaining items are moved in runs which are
+    adjacent and consecutive in order, each placed after its predecessor.
+
+    :param order: target position of each current item, a permutation of range(len(order))
+    :return: list of moves applied in order
+    """
+
+    keep = set(order[i] for i in longest_increasing_subsequence(order))
+
+    blocks = []
+    index = 0
+    while index < len(order):
+        if order[index] in keep:
+            index += 1
+            continue
+
+        end = index + 1
+        while end < len(order) and order[end] not in keep and order[end] == order[end - 1] + 1:
+            end += 1
+
+        blocks.append((order[index], end - index))
+        index = end
+
+    positions = [0] * len(order)
+    for index, value in enumerate(order):
+        positions[value] = index
+
+    # runs are placed in ascending order, so a placed item directly follows the placed items between it and the
+    # nearest kept item below it. The order of items at every step is then that of their keys, the original position
+    # for unplaced items or the original position of that kept item followed by the value for placed ones
+    anchors = [-1] * len(order)
+    anchor = -1
+    for value in range(len(order)):
+        if value in keep:
+            anchor = positions[value]
+        anchors[value] = anchor
+
+    keys = [(i, -1) for i in positions]
+    slots = {j: i for i, j in enumerate(sorted(set(keys) | {(anchors[i], i) for i in range(len(order))
+                                                            if i not in keep}))}
+    counts = FenwickTree(len(slots))
+    for key in keys:
+        counts.add(slots[key], 1)
+
+    moves = []
+    for first, length in sorted(blocks):
+        start = counts.prefix_sum(slots[keys[first]])
+        insert_before = counts.prefix_sum(slots[keys[first - 1]]) + 1 if first > 0 else 0
+
+        if start != insert_before:
+            moves.append(Move(range_start=start, range_length=length, insert_before=insert_before))
+
+        for value in range(first, first + length):
+            counts.add(slots[keys[value]], -1)
+            keys[value] = (anchors[value], value)
+            counts.add(slots[keys[value]], 1)
+
+    return moves
+
+
+class FenwickTree:
+    """counts by index with logarithmic updates and prefix sums"""
+
+    def __init__(self, size: int):
+        self.tree = [0] * (size + 1)
+
+    def add(self, index: int, amount: int):
+        index += 1
+        while index < len(self.tree):
+            self.tree[index] += amount
+            index += index & -index
+
+    def prefix_sum(self, index: int) -> int:
+        """sum of counts before index"""
+        total = 0
+        while index > 0:
+            total += self.tree[index]
+            index -= index & -index
+        return total
+
+
+def longest_increasing_subsequence(values: Sequence) -> List[int]:
+    """indices of a longest strictly increasing subsequence of values"""
+
+    tails = []
+    tail_indices = []
+    previous = [None] * len(values)
+
+    for index, value in enumerate(values):
+        position = bisect.bisect_left(tails, value)
+        if position > 0:
+            previous[index] = tail_indices[position - 1]
+
+        if position == len(tails):
+            tails.append(value)
+            tail_indices.append(index)
+        else:
+            tails[position] = value
+            tail_indices[position] = index
+
+    indices = []
+    index = tail_indices[-1] if tail_indices else None
+    while index is not None:
+        indices.append(index)
+        index = previous[index]
+
+    return indices[::-1]
+
+
+def apply_changes(items: Sequence, changes: List[Change]) -> list:
+    """apply changes to a copy of items as the service would"""
+
+    items = list(items)
+    for change in changes:
+        if isinstance(change, Remove):
+            for position in sorted(change.positions, reverse=True):
+                del items[position]
+        elif isinstance(change, Insert):
+            items[change.position:change.position] = change.uris
+        elif isinstance(change, Move):
+            moved = items[change.range_start:change.range_start + change.range_length]
+            insert_before = change.insert_before
+            if change.range_start < insert_before:
+                insert_before -= change.range_length
+            del items[change.range_start:change.range_start + change.range_length]
+            items[insert_before:insert_before] = moved
+
+    return items
+
+
+def chunks(items: list, size: int) -> List[list]:
+    return [items[i:i + size] for i in range(0, len(items), size)]
@@ -0,0 +1,84 @@
+import unittest
+
+from spotframework.net.asyncnetwork import AsyncNetwork, aiohttp
+from spotframework.net.ratelimit import RateLimiter
+from spotframework.model.uri import Uri
+from spotframework.testing.server import FakeSpotifyServer, FakeLibrary
+
+
+def create_network(server):
+    net = AsyncNetwork(server.network_user(), rate_limiter=RateLimiter(rate=1000, capacity=1000))
+    net.api_root = server.api_root
+    net.token_url = server.token_url
+    return net
+
+
+@unittest.skipIf(aiohttp is None, 'aiohttp not installed')
+class TestAsyncNetwork(unittest.IsolatedAsyncioTestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeSpotifyServer(FakeLibrary.sample(tracks=300, playlists=60, playlist_size=130,
+                                                          saved_tracks=120, recently_played=30)).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    async def asyncSetUp(self):
+        self.net = create_network(self.server)
+
+    async def asyncTearDown(self):
+        await self.net.close()
+
+    async def test_playlists_paged(self):
+        playlists = await self.net.playlists()
+
+        self.assertEqual(len(playlists), 60)
+        self.assertEqual(len({i.id for i in playlists}), 60)
+
+    async def test_playlist_tracks_paged(self):
+        playlist = (await self.net.playlists())[0]
+
+        self.assertEqual(len(await self.net.playlist_tracks(uri=playlist.uri)), 130)
+        self.assertEqual(len([i async for i in self.net.iter_playlist_tracks(uri=playlist.uri)]), 130)
+
+    async def test_saved_tracks(self):
+        self.assertEqual(len(await self.net.saved_tracks()), 120)
+
+    async def test_batch_lookups(self):
+        uris = [i.track.uri for i in await self.net.saved_tracks(response_limit=60)]
+
+        tracks = await self.net.tracks(uris=uris)
+        self.assertEqual([i.uri for i in tracks], uris)
+        self.assertEqual(len(await self.net.artists(uris=[i.artists[0].uri for i in tracks])), 60)
+
+    async def test_populate_audio_features(self):
+        tracks = [i.track for i in await self.net.saved_tracks(response_limit=5)]
+
+        await self.net.populate_track_audio_features(tracks)
+        await self.net.populate_track_audio_features(tracks[0])
+
+        self.assertTrue(all(i.audio_features is not None for i in tracks))
+
+    async def test_batch_unknown_ids_skipped(self):
+        uris = [i.track.uri for i in await self.net.saved_tracks(response_limit=3)]
+        unknown = Uri('spotify:track:' + '0' * 22)
+
+        tracks = await self.net.tracks(uris=uris[:1] + [unknown] + uris[1:])
+        self.assertEqual([i.uri for i in tracks], uris)
+
+    async def test_playlist_writes(self):
+        playlist = (await self.net.playlists())[1]
+        uris = [i.track.uri for i in await self.net.saved_tracks()]
+
+        self.assertEqual(len(await self.net.replace_playlist_tracks(uri=playlist.uri, uris=uris[:50])), 1)
+        self.assertEqual(len(await self.net.replace_playlist_tracks(uri=playlist.uri, uris=uris)), 2)
+        await self.net.reorder_playlist_tracks(uri=playlist.uri, range_start=0, range_length=2, insert_before=5)
+
+        tracks = [i.track.uri for i in await self.net.playlist_tracks(uri=playlist.uri)]
+        self.assertEqual(tracks, uris[2:5] + uris[:2] + uris[5:])
+
+
+if __name__ == '__main__':
+    unittest.main()
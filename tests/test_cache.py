@@ -0,0 +1,305 @@
+import unittest
+from unittest.mock import Mock, patch
+import tempfile
+
+from spotframework.net.cache import ResponseCache, PlaylistTrackCache, EntityCache
+from spotframework.net.network import Network
+from spotframework.net.ratelimit import RateLimiter
+from spotframework.net.user import NetworkUser
+from spotframework.testing.server import FakeSpotifyServer, FakeLibrary
+
+
+def create_response(status_code=200, json=None, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = json
+    response.headers = headers or {}
+    return response
+
+
+class TestResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_put_get(self):
+        cache = ResponseCache(self.directory.name)
+        key = cache.key('https://api.spotify.com/v1/albums/test', {'limit': 50})
+
+        cache.put(key, 'https://api.spotify.com/v1/albums/test', 'etag', {'name': 'album'})
+
+        entry = cache.get(key)
+        self.assertEqual(entry.etag, 'etag')
+        self.assertEqual(entry.body, {'name': 'album'})
+
+    def test_persisted_between_instances(self):
+        cache = ResponseCache(self.directory.name)
+        key = cache.key('https://api.spotify.com/v1/albums/test')
+        cache.put(key, 'https://api.spotify.com/v1/albums/test', 'etag', {'name': 'album'})
+
+        self.assertEqual(ResponseCache(self.directory.name).get(key).body, {'name': 'album'})
+
+    def test_key_independent_of_param_order(self):
+        self.assertEqual(ResponseCache.key('url', {'a': 1, 'b': 2}), ResponseCache.key('url', {'b': 2, 'a': 1}))
+        self.assertNotEqual(ResponseCache.key('url', {'a': 1}), ResponseCache.key('url', {'a': 2}))
+
+    def test_no_etag_no_ttl_not_stored(self):
+        cache = ResponseCache(self.directory.name)
+        cache.put('key', 'https://api.spotify.com/v1/me/player', None, {})
+
+        self.assertIsNone(cache.get('key'))
+
+    def test_least_recently_used_evicted(self):
+        cache = ResponseCache(self.directory.name, max_size=300)
+
+        for key in ['first', 'second', 'third']:
+            cache.put(key, 'url', 'etag', {'data': 'x' * 50})
+            cache.get('first')
+
+        self.assertIsNotNone(cache.get('first'))
+        self.assertIsNone(cache.get('second'))
+        self.assertLessEqual(cache.size, 300)
+
+    def test_ttl_overrides(self):
+        cache = ResponseCache(self.directory.name, ttl=0, ttl_overrides={'albums': 100, 'albums/live': 0})
+
+        self.assertEqual(cache.ttl_for('https://api.spotify.com/v1/albums/test'), 100)
+        self.assertEqual(cache.ttl_for('https://api.spotify.com/v1/albums/live'), 0)
+        self.assertEqual(cache.ttl_for('https://api.spotify.com/v1/tracks/test'), 0)
+
+
+class TestNetworkResponseCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.net = Network(NetworkUser(client_id='id', client_secret='secret', access_token='token'),
+                           rate_limiter=RateLimiter(rate=1000, capacity=1000),
+                           response_cache=ResponseCache(self.directory.name))
+        self.net.transport = Mock()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_not_modified_served_from_cache(self):
+        self.net.transport.request.side_effect = [
+            create_response(json={'name': 'album'}, headers={'ETag': 'etag'}),
+            create_response(status_code=304)
+        ]
+
+        self.assertEqual(self.net.get_request('albums/test'), {'name': 'album'})
+        self.assertEqual(self.net.get_request('albums/test'), {'name': 'album'})
+
+        self.assertEqual(self.net.transport.request.call_args.kwargs['headers']['If-None-Match'], 'etag')
+
+    def test_fresh_entry_skips_request(self):
+        self.net.response_cache.ttl_overrides = {'albums': 100}
+        self.net.transport.request.return_value = create_response(json={'name': 'album'}, headers={'ETag': 'etag'})
+
+        self.net.get_request('albums/test')
+        self.net.get_request('albums/test')
+
+        self.net.transport.request.assert_called_once()
+
+    def test_ttl_overrides_with_custom_root(self):
+        self.net.api_root = 'http://localhost:8080/v1/'
+        self.net.response_cache.ttl_overrides = {'albums': 100}
+        self.net.transport.request.return_value = create_response(json={'name': 'album'})
+
+        self.net.get_request('albums/test')
+        self.net.get_request('albums/test')
+
+        self.net.transport.request.assert_called_once()
+
+    def test_not_shared_between_users(self):
+        self.net.response_cache.ttl_overrides = {'me': 100}
+        self.net.transport.request.return_value = create_response(json={'id': 'first'}, headers={'ETag': 'etag'})
+        self.net.get_request('me/tracks')
+
+        other = Network(NetworkUser(client_id='id', client_secret='secret', access_token='other token'),
+                        rate_limiter=RateLimiter(rate=1000, capacity=1000),
+                        response_cache=ResponseCache(self.directory.name, ttl_overrides={'me': 100}))
+        other.transport = Mock()
+        other.transport.request.return_value = create_response(json={'id': 'second'})
+
+        self.assertEqual(other.get_request('me/tracks'), {'id': 'second'})
+        other.transport.request.assert_called_once()
+
+
+def create_playlist_track_item(track_id):
+    return {
+        'added_at': '2020-01-01T12:00:00Z',
+        'added_by': None,
+        'is_local': False,
+        'primary_color': None,
+        'video_thumbnail': {},
+        'track': {
+            'artists': [], 'available_markets': [], 'disc_number': 1, 'duration_ms': 1000, 'external_urls': {},
+            'explicit': False, 'href': '', 'id': track_id, 'name': track_id, 'track_number': 1, 'type': 'track',
+            'uri': f'spotify:track:{track_id}', 'is_local': False
+        }
+    }
+
+
+class TestPlaylistTrackCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_get_matching_snapshot(self):
+        cache = PlaylistTrackCache(self.directory.name)
+        cache.put('playlist', 'snapshot', [{'track': 1}])
+
+        self.assertEqual(cache.get('playlist', 'snapshot'), [{'track': 1}])
+
+    def test_changed_snapshot_missed(self):
+        cache = PlaylistTrackCache(self.directory.name)
+        cache.put('playlist', 'snapshot', [{'track': 1}])
+
+        self.assertIsNone(cache.get('playlist', 'new snapshot'))
+        self.assertIsNone(cache.get('other playlist', 'snapshot'))
+
+
+class TestNetworkPlaylistTrackCache(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.net = Network(NetworkUser(client_id='id', client_secret='secret', access_token='token'),
+                           rate_limiter=RateLimiter(rate=1000, capacity=1000),
+                           playlist_track_cache=PlaylistTrackCache(self.directory.name))
+        self.net.transport = Mock()
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_unchanged_snapshot_makes_no_requests(self):
+        self.net.playlist_track_cache.put('test', 'snapshot', [create_playlist_track_item('one'),
+                                                               create_playlist_track_item('two')])
+
+        tracks = self.net.playlist_tracks(uri='spotify:playlist:test', snapshot_id='snapshot')
+
+        self.assertEqual([i.track.name for i in tracks], ['one', 'two'])
+        self.net.transport.request.assert_not_called()
+
+    def test_tracks_cached_after_paging(self):
+        self.net.transport.request.return_value = create_response(json={
+            'href': '', 'items': [create_playlist_track_item('one')], 'limit': 50, 'next': None, 'previous': None,
+            'total': 1, 'offset': 0
+        })
+
+        self.net.playlist_tracks(uri='spotify:playlist:test', snapshot_id='snapshot')
+        self.net.playlist_tracks(uri='spotify:playlist:test', snapshot_id='snapshot')
+
+        self.net.transport.request.assert_called_once()
+
+    def test_write_invalidates(self):
+        self.net.playlist_track_cache.put('test', 'snapshot', [create_playlist_track_item('one')])
+        self.net.transport.request.return_value = create_response(json={'snapshot_id': 'new snapshot'})
+
+        self.net.add_playlist_tracks(uri='spotify:playlist:test', uris=['spotify:track:two'])
+
+        self.assertIsNone(self.net.playlist_track_cache.get('test', 'snapshot'))
+
+
+class TestPlaylistTrackCacheSharedPlaylist(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.server = FakeSpotifyServer(FakeLibrary.sample(tracks=60, playlists=1, playlist_size=30)).start()
+
+    def tearDown(self):
+        self.server.stop()
+        self.directory.cleanup()
+
+    def create_network(self, **kwargs):
+        net = Network(self.server.network_user(), rate_limiter=RateLimiter(rate=1000, capacity=1000), **kwargs)
+        net.api_root = self.server.api_root
+        net.token_url = self.server.token_url
+        return net
+
+    def test_changed_by_other_client(self):
+        net = self.create_network(playlist_track_cache=PlaylistTrackCache(self.directory.name))
+        other = self.create_network()
+
+        playlist = net.playlists()[0]
+        self.assertEqual(len(net.playlist_tracks(uri=playlist.uri)), 30)
+        self.assertEqual(len(net.playlist_tracks(uri=playlist.uri)), 30)
+
+        extra = [i.track.uri for i in other.playlist_tracks(uri=playlist.uri)[:5]]
+        other.add_playlist_tracks(uri=playlist.uri, uris=extra)
+
+        self.assertEqual(len(net.playlist_tracks(uri=playlist.uri)), 35)
+
+
+def create_track_item(track_id):
+    return create_playlist_track_item(track_id)['track']
+
+
+class TestEntityCache(unittest.TestCase):
+
+    def test_least_recently_used_evicted(self):
+        cache = EntityCache(max_size=2)
+        cache.put('first', 1)
+        cache.put('second', 2)
+        cache.get('first')
+        cache.put('third', 3)
+
+        self.assertEqual(cache.get('first'), 1)
+        self.assertIsNone(cache.get('second'))
+        self.assertEqual(len(cache), 2)
+
+    def test_expired_entries_missed(self):
+        cache = EntityCache(ttl=10)
+
+        with patch('spotframework.net.cache.time.monotonic', return_value=100):
+            cache.put('key', 1)
+        with patch('spotframework.net.cache.time.monotonic', return_value=105):
+            self.assertEqual(cache.get('key'), 1)
+        with patch('spotframework.net.cache.time.monotonic', return_value=111):
+            self.assertIsNone(cache.get('key'))
+
+
+class TestNetworkEntityCache(unittest.TestCase):
+
+    def setUp(self):
+        self.net = Network(NetworkUser(client_id='id', client_secret='secret', access_token='token'),
+                           rate_limiter=RateLimiter(rate=1000, capacity=1000),
+                           entity_cache=EntityCache())
+        self.net.transport = Mock()
+
+    def test_only_misses_requested(self):
+        self.net.transport.request.side_effect = [
+            create_response(json={'tracks': [create_track_item('one')]}),
+            create_response(json={'tracks': [create_track_item('two'), create_track_item('three')]})
+        ]
+
+        self.net.track(uri='spotify:track:one')
+        tracks = self.net.tracks(uris=['spotify:track:two', 'spotify:track:one', 'spotify:track:three'])
+
+        self.assertEqual([i.name for i in tracks], ['two', 'one', 'three'])
+        self.assertEqual(self.net.transport.request.call_args.kwargs['params']['ids'], 'two,three')
+
+    def test_single_lookup_cache_hit(self):
+        self.net.transport.request.return_value = create_response(json={'tracks': [create_track_item('one')]})
+
+        first = self.net.track(uri='spotify:track:one')
+        second = self.net.track(uri='spotify:track:one')
+
+        self.assertIs(first, second)
+        self.net.transport.request.assert_called_once()
+
+    def test_not_found_skipped(self):
+        self.net.transport.request.return_value = create_response(json={'tracks': [create_track_item('one'), None]})
+
+        tracks = self.net.tracks(uris=['spotify:track:one', 'spotify:track:missing'])
+
+        self.assertEqual([i.name for i in tracks], ['one'])
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,44 @@
+import unittest
+
+from datetime import datetime
+
+from spotframework.util.dates import parse_timestamp, parse_release_date
+
+
+class TestParseTimestamp(unittest.TestCase):
+
+    def test_matches_strptime(self):
+        for value in ['2020-01-02T03:04:05Z', '2019-12-31T23:59:59+01:00', '2016-02-29T00:00:00-05:30']:
+            expected = datetime.strptime(value, '%Y-%m-%dT%H:%M:%S%z')
+
+            self.assertEqual(parse_timestamp(value), expected)
+            self.assertEqual(parse_timestamp(value).utcoffset(), expected.utcoffset())
+
+    def test_fractional_seconds(self):
+        self.assertEqual(parse_timestamp('2020-01-02T03:04:05.250Z').microsecond, 250000)
+
+    def test_invalid(self):
+        with self.assertRaises(ValueError):
+            parse_timestamp('yesterday')
+
+
+class TestParseReleaseDate(unittest.TestCase):
+
+    def test_matches_strptime(self):
+        for value, precision, date_format in [('1999', 'year', '%Y'),
+                                              ('1999-03', 'month', '%Y-%m'),
+                                              ('1999-03-04', 'day', '%Y-%m-%d'),
+                                              ('1999-3', 'month', '%Y-%m')]:
+            self.assertEqual(parse_release_date(value, precision), datetime.strptime(value, date_format))
+
+    def test_invalid(self):
+        for value, precision in [('0000', 'year'), ('1999-13', 'month'), ('1999', 'day'), ('1999', 'decade')]:
+            with self.assertRaises(ValueError):
+                parse_release_date(value, precision)
+
+    def test_cached(self):
+        self.assertIs(parse_release_date('2001-05-06', 'day'), parse_release_date('2001-05-06', 'day'))
+
+
+if __name__ == '__main__':
+    unittest.main()
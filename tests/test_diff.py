@@ -0,0 +1,179 @@
+import unittest
+import random
+
+from spotframework.engine.playlistengine import PlaylistEngine
+from spotframework.net.network import SpotifyNetworkException
+from spotframework.util.diff import Remove, Insert, Move, fingerprint, plan_changes, plan_moves, plan_sort, \
+    apply_changes
+from spotframework.testing.server import FakeSpotifyServer, FakeLibrary
+
+from tests.test_server import create_network
+
+
+class TestPlanChanges(unittest.TestCase):
+
+    def test_unchanged(self):
+        self.assertEqual(plan_changes(['a', 'b', 'c'], ['a', 'b', 'c']), [])
+
+    def test_single_changes(self):
+        self.assertEqual(plan_changes(['a', 'b', 'c'], ['a', 'c']), [Remove(positions=[1], uris=['b'])])
+        self.assertEqual(plan_changes(['a', 'c'], ['a', 'b', 'c']), [Insert(position=1, uris=['b'])])
+        self.assertEqual(plan_changes(['a', 'b', 'c', 'd'], ['c', 'd', 'a', 'b']),
+                         [Move(range_start=0, range_length=2, insert_before=4)])
+
+    def test_duplicates(self):
+        current, target = ['a', 'b', 'a', 'a'], ['b', 'a', 'c', 'b']
+
+        self.assertEqual(apply_changes(current, plan_changes(current, target)), target)
+
+    def test_chunked(self):
+        changes = plan_changes([], [str(i) for i in range(250)])
+
+        self.assertEqual([(i.position, len(i.uris)) for i in changes], [(0, 100), (100, 100), (200, 50)])
+
+    def test_random(self):
+        generator = random.Random(0)
+        for _ in range(500):
+            current = [generator.choice('abcdefgh') for _ in range(generator.randint(0, 25))]
+            target = [generator.choice('abcdefghij') for _ in range(generator.randint(0, 25))]
+
+            self.assertEqual(apply_changes(current, plan_changes(current, target, chunk_size=4)), target)
+
+    def test_heavy_duplicates(self):
+        current = ['a'] * 10000 + ['b'] + ['a'] * 10000 + ['c'] * 5000
+        target = ['b'] + ['a'] * 20000 + ['c'] * 5000
+
+        self.assertEqual(plan_changes(current, target), [Move(range_start=10000, range_length=1, insert_before=0)])
+
+    def test_heavy_duplicates_random(self):
+        generator = random.Random(0)
+        for _ in range(500):
+            current = [generator.choice('aaaabbbcd') for _ in range(generator.randint(0, 25))]
+            target = list(current)
+            generator.shuffle(target)
+
+            self.assertEqual(apply_changes(current, plan_moves(current, target, max_candidates=2)), target)
+
+
+class TestPlanSort(unittest.TestCase):
+
+    def test_sorted(self):
+        self.assertEqual(plan_sort(list(range(10))), [])
+
+    def test_runs_coalesced(self):
+        order = list(range(1000))
+        order[100:100] = order[800:900]
+        del order[900:1000]
+
+        self.assertEqual(plan_sort(order), [Move(range_start=100, range_length=100, insert_before=900)])
+
+    def test_random(self):
+        generator = random.Random(0)
+        for _ in range(500):
+            order = list(range(generator.randint(0, 40)))
+            generator.shuffle(order)
+
+            self.assertEqual(apply_changes(order, plan_sort(order)), sorted(order))
+
+    def test_large_shuffle(self):
+        order = list(range(20000))
+        random.Random(0).shuffle(order)
+
+        self.assertEqual(apply_changes(order, plan_sort(order)), sorted(order))
+
+
+class TestSyncPlaylistTracks(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeSpotifyServer(FakeLibrary.sample(tracks=600, playlists=2, playlist_size=450)).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.net = create_network(self.server)
+        self.playlist = self.net.playlists()[0]
+        self.uris = [i.track.uri for i in self.net.playlist_tracks(uri=self.playlist.uri)]
+        self.server.endpoint_counts.clear()
+
+    def writes(self):
+        return sum(j for i, j in self.server.endpoint_counts.items() if not i.startswith('GET'))
+
+    def test_small_change(self):
+        extra = [i.track.uri for i in self.net.saved_tracks() if i.track.uri not in self.uris][:2]
+        target = self.uris[:10] + extra + self.uris[10:200] + self.uris[300:] + self.uris[200:300]
+        del target[50]
+
+        self.server.endpoint_counts.clear()
+        self.net.sync_playlist_tracks(uri=self.playlist.uri, uris=target)
+
+        self.assertEqual([i.track.uri for i in self.net.playlist_tracks(uri=self.playlist.uri)], target)
+        self.assertLessEqual(self.writes(), 3)
+
+    def test_fingerprint_unchanged(self):
+        self.assertEqual(self.net.sync_playlist_tracks(uri=self.playlist.uri, uris=self.uris,
+                                                       current_fingerprint=fingerprint(self.uris)), [])
+        self.assertEqual(sum(self.server.endpoint_counts.values()), 0)
+
+    def test_unchanged(self):
+        self.assertEqual(self.net.sync_playlist_tracks(uri=self.playlist.uri, uris=self.uris), [])
+        self.assertEqual(self.writes(), 0)
+
+    def test_falls_back_to_replace(self):
+        target = list(reversed(self.uris))
+
+        self.net.sync_playlist_tracks(uri=self.playlist.uri, uris=target)
+
+        self.assertEqual([i.track.uri for i in self.net.playlist_tracks(uri=self.playlist.uri)], target)
+        self.assertEqual(self.writes(), 5)
+
+    def test_changes_sent_with_snapshot(self):
+        snapshot_id = self.net.playlist_snapshot_id(uri=self.playlist.uri)
+        target = self.uris[1:3] + self.uris[:1] + self.uris[3:]
+
+        snapshot_ids = self.net.sync_playlist_tracks(uri=self.playlist.uri, uris=target, current=self.uris,
+                                                     snapshot_id=snapshot_id)
+
+        self.assertEqual(len(snapshot_ids), 1)
+        self.assertEqual([i.track.uri for i in self.net.playlist_tracks(uri=self.playlist.uri)], target)
+
+    def test_edited_since_read_not_applied(self):
+        snapshot_id = self.net.playlist_snapshot_id(uri=self.playlist.uri)
+        create_network(self.server).reorder_playlist_tracks(uri=self.playlist.uri, range_start=10, range_length=1,
+                                                            insert_before=0)
+        edited = self.uris[10:11] + self.uris[:10] + self.uris[11:]
+
+        with self.assertRaises(SpotifyNetworkException):
+            self.net.sync_playlist_tracks(uri=self.playlist.uri, uris=self.uris[1:3] + self.uris[:1] + self.uris[3:],
+                                          current=self.uris, snapshot_id=snapshot_id)
+
+        self.assertEqual([i.track.uri for i in self.net.playlist_tracks(uri=self.playlist.uri)], edited)
+
+
+class TestReorderByAddedDate(unittest.TestCase):
+
+    def test_reorder(self):
+        with FakeSpotifyServer(FakeLibrary.sample(tracks=2500, playlists=1, playlist_size=2000)) as server:
+            net = create_network(server)
+            playlist_id = next(iter(server.library.playlists))
+            items = server.library.playlist_items[playlist_id]
+
+            generator = random.Random(0)
+            for _ in range(10):
+                start, length = generator.randrange(len(items)), generator.randint(1, 100)
+                moved = items[start:start + length]
+                del items[start:start + length]
+                position = generator.randrange(len(items))
+                items[position:position] = moved
+
+            PlaylistEngine(net).reorder_playlist_by_added_date(uri=net.playlists()[0].uri)
+
+            added = [i['added_at'] for i in items]
+            self.assertEqual(added, sorted(added))
+            self.assertLessEqual(server.endpoint_counts['PUT playlists/([^/]+)/tracks'], 20)
+
+
+if __name__ == '__main__':
+    unittest.main()
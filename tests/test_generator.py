@@ -0,0 +1,55 @@
+import unittest
+
+from spotframework.model import init_with_key_filter
+from spotframework.model.track import PlaylistTrack, LibraryTrack, PlayedTrack, AudioFeatures
+from spotframework.testing.generator import LibraryGenerator
+
+
+class TestLibraryGenerator(unittest.TestCase):
+
+    def test_seed_reproducible(self):
+        self.assertEqual(LibraryGenerator(seed=4).playlist_tracks(50), LibraryGenerator(seed=4).playlist_tracks(50))
+        self.assertNotEqual(LibraryGenerator(seed=4).playlist_tracks(50), LibraryGenerator(seed=5).playlist_tracks(50))
+
+    def test_payloads_parse(self):
+        generator = LibraryGenerator()
+
+        playlist_tracks = [init_with_key_filter(PlaylistTrack, i) for i in generator.playlist_tracks(100)]
+        library_tracks = [init_with_key_filter(LibraryTrack, i) for i in generator.library_tracks(100)]
+        played_tracks = [init_with_key_filter(PlayedTrack, i) for i in generator.recently_played(20)]
+        features = [init_with_key_filter(AudioFeatures, generator.audio_features(i)) for i in generator.tracks(20)]
+
+        self.assertEqual(len(playlist_tracks), 100)
+        self.assertEqual(len(library_tracks), 100)
+        self.assertEqual(len(played_tracks), 20)
+        self.assertEqual(len(features), 20)
+
+    def test_added_at_ascending(self):
+        added = [init_with_key_filter(PlaylistTrack, i).added_at for i in LibraryGenerator().playlist_tracks(200)]
+
+        self.assertEqual(added, sorted(added))
+
+    def test_duplicates(self):
+        items = LibraryGenerator(duplicate_rate=0.2, rerelease_rate=0.2).playlist_tracks(500)
+
+        ids = [i['track']['id'] for i in items]
+        names = [(i['track']['name'], i['track']['artists'][0]['id']) for i in items]
+
+        self.assertLess(len(set(ids)), len(ids))
+        self.assertLess(len(set(names)), len(set(ids)))
+
+    def test_no_duplicates(self):
+        items = LibraryGenerator(duplicate_rate=0, rerelease_rate=0).playlist_tracks(500)
+
+        self.assertEqual(len({i['track']['id'] for i in items}), 500)
+
+    def test_artist_reuse(self):
+        tracks = LibraryGenerator(artist_reuse=0.9).tracks(500)
+        shared = LibraryGenerator(artist_reuse=0).tracks(500)
+
+        self.assertLess(len({i['album']['artists'][0]['id'] for i in tracks}),
+                        len({i['album']['artists'][0]['id'] for i in shared}))
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,105 @@
+import unittest
+
+import pickle
+import sys
+
+from spotframework.model import parse_many, interning
+from spotframework.model.album import SimplifiedAlbum
+from spotframework.model.lazy import lazy, lazy_many
+from spotframework.model.service import Image
+from spotframework.model.track import PlaylistTrack, TrackFull
+from spotframework.model.uri import Uri
+from spotframework.testing.generator import LibraryGenerator
+from spotframework.testing.server import FakeSpotifyServer, FakeLibrary
+
+from tests.test_server import create_network
+
+
+class TestLazyModels(unittest.TestCase):
+
+    def setUp(self):
+        self.items = LibraryGenerator().playlist_tracks(50)
+        self.eager = parse_many(PlaylistTrack, self.items)
+        self.lazy = lazy_many(PlaylistTrack, self.items)
+
+    def test_instances(self):
+        self.assertIsInstance(self.lazy[0], PlaylistTrack)
+        self.assertIsInstance(self.lazy[0].track, TrackFull)
+        self.assertIsInstance(self.lazy[0].track.album, SimplifiedAlbum)
+        self.assertIsInstance(self.lazy[0].track.uri, Uri)
+
+    def test_equal_to_eager(self):
+        for lazy_track, eager_track in zip(self.lazy, self.eager):
+            self.assertEqual(lazy_track, eager_track)
+            self.assertEqual(eager_track, lazy_track)
+            self.assertEqual(lazy_track.track.album.release_date, eager_track.track.album.release_date)
+            self.assertEqual(lazy_track.added_by, eager_track.added_by)
+
+    @unittest.skipIf(sys.version_info < (3, 10), 'lazy models need slotted dataclasses')
+    def test_fields_built_on_read(self):
+        track = self.lazy[0]
+        track.track.name
+
+        self.assertIsNotNone(track.raw)
+        self.assertIsNotNone(track.track.raw)
+        self.assertIsNotNone(track.track.album.raw)
+
+        track.track.album.release_date
+        self.assertIsNone(track.track.album.raw)
+
+    @unittest.skipIf(sys.version_info < (3, 10), 'lazy models need slotted dataclasses')
+    def test_hydrate_repeated(self):
+        album = self.lazy[0].track.album
+        album.name
+        album.hydrate()
+        album.hydrate()
+
+        self.assertIsNone(album.raw)
+        self.assertEqual(album.release_date, self.eager[0].track.album.release_date)
+
+        album = self.lazy[1].track.album
+        album.name
+        self.assertEqual(album.images, self.eager[1].track.album.images)
+        album.hydrate()
+        self.assertEqual(album.album_type, self.eager[1].track.album.album_type)
+
+    def test_pickle(self):
+        self.assertEqual(pickle.loads(pickle.dumps(self.lazy[0])), self.eager[0])
+
+    @unittest.skipIf(sys.version_info < (3, 10), 'lazy models need slotted dataclasses')
+    def test_interned_after_block(self):
+        items = LibraryGenerator(album_sharing=1).playlist_tracks(20)
+        with interning():
+            tracks = lazy_many(PlaylistTrack, items)
+
+        albums = {i.track.album.uri: i.track.album for i in tracks}
+        for track in tracks:
+            self.assertIs(track.track.album, albums[track.track.album.uri])
+            self.assertIs(track.added_by, tracks[0].added_by)
+
+        self.assertLess(len(albums), len(tracks))
+        self.assertEqual(tracks, parse_many(PlaylistTrack, items))
+
+    def test_unsupported_model_eager(self):
+        self.assertEqual(type(lazy(Image, {'height': 1, 'width': 1, 'url': 'a'})), Image)
+
+
+class TestNetworkLazyModels(unittest.TestCase):
+
+    @unittest.skipIf(sys.version_info < (3, 10), 'lazy models need slotted dataclasses')
+    def test_playlist_tracks(self):
+        with FakeSpotifyServer(FakeLibrary.sample(tracks=100, playlists=1, playlist_size=60)) as server:
+            net = create_network(server)
+            playlist = net.playlists()[0]
+            eager = net.playlist_tracks(uri=playlist.uri)
+
+            net.lazy_models = True
+            tracks = net.playlist_tracks(uri=playlist.uri)
+
+            self.assertEqual(type(tracks[0]).__name__, 'LazyPlaylistTrack')
+            self.assertEqual(tracks, eager)
+            self.assertEqual(len({id(i.added_by) for i in tracks}), 1)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,111 @@
+import unittest
+from unittest.mock import Mock
+
+import json
+import tempfile
+
+from spotframework.net.cache import ResponseCache
+from spotframework.net.metrics import NetworkMetrics, RequestEvent, CacheEvent, endpoint_name
+from spotframework.net.network import Network
+from spotframework.net.replay import TransportResponse
+from spotframework.net.user import NetworkUser
+
+
+def create_network():
+    net = Network(NetworkUser(client_id='id', client_secret='secret', access_token='token', refresh_token='refresh'),
+                  rate_limiter=Mock(acquire=Mock(return_value=0.5)))
+    net.transport = Mock()
+    net.metrics = NetworkMetrics()
+    net.observers.append(net.metrics)
+    return net
+
+
+class TestEndpointName(unittest.TestCase):
+
+    def test_ids_replaced(self):
+        self.assertEqual(endpoint_name(Network.api_root + 'playlists/37i9dQZF1DXcBWIGoYBM5M/tracks?offset=50',
+                                       Network.api_root),
+                         'playlists/{id}/tracks')
+
+    def test_username_replaced(self):
+        self.assertEqual(endpoint_name(Network.api_root + 'users/andy/playlists', Network.api_root),
+                         'users/{id}/playlists')
+
+    def test_other_host(self):
+        self.assertEqual(endpoint_name(Network.token_url, Network.api_root), 'api/token')
+
+
+class TestNetworkMetrics(unittest.TestCase):
+
+    def test_aggregated_by_endpoint(self):
+        metrics = NetworkMetrics(buckets=(0.1, 1))
+        metrics(RequestEvent(method='GET', endpoint='me', status=200, duration=0.05, bytes_received=100))
+        metrics(RequestEvent(method='GET', endpoint='me', status=429, duration=0.5, retry_after=3))
+        metrics(RequestEvent(method='GET', endpoint='tracks', status=200, duration=2, bytes_received=50))
+
+        snapshot = metrics.snapshot()
+
+        self.assertEqual(snapshot['GET me']['requests'], 2)
+        self.assertEqual(snapshot['GET me']['rate_limited'], 1)
+        self.assertEqual(snapshot['GET me']['retry_after_seconds'], 3)
+        self.assertEqual(snapshot['GET me']['latency_histogram'], {0.1: 1, 1: 1, float('inf'): 0})
+        self.assertEqual(snapshot['total']['requests'], 3)
+        self.assertEqual(snapshot['total']['bytes_received'], 150)
+
+    def test_cache_hit_rate(self):
+        metrics = NetworkMetrics()
+        metrics(CacheEvent(cache='entity', endpoint='tracks', hits=3, misses=1))
+
+        self.assertEqual(metrics.snapshot()['GET tracks']['cache']['entity']['hit_rate'], 0.75)
+
+    def test_prometheus(self):
+        metrics = NetworkMetrics(buckets=(0.1, 1))
+        metrics(RequestEvent(method='GET', endpoint='me', status=200, duration=0.05))
+        metrics(RequestEvent(method='GET', endpoint='me', status=200, duration=0.5))
+
+        text = metrics.to_prometheus()
+
+        self.assertIn('spotframework_requests_total{method="GET",endpoint="me",status="200"} 2', text)
+        self.assertIn('spotframework_request_duration_seconds_bucket{method="GET",endpoint="me",le="1"} 2', text)
+        self.assertIn('spotframework_request_duration_seconds_count{method="GET",endpoint="me"} 2', text)
+
+
+class TestNetworkObservers(unittest.TestCase):
+
+    def test_request_events(self):
+        net = create_network()
+        net.transport.request.side_effect = [
+            TransportResponse(429, {'Retry-After': '2'}),
+            TransportResponse(401, content=json.dumps({'error': {'message': 'expired'}})),
+            TransportResponse(200, content=json.dumps({'access_token': 'new', 'expires_in': 3600})),
+            TransportResponse(200, content=json.dumps({'id': 'user'}))
+        ]
+
+        self.assertEqual(net.get_request('me'), {'id': 'user'})
+
+        snapshot = net.metrics.snapshot()
+        self.assertEqual(snapshot['GET me']['statuses'], {429: 1, 401: 1, 200: 1})
+        self.assertEqual(snapshot['GET me']['retry_after_seconds'], 3)
+        self.assertEqual(snapshot['GET me']['throttled_seconds'], 1.5)
+        self.assertEqual(snapshot['GET me']['bytes_received'], len(json.dumps({'id': 'user'})) +
+                         len(json.dumps({'error': {'message': 'expired'}})))
+        self.assertEqual(snapshot['POST api/token']['requests'], 1)
+
+    def test_response_cache_events(self):
+        with tempfile.TemporaryDirectory() as directory:
+            net = create_network()
+            net.response_cache = ResponseCache(directory)
+            net.transport.request.side_effect = [
+                TransportResponse(200, {'ETag': '"1"'}, json.dumps({'id': 'user'})),
+                TransportResponse(304, {'ETag': '"1"'})
+            ]
+
+            net.get_request('me')
+            net.get_request('me')
+
+            self.assertEqual(net.metrics.snapshot()['GET me']['cache']['response'],
+                             {'hits': 1, 'misses': 1, 'hit_rate': 0.5})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,109 @@
+import unittest
+
+import copy
+import pickle
+import sys
+
+from spotframework.model import init_with_key_filter, parse_many, interning
+from spotframework.model.artist import SimplifiedArtist
+from spotframework.model.service import Image
+from spotframework.model.track import PlaylistTrack, TrackFull, AudioFeatures
+from spotframework.testing.generator import LibraryGenerator
+
+
+class TestModels(unittest.TestCase):
+
+    def setUp(self):
+        self.generator = LibraryGenerator()
+        self.item = init_with_key_filter(PlaylistTrack, self.generator.playlist_tracks(1)[0])
+
+    @unittest.skipIf(sys.version_info < (3, 10), 'slotted dataclasses need python 3.10')
+    def test_slotted(self):
+        for obj in (self.item, self.item.track, self.item.track.album, self.item.track.artists[0],
+                    self.item.track.album.images[0], self.item.added_by):
+            self.assertFalse(hasattr(obj, '__dict__'), type(obj))
+
+    def test_copy_and_pickle(self):
+        self.assertEqual(copy.deepcopy(self.item), self.item)
+        self.assertEqual(pickle.loads(pickle.dumps(self.item)), self.item)
+        self.assertEqual(pickle.loads(pickle.dumps(self.item.track.album)).name, self.item.track.album.name)
+
+    def test_subclass_post_init(self):
+        track = init_with_key_filter(TrackFull, self.generator.tracks(1)[0])
+
+        self.assertEqual(type(track.artists[0]).__name__, 'SimplifiedArtist')
+        self.assertEqual(type(track.album).__name__, 'SimplifiedAlbum')
+
+    def test_audio_features(self):
+        track = self.item.track
+        self.assertIsNone(track.audio_features)
+
+        track.audio_features = init_with_key_filter(AudioFeatures, self.generator.audio_features(
+            self.generator.tracks(1)[0]))
+        self.assertIsInstance(track.audio_features, AudioFeatures)
+
+
+class TestInitWithKeyFilter(unittest.TestCase):
+
+    def test_unrecognised_keys_dropped(self):
+        self.assertEqual(init_with_key_filter(Image, {'height': 1, 'width': 2, 'url': 'a', 'extra': 3}),
+                         Image(height=1, width=2, url='a'))
+
+    def test_kwargs_override(self):
+        self.assertEqual(init_with_key_filter(Image, {'height': 1, 'width': 2, 'url': 'a'}, url='b').url, 'b')
+
+    def test_merge_unrecognised_keys(self):
+        artist = LibraryGenerator().tracks(1)[0]['artists'][0]
+        merged = init_with_key_filter(SimplifiedArtist, {**artist, 'extra': 1}, merge_unrecognised_keys=True)
+
+        self.assertEqual(merged.extra, 1)
+        self.assertIsInstance(merged, SimplifiedArtist)
+        self.assertEqual(merged, init_with_key_filter(SimplifiedArtist, artist))
+
+        restored = pickle.loads(pickle.dumps(merged))
+        self.assertEqual((restored, restored.extra), (merged, 1))
+
+    def test_not_dataclass(self):
+        self.assertIsNone(init_with_key_filter(dict, {'a': 1}))
+
+    def test_parse_many(self):
+        items = LibraryGenerator().playlist_tracks(20)
+
+        self.assertEqual(parse_many(PlaylistTrack, items), [init_with_key_filter(PlaylistTrack, i) for i in items])
+
+
+class TestInterning(unittest.TestCase):
+
+    def setUp(self):
+        self.items = LibraryGenerator(album_sharing=1).playlist_tracks(20)
+
+    def test_shared_within_pool(self):
+        with interning():
+            tracks = parse_many(PlaylistTrack, self.items)
+
+        albums = {i.track.album.uri: i.track.album for i in tracks}
+        for track in tracks:
+            self.assertIs(track.track.album, albums[track.track.album.uri])
+            self.assertIs(track.added_by, tracks[0].added_by)
+
+        self.assertLess(len(albums), len(tracks))
+        self.assertEqual(tracks, parse_many(PlaylistTrack, self.items))
+
+    def test_not_shared_outside_pool(self):
+        first, second = parse_many(PlaylistTrack, self.items[:1] * 2)
+
+        self.assertEqual(first.track.album, second.track.album)
+        self.assertIsNot(first.track.album, second.track.album)
+
+    def test_nested_pool_joins_outer(self):
+        with interning() as pool:
+            first = init_with_key_filter(PlaylistTrack, self.items[0])
+            with interning():
+                second = init_with_key_filter(PlaylistTrack, self.items[0])
+
+        self.assertIs(first.track.album, second.track.album)
+        self.assertIn(first.track.album, pool.values())
+
+
+if __name__ == '__main__':
+    unittest.main()
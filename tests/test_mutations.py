@@ -0,0 +1,143 @@
+import threading
+import unittest
+from unittest.mock import patch
+
+from spotframework.engine.playlistengine import PlaylistEngine
+from spotframework.model.uri import Uri
+from spotframework.net.network import SpotifyNetworkException
+from spotframework.testing.server import FakeSpotifyServer, FakeLibrary
+
+from tests.test_server import create_network
+
+
+class TestWriteBehind(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeSpotifyServer(FakeLibrary.sample(tracks=300, playlists=3, playlist_size=20)).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.net = create_network(self.server)
+        self.playlists = self.net.playlists()
+        self.uris = [i.track.uri for i in self.net.saved_tracks(response_limit=150)]
+        self.server.endpoint_counts.clear()
+
+    def tracks(self, playlist):
+        return [i.track.uri for i in self.net.playlist_tracks(uri=playlist.uri)]
+
+    def test_adds_merged(self):
+        playlist = self.playlists[0]
+        existing = self.tracks(playlist)
+
+        with self.net.write_behind() as queue:
+            for i in range(0, 30, 3):
+                self.net.add_playlist_tracks(uri=playlist.uri, uris=self.uris[i:i + 3])
+            self.assertEqual(len(queue), 10)
+            self.assertEqual(self.server.endpoint_counts['POST playlists/([^/]+)/tracks'], 0)
+
+        self.assertEqual(self.server.endpoint_counts['POST playlists/([^/]+)/tracks'], 1)
+        self.assertEqual(self.tracks(playlist), existing + self.uris[:30])
+
+    def test_replace_then_add(self):
+        playlist = self.playlists[1]
+
+        with self.net.write_behind():
+            self.net.add_playlist_tracks(uri=playlist.uri, uris=self.uris[:5])
+            self.net.replace_playlist_tracks(uri=playlist.uri, uris=self.uris[10:20])
+            self.net.add_playlist_tracks(uri=playlist.uri, uris=self.uris[20:25])
+
+        self.assertEqual(self.server.endpoint_counts['PUT playlists/([^/]+)/tracks'], 1)
+        self.assertEqual(self.server.endpoint_counts['POST playlists/([^/]+)/tracks'], 0)
+        self.assertEqual(self.tracks(playlist), self.uris[10:25])
+
+    def test_details_superseded(self):
+        playlist = self.playlists[2]
+
+        with self.net.write_behind():
+            self.net.change_playlist_details(uri=playlist.uri, name='first', description='first')
+            self.net.change_playlist_details(uri=playlist.uri, description='second')
+
+        self.assertEqual(self.server.endpoint_counts['PUT playlists/([^/]+)'], 1)
+        resp = self.net.get_request(f'playlists/{playlist.uri.object_id}')
+        self.assertEqual((resp['name'], resp['description']), ('first', 'second'))
+
+    def test_read_commits_playlist(self):
+        playlist, other = self.playlists[0], self.playlists[1]
+
+        with self.net.write_behind() as queue:
+            self.net.replace_playlist_tracks(uri=playlist.uri, uris=self.uris[:3])
+            self.net.replace_playlist_tracks(uri=other.uri, uris=self.uris[3:6])
+
+            self.assertEqual(self.tracks(playlist), self.uris[:3])
+            self.assertEqual(len(queue), 1)
+
+        self.assertEqual(self.tracks(other), self.uris[3:6])
+
+    def test_discarded_on_error(self):
+        playlist = self.playlists[2]
+        existing = self.tracks(playlist)
+
+        with self.assertRaises(KeyError):
+            with self.net.write_behind():
+                self.net.add_playlist_tracks(uri=playlist.uri, uris=self.uris[:5])
+                raise KeyError()
+
+        self.assertIsNone(self.net.write_queue)
+        self.assertEqual(self.tracks(playlist), existing)
+
+    def test_failed_commit_keeps_unwritten(self):
+        playlist, other = self.playlists[0], self.playlists[1]
+        missing = Uri('spotify:playlist:' + '0' * 22)
+
+        with self.assertRaises(SpotifyNetworkException):
+            with self.net.write_behind() as queue:
+                self.net.replace_playlist_tracks(uri=playlist.uri, uris=self.uris[:3])
+                self.net.replace_playlist_tracks(uri=missing, uris=self.uris[3:6])
+                self.net.replace_playlist_tracks(uri=other.uri, uris=self.uris[6:9])
+
+        self.assertEqual(self.tracks(playlist), self.uris[:3])
+        self.assertEqual(list(queue.pending), [missing.object_id, other.uri.object_id])
+
+        del queue.pending[missing.object_id]
+        self.assertEqual(queue.commit(), 1)
+        self.assertEqual(self.tracks(other), self.uris[6:9])
+
+    def test_other_threads_buffered_during_commit(self):
+        playlist, other = self.playlists[0], self.playlists[1]
+        existing = self.tracks(other)
+        put_request = self.net.put_request
+        thread = threading.Thread(target=self.net.add_playlist_tracks,
+                                  kwargs={'uri': other.uri, 'uris': self.uris[10:12]})
+
+        def write_from_thread(*args, **kwargs):
+            thread.start()
+            return put_request(*args, **kwargs)
+
+        with self.net.write_behind() as queue:
+            self.net.replace_playlist_tracks(uri=playlist.uri, uris=self.uris[:3])
+
+            with patch.object(self.net, 'put_request', side_effect=write_from_thread):
+                self.tracks(playlist)
+            thread.join()
+
+            self.assertEqual(len(queue), 1)
+            self.assertEqual(self.server.endpoint_counts['POST playlists/([^/]+)/tracks'], 0)
+
+        self.assertEqual(self.tracks(other), existing + self.uris[10:12])
+
+    def test_engine_write_buffered(self):
+        playlist = self.playlists[2]
+        tracks = [i.track for i in self.net.saved_tracks(response_limit=10)]
+
+        with self.net.write_behind():
+            self.assertEqual(PlaylistEngine(self.net).execute_playlist(tracks, playlist.uri), [])
+
+        self.assertEqual(self.tracks(playlist), [i.uri for i in tracks])
+
+
+if __name__ == '__main__':
+    unittest.main()
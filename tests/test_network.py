@@ -0,0 +1,270 @@
+import unittest
+from unittest.mock import Mock, patch
+
+import datetime
+import threading
+import time
+
+from spotframework.net.network import Network, PageCollection, SpotifyNetworkException
+from spotframework.net.ratelimit import RateLimiter
+from spotframework.net.user import NetworkUser
+from spotframework.model.uri import Uri
+
+
+def create_page_response(offset, limit, total):
+    items = list(range(offset, min(offset + limit, total)))
+    return {
+        'href': f'test?offset={offset}',
+        'items': items,
+        'limit': limit,
+        'next': f'test?offset={offset + limit}' if offset + limit < total else None,
+        'previous': None,
+        'total': total,
+        'offset': offset
+    }
+
+
+def create_paged_net(total):
+    net = Mock()
+    net.get_request.side_effect = lambda url=None, whole_url=None, params=None: \
+        create_page_response(params.get('offset', 0), params['limit'], total)
+    return net
+
+
+class TestPageCollectionParallel(unittest.TestCase):
+
+    def test_all_pages_in_order(self):
+        net = create_paged_net(total=237)
+
+        pager = PageCollection(net=net, url='test')
+        pager.iterate_parallel(max_workers=4)
+
+        self.assertEqual(pager.items, list(range(237)))
+        self.assertEqual(net.get_request.call_count, 5)
+
+    def test_single_page(self):
+        net = create_paged_net(total=20)
+
+        pager = PageCollection(net=net, url='test')
+        pager.iterate_parallel(max_workers=4)
+
+        self.assertEqual(pager.items, list(range(20)))
+        net.get_request.assert_called_once()
+
+    def test_total_limit(self):
+        net = create_paged_net(total=1000)
+
+        pager = PageCollection(net=net, url='test', total_limit=120)
+        pager.iterate_parallel(max_workers=4)
+
+        self.assertEqual(pager.items, list(range(120)))
+        self.assertEqual(net.get_request.call_count, 3)
+
+    def test_continues_from_existing_page(self):
+        net = create_paged_net(total=130)
+
+        pager = PageCollection(net=net, url='test', page=create_page_response(0, 50, 130))
+        pager.iterate_parallel(max_workers=4)
+
+        self.assertEqual(pager.items, list(range(130)))
+        self.assertEqual(net.get_request.call_count, 2)
+
+
+class TestPageCollectionStreaming(unittest.TestCase):
+
+    def test_pages_streamed_in_order(self):
+        net = Mock()
+        net.get_request.side_effect = lambda url=None, whole_url=None, params=None: \
+            create_page_response(int(whole_url.split('=')[1]) if whole_url else 0, params['limit'], 120)
+
+        pager = PageCollection(net=net, url='test')
+        items = [item for page in pager.iter_pages() for item in page.items]
+
+        self.assertEqual(items, list(range(120)))
+        self.assertEqual(len(pager.pages), 0)
+
+    def test_total_limit(self):
+        net = Mock()
+        net.get_request.side_effect = lambda url=None, whole_url=None, params=None: \
+            create_page_response(int(whole_url.split('=')[1]) if whole_url else 0, params['limit'], 1000)
+
+        pager = PageCollection(net=net, url='test', total_limit=70)
+        items = [item for page in pager.iter_pages() for item in page.items]
+
+        self.assertEqual(items, list(range(70)))
+        self.assertEqual(net.get_request.call_count, 2)
+
+
+def create_response(status_code=200, json=None, headers=None):
+    response = Mock()
+    response.status_code = status_code
+    response.json.return_value = json
+    response.headers = headers or {}
+    return response
+
+
+def create_network(access_token='token', refresh_token='refresh'):
+    net = Network(NetworkUser(client_id='id', client_secret='secret',
+                              access_token=access_token, refresh_token=refresh_token),
+                  rate_limiter=RateLimiter(rate=1000, capacity=1000))
+    net.transport = Mock()
+    return net
+
+
+class TestNetworkTokenRefresh(unittest.TestCase):
+
+    def test_refresh_before_expiry(self):
+        net = create_network()
+        net.user.last_refreshed = datetime.datetime.utcnow() - datetime.timedelta(seconds=3590)
+        net.user.token_expiry = 3600
+
+        net.transport.request.side_effect = [
+            create_response(json={'access_token': 'new token', 'expires_in': 3600}),
+            create_response(json={'id': 'user'})
+        ]
+
+        self.assertEqual(net.get_request('me'), {'id': 'user'})
+
+        token_call, api_call = net.transport.request.call_args_list
+        self.assertEqual(token_call.kwargs['method'], 'POST')
+        self.assertEqual(api_call.kwargs['headers']['Authorization'], 'Bearer new token')
+
+    def test_no_refresh_for_valid_token(self):
+        net = create_network()
+        net.user.last_refreshed = datetime.datetime.utcnow()
+        net.user.token_expiry = 3600
+
+        net.transport.request.return_value = create_response(json={'id': 'user'})
+
+        net.get_request('me')
+
+        net.transport.request.assert_called_once()
+
+    def test_refresh_skipped_if_token_already_replaced(self):
+        net = create_network(access_token='new token')
+
+        net.refresh_access_token(expired_token='old token')
+
+        net.transport.request.assert_not_called()
+
+    def test_unauthorised_retried_with_refreshed_token(self):
+        net = create_network()
+
+        net.transport.request.side_effect = [
+            create_response(status_code=401, json={'error': {'message': 'expired'}}),
+            create_response(json={'access_token': 'new token', 'expires_in': 3600}),
+            create_response(json={'id': 'user'})
+        ]
+
+        self.assertEqual(net.get_request('me'), {'id': 'user'})
+        self.assertEqual(net.transport.request.call_args.kwargs['headers']['Authorization'], 'Bearer new token')
+
+
+class TestNetworkBatchLookups(unittest.TestCase):
+
+    @staticmethod
+    def respond_with_ids(key):
+        def request(method, url, headers, params, json, data):
+            return create_response(json={key: [{'id': i} for i in params['ids'].split(',')]})
+        return request
+
+    def test_chunks_reassembled_in_order(self):
+        net = create_network()
+        net.max_workers = 4
+        net.transport.request.side_effect = self.respond_with_ids('artists')
+
+        with patch('spotframework.net.network.init_with_key_filter', side_effect=lambda cls, obj: obj):
+            artists = net.get_batch(url='artists', key='artists', class_type=dict,
+                                    uris=[Uri(f'spotify:artist:{i}') for i in range(230)])
+
+        self.assertEqual([i['id'] for i in artists], [str(i) for i in range(230)])
+        self.assertEqual(net.transport.request.call_count, 5)
+
+    def test_audio_features_for_all_chunks(self):
+        net = create_network()
+        net.transport.request.side_effect = self.respond_with_ids('audio_features')
+
+        with patch('spotframework.net.network.parse_many', side_effect=lambda cls, objs: objs):
+            features = net.track_audio_features(uris=[f'spotify:track:{i}' for i in range(250)])
+
+        self.assertEqual(len(features), 250)
+        self.assertEqual(net.transport.request.call_count, 3)
+
+
+class TestNetworkCoalescing(unittest.TestCase):
+
+    def test_identical_gets_share_request(self):
+        net = create_network()
+        started = threading.Event()
+        release = threading.Event()
+
+        def request(**kwargs):
+            started.set()
+            release.wait(5)
+            return create_response(json={'is_playing': True})
+
+        net.transport.request.side_effect = request
+
+        results = []
+        threads = [threading.Thread(target=lambda: results.append(net.get_request('me/player'))) for i in range(3)]
+
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(results, [{'is_playing': True}] * 3)
+        net.transport.request.assert_called_once()
+        self.assertEqual(len(net.in_flight), 0)
+
+    def test_different_params_not_shared(self):
+        net = create_network()
+        net.transport.request.return_value = create_response(json={})
+
+        net.get_request('me/tracks', params={'offset': 0})
+        net.get_request('me/tracks', params={'offset': 50})
+
+        self.assertEqual(net.transport.request.call_count, 2)
+
+    def test_error_shared_with_waiters(self):
+        net = create_network()
+        started = threading.Event()
+        release = threading.Event()
+
+        def request(**kwargs):
+            started.set()
+            release.wait(5)
+            return create_response(status_code=404, json={'error': {'message': 'missing'}})
+
+        net.transport.request.side_effect = request
+
+        errors = []
+
+        def get():
+            try:
+                net.get_request('me/player')
+            except SpotifyNetworkException as e:
+                errors.append(e)
+
+        threads = [threading.Thread(target=get) for i in range(3)]
+
+        threads[0].start()
+        started.wait(5)
+        for thread in threads[1:]:
+            thread.start()
+        time.sleep(0.05)
+        release.set()
+        for thread in threads:
+            thread.join(5)
+
+        self.assertEqual(len(errors), 3)
+        net.transport.request.assert_called_once()
+        self.assertEqual(len(net.in_flight), 0)
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,89 @@
+import unittest
+from unittest.mock import patch
+
+from spotframework.net.ratelimit import RateLimiter, get_rate_limiter
+
+
+class TestRateLimiter(unittest.TestCase):
+
+    def test_burst_within_capacity(self):
+        limiter = RateLimiter(rate=1, capacity=5)
+
+        for i in range(5):
+            self.assertEqual(limiter.try_acquire(), 0)
+
+        self.assertGreater(limiter.try_acquire(), 0)
+
+    def test_backoff_pauses_callers(self):
+        limiter = RateLimiter(rate=10, capacity=10)
+
+        limiter.backoff(30)
+
+        self.assertGreater(limiter.try_acquire(), 29)
+
+    def test_backoff_shrinks_rate_once_per_pause(self):
+        limiter = RateLimiter(rate=10, capacity=10, decrease_factor=0.5)
+
+        limiter.backoff(5)
+        limiter.backoff(5)
+
+        self.assertEqual(limiter.rate, 5)
+
+    def test_success_recovers_rate(self):
+        limiter = RateLimiter(rate=10, capacity=10, max_rate=10, decrease_factor=0.5, recovery=1)
+
+        limiter.backoff(0)
+        limiter.success()
+
+        self.assertEqual(limiter.rate, 6)
+
+        for i in range(10):
+            limiter.success()
+
+        self.assertEqual(limiter.rate, 10)
+
+    def test_success_probes_past_starting_rate(self):
+        limiter = RateLimiter(rate=10, capacity=10, recovery=1)
+
+        for i in range(5):
+            limiter.success()
+
+        self.assertEqual(limiter.rate, 15)
+
+        limiter.backoff(0)
+
+        self.assertEqual(limiter.rate, 7.5)
+
+    def test_default_ceiling(self):
+        limiter = RateLimiter()
+
+        for i in range(2000):
+            limiter.success()
+
+        self.assertEqual(limiter.rate, limiter.max_rate)
+
+    def test_unbounded_ceiling(self):
+        limiter = RateLimiter(rate=10, max_rate=None, recovery=1)
+
+        for i in range(500):
+            limiter.success()
+
+        self.assertEqual(limiter.rate, 510)
+
+    def test_acquire_waits_for_token(self):
+        limiter = RateLimiter(rate=10, capacity=1)
+        limiter.try_acquire()
+
+        with patch('spotframework.net.ratelimit.time.sleep') as sleep:
+            sleep.side_effect = lambda seconds: setattr(limiter, 'tokens', 1)
+            limiter.acquire()
+
+        sleep.assert_called_once()
+
+    def test_shared_per_client_id(self):
+        self.assertIs(get_rate_limiter('client'), get_rate_limiter('client'))
+        self.assertIsNot(get_rate_limiter('client'), get_rate_limiter('other client'))
+
+
+if __name__ == '__main__':
+    unittest.main()
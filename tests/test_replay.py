@@ -0,0 +1,132 @@
+import unittest
+from unittest.mock import Mock, patch
+
+import json
+import os
+import tempfile
+
+from spotframework.net.network import Network
+from spotframework.net.ratelimit import RateLimiter
+from spotframework.net.replay import TransportResponse, RecordingTransport, ReplayTransport, \
+    FaultInjectingTransport, request_key
+from spotframework.net.user import NetworkUser
+
+
+def create_network(transport):
+    return Network(NetworkUser(client_id='id', client_secret='secret', access_token='token', refresh_token='refresh'),
+                   rate_limiter=RateLimiter(rate=1000, capacity=1000),
+                   transport=transport)
+
+
+class TestRequestKey(unittest.TestCase):
+
+    def test_param_order_ignored(self):
+        self.assertEqual(request_key('GET', 'url?offset=0&limit=50'),
+                         request_key('GET', 'url', params={'limit': 50, 'offset': 0}))
+
+    def test_body_distinguished(self):
+        self.assertNotEqual(request_key('PUT', 'url', json={'uris': ['a']}),
+                            request_key('PUT', 'url', json={'uris': ['b']}))
+
+
+class TestRecordReplay(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = tempfile.TemporaryDirectory()
+        self.path = os.path.join(self.directory.name, 'cassette.json')
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_recorded_responses_replayed(self):
+        inner = Mock()
+        inner.request.side_effect = [
+            TransportResponse(200, {'Content-Type': 'application/json'}, json.dumps({'id': 'user'})),
+            TransportResponse(200, {'Content-Type': 'application/json'}, json.dumps({'id': 'user', 'name': 'new'}))
+        ]
+
+        with RecordingTransport(inner, self.path) as recorder:
+            net = create_network(recorder)
+            net.get_request('me')
+            net.get_request('me')
+
+        net = create_network(ReplayTransport(self.path))
+        self.assertEqual(net.get_request('me'), {'id': 'user'})
+        self.assertEqual(net.get_request('me'), {'id': 'user', 'name': 'new'})
+        self.assertEqual(net.get_request('me'), {'id': 'user', 'name': 'new'})
+
+    def test_tokens_redacted(self):
+        inner = Mock()
+        inner.request.return_value = TransportResponse(200, content=json.dumps({'access_token': 'secret token',
+                                                                                 'expires_in': 3600}))
+
+        with RecordingTransport(inner, self.path) as recorder:
+            recorder.request('POST', 'https://accounts.spotify.com/api/token', data={'refresh_token': 'refresh'})
+
+        with open(self.path) as fileobj:
+            cassette = fileobj.read()
+
+        self.assertNotIn('secret token', cassette)
+        self.assertNotIn('refresh', cassette)
+
+    def test_unrecorded_request_raises(self):
+        with RecordingTransport(Mock(), self.path):
+            pass
+
+        with self.assertRaises(LookupError):
+            ReplayTransport(self.path).request('GET', 'url')
+
+
+@patch('spotframework.net.replay.time.sleep')
+class TestFaultInjectingTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.inner = Mock()
+        self.inner.request.return_value = TransportResponse(200, content='{}')
+
+    def test_no_faults_passes_through(self, sleep):
+        transport = FaultInjectingTransport(self.inner)
+
+        self.assertEqual(transport.request('GET', 'url').status_code, 200)
+        sleep.assert_not_called()
+
+    def test_latency(self, sleep):
+        transport = FaultInjectingTransport(self.inner, latency=0.2)
+        transport.request('GET', 'url')
+
+        sleep.assert_called_once_with(0.2)
+
+    def test_rate_limit(self, sleep):
+        transport = FaultInjectingTransport(self.inner, rate_limit_rate=1, retry_after=3)
+        response = transport.request('GET', 'url')
+
+        self.assertEqual(response.status_code, 429)
+        self.assertEqual(response.headers['retry-after'], '3')
+        self.inner.request.assert_not_called()
+
+    def test_unauthorised_only_with_token(self, sleep):
+        transport = FaultInjectingTransport(self.inner, unauthorised_rate=1)
+
+        self.assertEqual(transport.request('GET', 'url', headers={'Authorization': 'Bearer token'}).status_code,
+                         401)
+        self.assertEqual(transport.request('POST', 'url', headers={'Authorization': 'Basic id'}).status_code,
+                         200)
+
+    def test_server_error_retried(self, sleep):
+        transport = FaultInjectingTransport(self.inner, server_error_rate=1, retries=2)
+
+        self.assertEqual(transport.request('GET', 'url').status_code, 503)
+        self.assertEqual(sleep.call_count, 2)
+
+    def test_seeded_faults_reproducible(self, sleep):
+        def statuses():
+            transport = FaultInjectingTransport(self.inner, rate_limit_rate=0.3, server_error_rate=0.3,
+                                                retries=0, seed=42)
+            return [transport.request('GET', 'url').status_code for _ in range(20)]
+
+        self.assertEqual(statuses(), statuses())
+        self.assertEqual(set(statuses()), {200, 429, 503})
+
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,114 @@
+import unittest
+
+import requests
+
+from spotframework.net.network import Network
+from spotframework.net.ratelimit import RateLimiter
+from spotframework.testing.server import FakeSpotifyServer, FakeLibrary
+
+
+def create_network(server):
+    net = Network(server.network_user(), rate_limiter=RateLimiter(rate=1000, capacity=1000))
+    net.api_root = server.api_root
+    net.token_url = server.token_url
+    return net
+
+
+class TestFakeSpotifyServer(unittest.TestCase):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.server = FakeSpotifyServer(FakeLibrary.sample(tracks=300, playlists=60, playlist_size=130,
+                                                          saved_tracks=120, recently_played=30)).start()
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.stop()
+
+    def setUp(self):
+        self.net = create_network(self.server)
+
+    def test_playlists_paged(self):
+        playlists = self.net.playlists()
+
+        self.assertEqual(len(playlists), 60)
+        self.assertEqual(len({i.id for i in playlists}), 60)
+
+    def test_playlist_tracks_paged(self):
+        playlist = self.net.playlists()[0]
+
+        self.assertEqual(len(self.net.playlist_tracks(uri=playlist.uri)), 130)
+        self.assertEqual(len(self.net.playlist(uri=playlist.uri).tracks), 130)
+
+    def test_saved_and_recent_tracks(self):
+        self.assertEqual(len(self.net.saved_tracks()), 120)
+        self.assertEqual(len(self.net.recently_played_tracks(response_limit=25)), 25)
+
+    def test_batch_lookups(self):
+        uris = [i.track.uri for i in self.net.saved_tracks(response_limit=60)]
+
+        tracks = self.net.tracks(uris=uris)
+        self.assertEqual([i.uri for i in tracks], uris)
+        self.assertEqual(len(self.net.albums(uris=[i.album.uri for i in tracks])), 60)
+        self.assertEqual(len(self.net.artists(uris=[i.artists[0].uri for i in tracks])), 60)
+        self.assertEqual(len(self.net.track_audio_features(uris=uris)), 60)
+
+    def test_recommendations(self):
+        track = self.net.saved_tracks(response_limit=1)[0].track
+
+        self.assertEqual(len(self.net.recommendations(tracks=[track.id], response_limit=5).tracks), 5)
+
+    def test_playlist_writes(self):
+        playlist = self.net.playlists()[1]
+        uris = [i.track.uri for i in self.net.saved_tracks()]
+
+        self.net.replace_playlist_tracks(uri=playlist.uri, uris=uris)
+        self.net.reorder_playlist_tracks(uri=playlist.uri, range_start=0, range_length=2, insert_before=5)
+
+        tracks = [i.track.uri for i in self.net.playlist_tracks(uri=playlist.uri)]
+        self.assertEqual(tracks, uris[2:5] + uris[:2] + uris[5:])
+
+    def test_positions_out_of_range(self):
+        playlist = self.net.playlists()[2]
+        url = self.server.api_root + f'playlists/{playlist.uri.object_id}/tracks'
+        headers = {'Authorization': f'Bearer {self.server.issue_token()}'}
+        uri = self.net.saved_tracks(response_limit=1)[0].track.uri
+
+        for method, body in [('PUT', {'range_start': 500, 'insert_before': 0}),
+                             ('PUT', {'range_start': 0, 'insert_before': -1}),
+                             ('POST', {'uris': [str(uri)], 'position': 500}),
+                             ('DELETE', {'tracks': [{'uri': str(uri), 'positions': [500]}]})]:
+            response = requests.request(method, url, json=body, headers=headers)
+
+            self.assertEqual(response.status_code, 400)
+            self.assertEqual(response.json()['error']['message'], 'Index out of bounds')
+
+    def test_expired_token_refreshed(self):
+        self.server.expire_tokens()
+
+        self.assertEqual(self.net.current_user().id, 'fakeuser')
+        self.assertEqual(self.server.status_counts[401] > 0, True)
+
+
+class TestFakeSpotifyServerLimits(unittest.TestCase):
+
+    def test_rate_limit(self):
+        with FakeSpotifyServer(FakeLibrary.sample(tracks=10, playlists=1), rate_limit=3, rate_limit_window=60) \
+                as server:
+            headers = {'Authorization': f'Bearer {server.issue_token()}'}
+            statuses = [requests.get(server.api_root + 'me', headers=headers).status_code for _ in range(4)]
+
+            self.assertEqual(statuses, [200, 200, 200, 429])
+
+            response = requests.get(server.api_root + 'me', headers=headers)
+            self.assertGreater(int(response.headers['Retry-After']), 0)
+
+    def test_token_lifetime(self):
+        with FakeSpotifyServer(FakeLibrary.sample(tracks=10, playlists=1), token_lifetime=0) as server:
+            response = requests.get(server.api_root + 'me', headers={'Authorization': f'Bearer {server.issue_token()}'})
+
+            self.assertEqual(response.status_code, 401)
+
+
+if __name__ == '__main__':
+    unittest.main()
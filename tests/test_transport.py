@@ -0,0 +1,95 @@
+import unittest
+from unittest.mock import Mock, patch
+
+import requests
+import urllib3
+
+from spotframework.net.transport import RequestsTransport
+
+
+def create_response(status_code=200):
+    response = Mock()
+    response.status_code = status_code
+    return response
+
+
+@patch('spotframework.net.transport.time.sleep')
+class TestRequestsTransport(unittest.TestCase):
+
+    def setUp(self):
+        self.transport = RequestsTransport(retries=3)
+        self.transport.session = Mock()
+
+    def test_timeouts_passed(self, sleep):
+        transport = RequestsTransport(connect_timeout=2, read_timeout=10)
+        transport.session = Mock()
+
+        transport.request('GET', 'url')
+
+        self.assertEqual(transport.session.request.call_args.kwargs['timeout'], (2, 10))
+
+    def test_server_error_retried(self, sleep):
+        self.transport.session.request.side_effect = [create_response(503), create_response(200)]
+
+        self.assertEqual(self.transport.request('GET', 'url').status_code, 200)
+        sleep.assert_called_once()
+
+    def test_connection_error_retried(self, sleep):
+        self.transport.session.request.side_effect = [requests.exceptions.ConnectionError(), create_response(200)]
+
+        self.assertEqual(self.transport.request('GET', 'url').status_code, 200)
+
+    def test_gives_up_after_retries(self, sleep):
+        self.transport.session.request.return_value = create_response(502)
+
+        self.assertEqual(self.transport.request('GET', 'url').status_code, 502)
+        self.assertEqual(self.transport.session.request.call_count, 4)
+
+    def test_connection_error_raised_after_retries(self, sleep):
+        self.transport.session.request.side_effect = requests.exceptions.Timeout()
+
+        with self.assertRaises(requests.exceptions.Timeout):
+            self.transport.request('GET', 'url')
+
+    def test_post_not_retried(self, sleep):
+        self.transport.session.request.return_value = create_response(503)
+
+        self.assertEqual(self.transport.request('POST', 'url').status_code, 503)
+        self.transport.session.request.assert_called_once()
+
+    def test_write_not_retried_after_send(self, sleep):
+        self.transport.session.request.side_effect = [requests.exceptions.ReadTimeout(), create_response(200)]
+
+        with self.assertRaises(requests.exceptions.ReadTimeout):
+            self.transport.request('PUT', 'url')
+        self.transport.session.request.assert_called_once()
+
+    def test_write_server_error_not_retried(self, sleep):
+        self.transport.session.request.return_value = create_response(503)
+
+        self.assertEqual(self.transport.request('DELETE', 'url').status_code, 503)
+        self.transport.session.request.assert_called_once()
+
+    def test_write_retried_on_connect_failure(self, sleep):
+        refused = requests.exceptions.ConnectionError(
+            urllib3.exceptions.MaxRetryError(None, 'url', urllib3.exceptions.NewConnectionError(None, 'refused')))
+        self.transport.session.request.side_effect = [requests.exceptions.ConnectTimeout(), refused,
+                                                      create_response(200)]
+
+        self.assertEqual(self.transport.request('PUT', 'url').status_code, 200)
+        self.assertEqual(self.transport.session.request.call_count, 3)
+
+    def test_read_timeout_retried_for_get(self, sleep):
+        self.transport.session.request.side_effect = [requests.exceptions.ReadTimeout(), create_response(200)]
+
+        self.assertEqual(self.transport.request('GET', 'url').status_code, 200)
+
+    def test_backoff_bounded(self, sleep):
+        transport = RequestsTransport(backoff_factor=1, backoff_max=5)
+
+        for attempt in range(10):
+            self.assertLessEqual(transport.backoff(attempt), 5)
+
+
+if __name__ == '__main__':
+    unittest.main()
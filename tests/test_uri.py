@@ -61,6 +61,29 @@ class TestURI(unittest.TestCase):
 
         self.assertEqual(repr(uri), "URI: track / test")
 
+    def test_hashable(self):
+        uris = {Uri("spotify:track:test"), Uri("spotify:track:test"), Uri("spotify:user:sarsoo:track:test")}
+
+        self.assertEqual(1, len(uris))
+
+    def test_interned(self):
+        self.assertIs(Uri("spotify:track:test"), Uri("spotify:track:test"))
+
+    def test_immutable(self):
+        uri = Uri("spotify:track:test")
+
+        with self.assertRaises(AttributeError):
+            uri.object_id = 'changed'
+
+    def test_pickle_copy(self):
+        import copy
+        import pickle
+
+        uri = Uri("spotify:track:test")
+
+        self.assertIs(uri, pickle.loads(pickle.dumps(uri)))
+        self.assertIs(uri, copy.deepcopy(uri))
+
 
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file